@@ -0,0 +1,72 @@
+"""
+Checks that ``import pyautogui`` stays fast, using ``python -X importtime``.
+
+PyAutoGUI doesn't import its optional dependencies (PyScreeze and Pillow, PyMsgBox, PyTweening, and MouseInfo) or
+connect to the OS until they're first needed. This script imports PyAutoGUI in a fresh interpreter several times, and
+fails (with exit code 1) if the median cumulative import time is over the budget, or if any of the modules that should
+be loaded lazily were imported.
+
+    python benchmarks/importtime.py --budget 50
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# The import time budget, in milliseconds. This is the median "cumulative" time that -X importtime reports for the
+# pyautogui package, and is meant to have plenty of headroom on an ordinary computer.
+IMPORT_TIME_BUDGET_MS = 50
+
+# Modules that "import pyautogui" must not import.
+LAZY_MODULES = ("pyscreeze", "PIL", "pymsgbox", "pytweening", "mouseinfo", "pygetwindow", "Xlib.display", "numpy")
+
+CHECK_SCRIPT = "import sys, pyautogui; print(' '.join(name for name in %r if name in sys.modules))" % (LAZY_MODULES,)
+
+
+def measure():
+    """Imports pyautogui in a new interpreter, and returns (milliseconds, eagerly imported lazy modules)."""
+    env = dict(os.environ)
+    env.setdefault("DISPLAY", ":0")  # Importing doesn't connect to the X server, so it doesn't need to exist.
+    env["PYTHONPATH"] = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHECK_SCRIPT], capture_output=True, text=True, env=env, check=True
+    )
+    milliseconds = None
+    for line in process.stderr.splitlines():
+        # Lines look like "import time:       517 |      15101 |   pyautogui._pyautogui_x11"
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == "pyautogui" and not fields[2].startswith("  "):
+            milliseconds = int(fields[1]) / 1000
+    return milliseconds, process.stdout.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=float, default=IMPORT_TIME_BUDGET_MS, help="the budget in milliseconds")
+    parser.add_argument("--runs", type=int, default=9, help="the number of times to import pyautogui")
+    args = parser.parse_args()
+
+    times = []
+    eagerModules = set()
+    for i in range(args.runs):
+        milliseconds, imported = measure()
+        times.append(milliseconds)
+        eagerModules.update(imported)
+    times.sort()
+    median = times[len(times) // 2]
+
+    print("import pyautogui: median %.1f ms, fastest %.1f ms, slowest %.1f ms (budget %.1f ms)" % (
+        median, times[0], times[-1], args.budget))
+    failed = False
+    if median > args.budget:
+        print("FAIL: the median import time is over budget.")
+        failed = True
+    if eagerModules:
+        print("FAIL: these modules should only be imported when they're needed: %s" % (", ".join(sorted(eagerModules))))
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Measures how PyAutoGUI's throughput scales with the number of X displays that one process drives at the same time.
+
+This starts up to --displays Xvfb servers, then for each count from 1 to --displays uses a thread pool with one
+pyautogui.Controller per display to send --actions mouse moves and clicks to every display. Xvfb must be installed.
+
+    python benchmarks/multidisplay.py --displays 8 --actions 500
+"""
+
+import argparse
+import concurrent.futures
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+FIRST_DISPLAY_NUMBER = 100  # High enough to stay out of the way of any real displays.
+
+
+def startXvfb(number):
+    process = subprocess.Popen(
+        ["Xvfb", ":%s" % (number), "-screen", "0", "1024x768x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    socketPath = "/tmp/.X11-unix/X%s" % (number)
+    for i in range(100):
+        if os.path.exists(socketPath):
+            return process
+        time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("Xvfb :%s didn't start." % (number))
+
+
+def drive(controller, actions):
+    for i in range(actions):
+        controller.moveTo(100 + (i % 500), 100 + (i % 300))
+        controller.click()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--displays", type=int, default=8, help="the largest number of displays to drive at once")
+    parser.add_argument("--actions", type=int, default=500, help="the number of move and click pairs per display")
+    args = parser.parse_args()
+
+    servers = [startXvfb(FIRST_DISPLAY_NUMBER + n) for n in range(args.displays)]
+    os.environ["DISPLAY"] = ":%s" % (FIRST_DISPLAY_NUMBER)
+    import pyautogui
+
+    controllers = [
+        pyautogui.Controller(display=":%s" % (FIRST_DISPLAY_NUMBER + n), PAUSE=0, FAILSAFE=False)
+        for n in range(args.displays)
+    ]
+    try:
+        print("displays  seconds  actions/sec  speedup")
+        baseline = None
+        for count in range(1, args.displays + 1):
+            startTime = time.perf_counter()
+            with concurrent.futures.ThreadPoolExecutor(count) as pool:
+                for future in [pool.submit(drive, controller, args.actions) for controller in controllers[:count]]:
+                    future.result()
+            elapsed = time.perf_counter() - startTime
+            throughput = count * args.actions / elapsed
+            if baseline is None:
+                baseline = throughput
+            print("%8d  %7.3f  %11.0f  %6.2fx" % (count, elapsed, throughput, throughput / baseline))
+    finally:
+        for controller in controllers:
+            controller.close()
+        for server in servers:
+            server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -23,8 +23,17 @@ import os
 import platform
 import re
 import functools
+import math
+import bisect
+import array
+import threading
 from contextlib import contextmanager
 
+try:
+    import queue
+except ImportError:
+    import Queue as queue  # Python 2
+
 
 class PyAutoGUIException(Exception):
     """
@@ -63,100 +72,91 @@ else:
     from collections.abc import Sequence
 
 
-try:
-    from pytweening import (
-        easeInQuad,
-        easeOutQuad,
-        easeInOutQuad,
-        easeInCubic,
-        easeOutCubic,
-        easeInOutCubic,
-        easeInQuart,
-        easeOutQuart,
-        easeInOutQuart,
-        easeInQuint,
-        easeOutQuint,
-        easeInOutQuint,
-        easeInSine,
-        easeOutSine,
-        easeInOutSine,
-        easeInExpo,
-        easeOutExpo,
-        easeInOutExpo,
-        easeInCirc,
-        easeOutCirc,
-        easeInOutCirc,
-        easeInElastic,
-        easeOutElastic,
-        easeInOutElastic,
-        easeInBack,
-        easeOutBack,
-        easeInOutBack,
-        easeInBounce,
-        easeOutBounce,
-        easeInOutBounce,
+# The optional dependencies (PyTweening, PyMsgBox, PyScreeze, MouseInfo, and PyGetWindow) aren't imported until one of
+# the names that comes from them is used for the first time, since importing them (and Pillow) takes much longer than
+# importing PyAutoGUI itself. The module-level __getattr__() below calls the loader function for a name in
+# _LAZY_LOADERS the first time that name is looked up. Code in this module has to call the loader itself (or use
+# _lazyGlobal()), since looking up a global variable doesn't go through __getattr__().
+
+_PYTWEENING_NAMES = (
+    "easeInQuad",
+    "easeOutQuad",
+    "easeInOutQuad",
+    "easeInCubic",
+    "easeOutCubic",
+    "easeInOutCubic",
+    "easeInQuart",
+    "easeOutQuart",
+    "easeInOutQuart",
+    "easeInQuint",
+    "easeOutQuint",
+    "easeInOutQuint",
+    "easeInSine",
+    "easeOutSine",
+    "easeInOutSine",
+    "easeInExpo",
+    "easeOutExpo",
+    "easeInOutExpo",
+    "easeInCirc",
+    "easeOutCirc",
+    "easeInOutCirc",
+    "easeInElastic",
+    "easeOutElastic",
+    "easeInOutElastic",
+    "easeInBack",
+    "easeOutBack",
+    "easeInOutBack",
+    "easeInBounce",
+    "easeOutBounce",
+    "easeInOutBounce",
+)
+
+
+def _couldNotImportPyTweening(*unused_args, **unused_kwargs):
+    """
+    This function raises ``PyAutoGUIException``. It's used for the PyTweening function names if the PyTweening
+    module failed to be imported.
+    """
+    raise PyAutoGUIException(
+        "PyAutoGUI was unable to import pytweening. Please install this module to enable the function you tried to call."
     )
 
+
+def _loadPyTweening():
+    """Sets the PyTweening tween function names (such as ``easeInQuad``) as globals of this module."""
+    try:
+        import pytweening
+    except ImportError:
+        pytweening = None
+
     # getLine is not needed.
     # getPointOnLine has been redefined in this file, to avoid dependency on pytweening.
     # linear has also been redefined in this file.
-except ImportError:
-
-    def _couldNotImportPyTweening(*unused_args, **unused_kwargs):
-        """
-        This function raises ``PyAutoGUIException``. It's used for the PyTweening function names if the PyTweening
-        module failed to be imported.
-        """
-        raise PyAutoGUIException(
-            "PyAutoGUI was unable to import pytweening. Please install this module to enable the function you tried to call."
-        )
+    for name in _PYTWEENING_NAMES:
+        if pytweening is None:
+            globals()[name] = _couldNotImportPyTweening
+        else:
+            globals()[name] = getattr(pytweening, name)
 
-    easeInQuad = _couldNotImportPyTweening
-    easeOutQuad = _couldNotImportPyTweening
-    easeInOutQuad = _couldNotImportPyTweening
-    easeInCubic = _couldNotImportPyTweening
-    easeOutCubic = _couldNotImportPyTweening
-    easeInOutCubic = _couldNotImportPyTweening
-    easeInQuart = _couldNotImportPyTweening
-    easeOutQuart = _couldNotImportPyTweening
-    easeInOutQuart = _couldNotImportPyTweening
-    easeInQuint = _couldNotImportPyTweening
-    easeOutQuint = _couldNotImportPyTweening
-    easeInOutQuint = _couldNotImportPyTweening
-    easeInSine = _couldNotImportPyTweening
-    easeOutSine = _couldNotImportPyTweening
-    easeInOutSine = _couldNotImportPyTweening
-    easeInExpo = _couldNotImportPyTweening
-    easeOutExpo = _couldNotImportPyTweening
-    easeInOutExpo = _couldNotImportPyTweening
-    easeInCirc = _couldNotImportPyTweening
-    easeOutCirc = _couldNotImportPyTweening
-    easeInOutCirc = _couldNotImportPyTweening
-    easeInElastic = _couldNotImportPyTweening
-    easeOutElastic = _couldNotImportPyTweening
-    easeInOutElastic = _couldNotImportPyTweening
-    easeInBack = _couldNotImportPyTweening
-    easeOutBack = _couldNotImportPyTweening
-    easeInOutBack = _couldNotImportPyTweening
-    easeInBounce = _couldNotImportPyTweening
-    easeOutBounce = _couldNotImportPyTweening
-    easeInOutBounce = _couldNotImportPyTweening
 
+# If pymsgbox module is not found, those methods will not be available.
+def _couldNotImportPyMsgBox(*unused_args, **unused_kwargs):
+    """
+    This function raises ``PyAutoGUIException``. It's used for the PyMsgBox function names if the PyMsgbox module
+    failed to be imported.
+    """
+    raise PyAutoGUIException(
+        "PyAutoGUI was unable to import pymsgbox. Please install this module to enable the function you tried to call."
+    )
 
-try:
-    from pymsgbox import alert, confirm, prompt, password
-except ImportError:
-    # If pymsgbox module is not found, those methods will not be available.
-    def _couldNotImportPyMsgBox(*unused_args, **unused_kwargs):
-        """
-        This function raises ``PyAutoGUIException``. It's used for the PyMsgBox function names if the PyMsgbox module
-        failed to be imported.
-        """
-        raise PyAutoGUIException(
-            "PyAutoGUI was unable to import pymsgbox. Please install this module to enable the function you tried to call."
-        )
 
-    alert = confirm = prompt = password = _couldNotImportPyMsgBox
+def _loadPyMsgBox():
+    """Sets ``alert``, ``confirm``, ``prompt``, and ``password`` as globals of this module."""
+    global alert, confirm, prompt, password
+    try:
+        from pymsgbox import alert, confirm, prompt, password
+    except ImportError:
+        alert = confirm = prompt = password = _couldNotImportPyMsgBox
 
 
 def raisePyAutoGUIImageNotFoundException(wrappedFunction):
@@ -176,92 +176,97 @@ def raisePyAutoGUIImageNotFoundException(wrappedFunction):
     return wrapper
 
 
-try:
-    import pyscreeze
-    from pyscreeze import center, pixel, pixelMatchesColor, screenshot
-
-    # Change the locate*() functions so that they raise PyAutoGUI's ImageNotFoundException instead.
-    @raisePyAutoGUIImageNotFoundException
-    def locate(*args, **kwargs):
-        return pyscreeze.locate(*args, **kwargs)
-
-    locate.__doc__ = pyscreeze.locate.__doc__
-
-    @raisePyAutoGUIImageNotFoundException
-    def locateAll(*args, **kwargs):
-        return pyscreeze.locateAll(*args, **kwargs)
+# If pyscreeze module is not found, screenshot-related features will simply not work.
+def _couldNotImportPyScreeze(*unused_args, **unsed_kwargs):
+    """
+    This function raises ``PyAutoGUIException``. It's used for the PyScreeze function names if the PyScreeze module
+    failed to be imported.
+    """
+    raise PyAutoGUIException(
+        "PyAutoGUI was unable to import pyscreeze. (This is likely because you're running a version of Python that Pillow (which pyscreeze depends on) doesn't support currently.) Please install this module to enable the function you tried to call."
+    )
 
-    locateAll.__doc__ = pyscreeze.locateAll.__doc__
 
-    @raisePyAutoGUIImageNotFoundException
-    def locateAllOnScreen(*args, **kwargs):
-        return pyscreeze.locateAllOnScreen(*args, **kwargs)
+def _loadPyScreeze():
+    """
+    Sets ``pyscreeze`` and the PyScreeze function names (such as ``screenshot`` and ``locateOnScreen``) as globals of
+    this module. If PyScreeze can't be imported, ``pyscreeze`` is set to ``None``. Calling this again does nothing.
+    """
+    global pyscreeze, center, pixel, pixelMatchesColor, screenshot
+    global locate, locateAll, locateAllOnScreen, locateCenterOnScreen, locateOnScreen, locateOnWindow
+    if "pyscreeze" in globals():
+        return
 
-    locateAllOnScreen.__doc__ = pyscreeze.locateAllOnScreen.__doc__
+    try:
+        import pyscreeze
+        from pyscreeze import center, pixel, pixelMatchesColor, screenshot
 
-    @raisePyAutoGUIImageNotFoundException
-    def locateCenterOnScreen(*args, **kwargs):
-        return pyscreeze.locateCenterOnScreen(*args, **kwargs)
+        # Change the locate*() functions so that they raise PyAutoGUI's ImageNotFoundException instead.
+        @raisePyAutoGUIImageNotFoundException
+        def locate(*args, **kwargs):
+            return pyscreeze.locate(*args, **kwargs)
 
-    locateCenterOnScreen.__doc__ = pyscreeze.locateCenterOnScreen.__doc__
+        locate.__doc__ = pyscreeze.locate.__doc__
 
-    @raisePyAutoGUIImageNotFoundException
-    def locateOnScreen(*args, **kwargs):
-        return pyscreeze.locateOnScreen(*args, **kwargs)
+        @raisePyAutoGUIImageNotFoundException
+        def locateAll(*args, **kwargs):
+            return pyscreeze.locateAll(*args, **kwargs)
 
-    locateOnScreen.__doc__ = pyscreeze.locateOnScreen.__doc__
+        locateAll.__doc__ = pyscreeze.locateAll.__doc__
 
-    @raisePyAutoGUIImageNotFoundException
-    def locateOnWindow(*args, **kwargs):
-        return pyscreeze.locateOnWindow(*args, **kwargs)
+        @raisePyAutoGUIImageNotFoundException
+        def locateAllOnScreen(*args, **kwargs):
+            return pyscreeze.locateAllOnScreen(*args, **kwargs)
 
-    locateOnWindow.__doc__ = pyscreeze.locateOnWindow.__doc__
+        locateAllOnScreen.__doc__ = pyscreeze.locateAllOnScreen.__doc__
 
+        @raisePyAutoGUIImageNotFoundException
+        def locateCenterOnScreen(*args, **kwargs):
+            return pyscreeze.locateCenterOnScreen(*args, **kwargs)
 
-except ImportError:
-    # If pyscreeze module is not found, screenshot-related features will simply not work.
-    def _couldNotImportPyScreeze(*unused_args, **unsed_kwargs):
-        """
-        This function raises ``PyAutoGUIException``. It's used for the PyScreeze function names if the PyScreeze module
-        failed to be imported.
-        """
-        raise PyAutoGUIException(
-            "PyAutoGUI was unable to import pyscreeze. (This is likely because you're running a version of Python that Pillow (which pyscreeze depends on) doesn't support currently.) Please install this module to enable the function you tried to call."
-        )
+        locateCenterOnScreen.__doc__ = pyscreeze.locateCenterOnScreen.__doc__
 
-    center = _couldNotImportPyScreeze
-    #grab = _couldNotImportPyScreeze  # grab() was removed, use screenshot() instead
-    locate = _couldNotImportPyScreeze
-    locateAll = _couldNotImportPyScreeze
-    locateAllOnScreen = _couldNotImportPyScreeze
-    locateCenterOnScreen = _couldNotImportPyScreeze
-    locateOnScreen = _couldNotImportPyScreeze
-    locateOnWindow = _couldNotImportPyScreeze
-    pixel = _couldNotImportPyScreeze
-    pixelMatchesColor = _couldNotImportPyScreeze
-    screenshot = _couldNotImportPyScreeze
+        @raisePyAutoGUIImageNotFoundException
+        def locateOnScreen(*args, **kwargs):
+            return pyscreeze.locateOnScreen(*args, **kwargs)
 
+        locateOnScreen.__doc__ = pyscreeze.locateOnScreen.__doc__
 
-try:
-    import mouseinfo
+        @raisePyAutoGUIImageNotFoundException
+        def locateOnWindow(*args, **kwargs):
+            return pyscreeze.locateOnWindow(*args, **kwargs)
 
-    def mouseInfo():
-        """
-        Launches the MouseInfo app. This application provides mouse coordinate information which can be useful when
-        planning GUI automation tasks. This function blocks until the application is closed.
-        """
-        mouseinfo.MouseInfoWindow()
+        locateOnWindow.__doc__ = pyscreeze.locateOnWindow.__doc__
 
-except ImportError:
+    except ImportError:
+        pyscreeze = None
+        center = _couldNotImportPyScreeze
+        #grab = _couldNotImportPyScreeze  # grab() was removed, use screenshot() instead
+        locate = _couldNotImportPyScreeze
+        locateAll = _couldNotImportPyScreeze
+        locateAllOnScreen = _couldNotImportPyScreeze
+        locateCenterOnScreen = _couldNotImportPyScreeze
+        locateOnScreen = _couldNotImportPyScreeze
+        locateOnWindow = _couldNotImportPyScreeze
+        pixel = _couldNotImportPyScreeze
+        pixelMatchesColor = _couldNotImportPyScreeze
+        screenshot = _couldNotImportPyScreeze
+
+
+def mouseInfo():
+    """
+    Launches the MouseInfo app. This application provides mouse coordinate information which can be useful when
+    planning GUI automation tasks. This function blocks until the application is closed.
 
-    def mouseInfo():
-        """
-        This function raises PyAutoGUIException. It's used for the MouseInfo function names if the MouseInfo module
-        failed to be imported.
-        """
+    This function raises PyAutoGUIException if the MouseInfo module can't be imported.
+    """
+    try:
+        import mouseinfo
+    except ImportError:
         raise PyAutoGUIException(
             "PyAutoGUI was unable to import mouseinfo. Please install this module to enable the function you tried to call."
         )
+    mouseinfo.MouseInfoWindow()
 
 
 def useImageNotFoundException(value=None):
@@ -274,42 +279,100 @@ def useImageNotFoundException(value=None):
     """
     if value is None:
         value = True
-    # TODO - this will cause a NameError if PyScreeze couldn't be imported:
-    try:
-        pyscreeze.USE_IMAGE_NOT_FOUND_EXCEPTION = value
-    except NameError:
+    _loadPyScreeze()
+    if pyscreeze is None:
         raise PyAutoGUIException("useImageNotFoundException() ws called but pyscreeze isn't installed.")
+    pyscreeze.USE_IMAGE_NOT_FOUND_EXCEPTION = value
 
 
-if sys.platform == "win32":  # PyGetWindow currently only supports Windows.
+_PYGETWINDOW_NAMES = (
+    "Window",
+    "getActiveWindow",
+    "getActiveWindowTitle",
+    "getWindowsAt",
+    "getWindowsWithTitle",
+    "getAllWindows",
+    "getAllTitles",
+)
+
+
+# If pygetwindow module is not found, those methods will not be available.
+def _couldNotImportPyGetWindow(*unused_args, **unused_kwargs):
+    """
+    This function raises PyAutoGUIException. It's used for the PyGetWindow function names if the PyGetWindow
+    module failed to be imported.
+    """
+    raise PyAutoGUIException(
+        "PyAutoGUI was unable to import pygetwindow. Please install this module to enable the function you tried to call."
+    )
+
+
+def _loadPyGetWindow():
+    """Sets the PyGetWindow names (such as ``getActiveWindow``) as globals of this module."""
     try:
-        from pygetwindow import (
-            Window,
-            getActiveWindow,
-            getActiveWindowTitle,
-            getWindowsAt,
-            getWindowsWithTitle,
-            getAllWindows,
-            getAllTitles,
-        )
+        import pygetwindow
     except ImportError:
-        # If pygetwindow module is not found, those methods will not be available.
-        def _couldNotImportPyGetWindow(*unused_args, **unused_kwargs):
-            """
-            This function raises PyAutoGUIException. It's used for the PyGetWindow function names if the PyGetWindow
-            module failed to be imported.
-            """
-            raise PyAutoGUIException(
-                "PyAutoGUI was unable to import pygetwindow. Please install this module to enable the function you tried to call."
-            )
+        pygetwindow = None
+
+    for name in _PYGETWINDOW_NAMES:
+        if pygetwindow is None:
+            globals()[name] = _couldNotImportPyGetWindow
+        else:
+            globals()[name] = getattr(pygetwindow, name)
+
+
+# The names that are loaded the first time they're used, and the functions that load them. FAILSAFE_POINTS is added
+# to this at the bottom of this file.
+_LAZY_LOADERS = {
+    "alert": _loadPyMsgBox,
+    "confirm": _loadPyMsgBox,
+    "prompt": _loadPyMsgBox,
+    "password": _loadPyMsgBox,
+}
+for _name in _PYTWEENING_NAMES:
+    _LAZY_LOADERS[_name] = _loadPyTweening
+for _name in (
+    "pyscreeze",
+    "center",
+    "locate",
+    "locateAll",
+    "locateAllOnScreen",
+    "locateCenterOnScreen",
+    "locateOnScreen",
+    "locateOnWindow",
+    "pixel",
+    "pixelMatchesColor",
+    "screenshot",
+):
+    _LAZY_LOADERS[_name] = _loadPyScreeze
+if sys.platform == "win32":  # PyGetWindow currently only supports Windows.
+    for _name in _PYGETWINDOW_NAMES:
+        _LAZY_LOADERS[_name] = _loadPyGetWindow
+del _name
+
+
+def __getattr__(name):
+    """
+    Loads the optional dependency that ``name`` comes from, the first time ``name`` is used. (Python 3.7 and later
+    call this for any module attribute that doesn't exist, see PEP 562.)
+    """
+    loader = _LAZY_LOADERS.get(name)
+    if loader is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    loader()
+    return globals()[name]
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_LOADERS))
+
+
+def _lazyGlobal(name):
+    """Returns this module's global variable ``name``, loading it first if it hasn't been loaded yet."""
+    if name in globals():
+        return globals()[name]
+    return __getattr__(name)
 
-        Window = _couldNotImportPyGetWindow
-        getActiveWindow = _couldNotImportPyGetWindow
-        getActiveWindowTitle = _couldNotImportPyGetWindow
-        getWindowsAt = _couldNotImportPyGetWindow
-        getWindowsWithTitle = _couldNotImportPyGetWindow
-        getAllWindows = _couldNotImportPyGetWindow
-        getAllTitles = _couldNotImportPyGetWindow
 
 KEY_NAMES = [
     "\t",
@@ -516,6 +579,16 @@ RIGHT = "right"
 PRIMARY = "primary"
 SECONDARY = "secondary"
 
+# The ways that PyAutoGUI can find out where the mouse cursor is. See POSITION_TRACKING.
+QUERY_POSITION = "query"
+VALIDATE_POSITION = "validate"
+TRUST_POSITION = "trust"
+
+# The curves that moveThrough() and dragThrough() can take through their points.
+LINEAR_CURVE = "linear"
+CATMULL_ROM_CURVE = "catmull-rom"
+BEZIER_CURVE = "bezier"
+
 # Different keyboard mappings:
 # TODO - finish this feature.
 # NOTE: Eventually, I'd like to come up with a better system than this. For now, this seems like it works.
@@ -551,26 +624,59 @@ else:
 # file will access this module vars? It will probably lead to a circular
 # import.
 
-# In seconds. Any duration less than this is rounded to 0.0 to instantly move
-# the mouse.
+# The number of steps per second that mouse movements with a duration are made of. A movement takes a step for each
+# frame, and frames are dropped if moving the mouse cursor can't keep up, so that the movement still ends on time.
+FRAME_RATE = 60
+
+# How position() and the mouse and fail-safe functions find out where the mouse cursor is. With QUERY_POSITION, they
+# ask the OS every time. With VALIDATE_POSITION, they use the position that PyAutoGUI last moved the mouse cursor to,
+# unless they last asked the OS more than POSITION_VALIDATE_INTERVAL seconds ago. With TRUST_POSITION, they assume
+# that only PyAutoGUI moves the mouse cursor, and only ask the OS when PyAutoGUI doesn't know where it is (although
+# the fail-safe still asks every POSITION_VALIDATE_INTERVAL seconds). If the fail-safe watcher is running, the position
+# it has seen is used instead of asking the OS.
+POSITION_TRACKING = QUERY_POSITION
+POSITION_VALIDATE_INTERVAL = 0.1
+
+# If True, the intervals between the events sent by click(), press(), hotkey(), and typewrite(), and the steps of
+# mouse movements with a duration, are timed by the OS instead of by sleeping in Python. The events are all sent at
+# once, and the function returns without waiting for them to be played. This is only supported on Linux, where the X
+# server does the timing. The fail-safe is only checked before the events are sent.
+SERVER_TIMING = False
+
+# These are no longer used, since FRAME_RATE replaced them, but are kept so that code that sets them keeps working.
 MINIMUM_DURATION = 0.1
-# If sleep_amount is less than MINIMUM_DURATION, time.sleep() will be a no-op and the mouse cursor moves there instantly.
-# TODO: This value should vary with the platform. http://stackoverflow.com/q/1133857
 MINIMUM_SLEEP = 0.05
 
+# If True, tweened mouse movements use NumPy (if it's installed) to work out all of their steps at once.
+USE_NUMPY = True
+
 # The number of seconds to pause after EVERY public function call. Useful for debugging:
 PAUSE = 0.1  # Tenth-second pause by default.
 
+# time.sleep() usually wakes up a little late. If SPIN_THRESHOLD is more than 0, PyAutoGUI sleeps until this many
+# seconds before a pause or interval ends, and then busy-waits for the rest. This makes timing more precise, but uses
+# CPU time while waiting. Something like 0.001 is enough to get sub-millisecond precision on most systems.
+SPIN_THRESHOLD = 0.0
+
 # Interface need some catch up time on darwin (macOS) systems. Possible values probably differ based on your system performance.
 # This value affects mouse moveTo, dragTo and key event duration.
 # TODO: Find a dynamic way to let the system catch up instead of blocking with a magic number.
 DARWIN_CATCH_UP_TIME = 0.01
 
 # If the mouse is over a coordinate in FAILSAFE_POINTS and FAILSAFE is True, the FailSafeException is raised.
-# The rest of the points are added to the FAILSAFE_POINTS list at the bottom of this file, after size() has been defined.
-# The points are for the corners of the screen, but note that these points don't automatically change if the screen resolution changes.
+# FAILSAFE_POINTS isn't set until it's first used (see _loadFailSafePoints() at the bottom of this file), since finding
+# the screen size means connecting to the OS. It defaults to the four corners of the screen.
+# On Linux, points at the corners of the screen are moved to the new corners when the screen's size changes. On other
+# platforms, they don't automatically change if the screen resolution changes.
 FAILSAFE = True
-FAILSAFE_POINTS = [(0, 0)]
+
+# How often the fail-safe watcher polls the mouse position on platforms that can't deliver pointer motion events.
+# See startFailSafeWatcher().
+FAILSAFE_WATCHER_POLL_INTERVAL = 0.01
+
+# The maximum number of input events that batch() lets the platform module send before waiting for the OS to process
+# them. (Currently only the X11 platform module batches events.)
+MAX_BATCHED_EVENTS = 64
 
 LOG_SCREENSHOTS = False  # If True, save screenshots for clicks and key presses.
 
@@ -580,6 +686,31 @@ G_LOG_SCREENSHOTS_FILENAMES = []  # TODO - make this a deque
 
 Point = collections.namedtuple("Point", "x y")
 Size = collections.namedtuple("Size", "width height")
+PathStep = collections.namedtuple("PathStep", "x y time")
+TimingStats = collections.namedtuple("TimingStats", "waits requested lateness maxLateness droppedFrames")
+ScrollStats = collections.namedtuple("ScrollStats", "notches seconds notchesPerSecond")
+MotionStats = collections.namedtuple("MotionStats", "sent elided")
+
+# The clock used for pauses and intervals. It must never go backwards.
+if hasattr(time, "perf_counter"):
+    _clock = time.perf_counter
+else:
+    _clock = time.time  # Python 2 doesn't have a monotonic clock.
+
+
+# The Session that PyAutoGUI functions use on each thread. See Session and _currentSession().
+_sessionState = threading.local()
+
+
+def _currentSession():
+    """
+    Returns the ``Session`` that PyAutoGUI functions called on this thread should use: the session whose method was
+    called (or whose ``with`` block was entered) most recently on this thread, or the default session.
+    """
+    session = getattr(_sessionState, "session", None)
+    if session is None:
+        return _defaultSession
+    return session
 
 
 def _genericPyAutoGUIChecks(wrappedFunction):
@@ -591,13 +722,36 @@ def _genericPyAutoGUIChecks(wrappedFunction):
     @functools.wraps(wrappedFunction)
     def wrapper(*args, **kwargs):
         failSafeCheck()
-        returnVal = wrappedFunction(*args, **kwargs)
+        with batch():
+            returnVal = wrappedFunction(*args, **kwargs)
         _handlePause(kwargs.get("_pause", True))
         return returnVal
 
     return wrapper
 
 
+@contextmanager
+def batch():
+    """
+    Context manager that batches the input events sent by the PyAutoGUI functions called inside of it. Instead of
+    waiting for the OS to process each event (which is a round trip to the X server on Linux), the events are sent
+    right away and PyAutoGUI only waits once at the end of the batch, or whenever ``MAX_BATCHED_EVENTS`` events are
+    waiting to be processed. This makes a big difference over remote or high-latency ``DISPLAY`` connections.
+
+    Every PyAutoGUI function already batches the events it sends itself. Batches can be nested. On platforms that
+    don't support batching, this does nothing.
+    """
+    if not hasattr(platformModule, "_beginBatch"):
+        yield
+        return
+
+    platformModule._beginBatch()
+    try:
+        yield
+    finally:
+        platformModule._endBatch()
+
+
 # General Functions
 # =================
 
@@ -632,11 +786,158 @@ def _handlePause(_pause):
     """
     A helper function for performing a pause at the end of a PyAutoGUI function based on some settings.
 
-    If ``_pause`` is ``True``, then sleep for ``PAUSE`` seconds (the global pause setting).
+    If ``_pause`` is ``True``, then sleep for ``PAUSE`` seconds (the global pause setting). The pauses are scheduled
+    on a ``_Timeline``, so the time spent doing the function calls themselves is taken out of the pause instead of
+    being added on top of it, and a script that makes thousands of calls doesn't drift.
     """
     if _pause:
-        assert isinstance(PAUSE, int) or isinstance(PAUSE, float)
-        time.sleep(PAUSE)
+        session = _currentSession()
+        assert isinstance(session.PAUSE, int) or isinstance(session.PAUSE, float)
+        session._pauseTimeline.wait(session.PAUSE)
+
+
+def _sleepUntil(deadline, requested):
+    """
+    Sleeps until ``_clock()`` reaches ``deadline``, and records how late it woke up in the timing stats. ``requested``
+    is the number of seconds the caller asked to wait for. Any batched input events are sent to the OS before
+    sleeping, instead of waiting for the end of the batch. On the input thread, cancelling the ``Motion`` that's
+    running stops the sleep.
+    """
+    remaining = deadline - _clock()
+    if remaining > 0 and hasattr(platformModule, "_flush"):
+        platformModule._flush()
+    motion = getattr(_sessionState, "motion", None)
+    while remaining > SPIN_THRESHOLD:
+        if motion is None:
+            time.sleep(remaining - SPIN_THRESHOLD)
+        elif motion._cancelEvent.wait(remaining - SPIN_THRESHOLD):
+            raise _MotionCancelled()  # A Motion's sleeps end as soon as it's cancelled.
+        remaining = deadline - _clock()
+    while remaining > 0:
+        remaining = deadline - _clock()  # Busy-wait for the last SPIN_THRESHOLD seconds.
+
+    lateness = -remaining
+    timingStats = _currentSession()._timingStats
+    timingStats[0] += 1
+    timingStats[1] += requested
+    timingStats[2] += lateness
+    timingStats[3] = max(timingStats[3], lateness)
+
+
+def _sleep(seconds):
+    """
+    PyAutoGUI functions call this instead of ``time.sleep()`` so that the sleep is included in the timing stats and
+    any batched input events are sent to the OS first. Sleeping for 0 seconds doesn't call ``time.sleep()`` at all.
+    """
+    if seconds > 0:
+        _sleepUntil(_clock() + seconds, seconds)
+
+
+class _Timeline(object):
+    """
+    A series of waits scheduled at absolute deadlines, rather than by sleeping for some number of seconds after
+    whatever came before. Each call to ``wait(seconds)`` waits until ``seconds`` after the previous deadline, so the
+    time spent between waits (sending input events, checking the fail-safe, and oversleeping) is made up for.
+
+    If the timeline has fallen behind by more than a whole wait (for example, because a slow mouse move happened
+    between two waits, or the timeline hasn't been used for a while), it starts over from the current time instead of
+    skipping waits to catch up.
+    """
+
+    serverTimed = False
+
+    def __init__(self):
+        self.deadline = _clock()
+
+    def wait(self, seconds):
+        if seconds <= 0:
+            return  # Don't make a pointless sleep system call.
+        now = _clock()
+        if now - self.deadline > seconds:
+            self.deadline = now
+        self.deadline += seconds
+        _sleepUntil(self.deadline, seconds)
+
+
+class _ServerTimeline(_Timeline):
+    """
+    A timeline whose waits are done by the OS: instead of sleeping, each wait is added to the delay before the next
+    input event that's sent. See _eventTimeline().
+    """
+
+    serverTimed = True
+
+    def wait(self, seconds):
+        if seconds > 0:
+            platformModule._delay(seconds)
+
+
+@contextmanager
+def _eventTimeline():
+    """
+    Context manager that gives the timeline for the intervals between the events that a PyAutoGUI function sends. If
+    the current session's ``SERVER_TIMING`` setting is on and the platform module has a ``_delay()`` function, this is
+    a ``_ServerTimeline`` and the events are batched, so they're sent all at once for the OS to play back on time.
+    Otherwise it's an ordinary ``_Timeline``.
+    """
+    session = _currentSession()
+    if session._serverTimed:
+        yield _ServerTimeline()  # Called from inside another function's server-timed events, such as typewrite().
+        return
+    if not session.SERVER_TIMING or not hasattr(platformModule, "_delay"):
+        yield _Timeline()
+        return
+
+    platformModule._beginBatch()
+    session._serverTimed = True
+    try:
+        yield _ServerTimeline()
+    finally:
+        session._serverTimed = False
+        platformModule._endBatch()
+
+
+def getTimingStats():
+    """
+    Returns a ``TimingStats`` namedtuple describing how well PyAutoGUI's pauses, intervals, and tweening steps kept
+    to the requested timing since the program started (or since ``resetTimingStats()`` was called).
+
+    ``waits`` is the number of waits, ``requested`` is the total number of seconds they asked for, ``lateness`` is
+    the total number of seconds that they ended late by, and ``maxLateness`` is the most that any one wait was late.
+    ``droppedFrames`` is the number of mouse movement steps that were left out because the movement had fallen behind.
+    """
+    return TimingStats(*_currentSession()._timingStats)
+
+
+def getScrollStats():
+    """
+    Returns a ``ScrollStats`` namedtuple with the number of notches that ``scroll()``, ``hscroll()``, and ``vscroll()``
+    have scrolled since the program started (or since ``resetTimingStats()`` was called), the total number of seconds
+    it took to send them to the OS, and the average number of notches per second that this works out to. Use this to
+    check that scrolls with an ``interval`` keep to the rate they ask for.
+    """
+    notches, seconds = _currentSession()._scrollStats
+    return ScrollStats(notches, seconds, notches / seconds if seconds > 0 else 0.0)
+
+
+def getMotionStats():
+    """
+    Returns a ``MotionStats`` namedtuple with the number of mouse motion events that have been sent to the OS since
+    the program started (or since ``resetTimingStats()`` was called), and the number that were left out (elided)
+    because PyAutoGUI had already put the mouse cursor at that position. For example, ``click(100, 100)`` moves the
+    mouse cursor to 100, 100 before pressing and again before releasing the button, which only needs one event.
+
+    Motion events are only left out on Linux, and both numbers are always ``0`` on Windows and macOS.
+    """
+    return MotionStats(*_currentSession()._motionStats)
+
+
+def resetTimingStats():
+    """Resets the numbers returned by ``getTimingStats()``, ``getScrollStats()``, and ``getMotionStats()`` to zero."""
+    session = _currentSession()
+    session._timingStats[:] = [0, 0.0, 0.0, 0.0, 0]
+    session._scrollStats[:] = [0, 0.0]
+    session._motionStats[:] = [0, 0]
 
 
 def _normalizeXYArgs(firstArg, secondArg):
@@ -659,6 +960,7 @@ def _normalizeXYArgs(firstArg, secondArg):
 
     elif isinstance(firstArg, str):
         # If x is a string, we assume it's an image filename to locate on the screen:
+        _loadPyScreeze()
         try:
             location = locateOnScreen(firstArg)
             # The following code only runs if pyscreeze.USE_IMAGE_NOT_FOUND_EXCEPTION is not set to True, meaning that
@@ -686,7 +988,7 @@ def _normalizeXYArgs(firstArg, secondArg):
         elif len(firstArg) == 4:
             # firstArg is a four-integer tuple, (left, top, width, height), we should return the center point
             if secondArg is None:
-                return center(firstArg)
+                return _lazyGlobal("center")(firstArg)
             else:
                 raise PyAutoGUIException(
                     "When passing a sequence for firstArg, secondArg must not be passed and default to None (received {0}).".format(
@@ -719,7 +1021,8 @@ def _logScreenshot(logScreenshot, funcName, funcArgs, folder="."):
     """
     if not logScreenshot:
         return  # Don't take a screenshot.
-    if logScreenshot is None and LOG_SCREENSHOTS is False:
+    session = _currentSession()
+    if logScreenshot is None and session.LOG_SCREENSHOTS is False:
         return  # Don't take a screenshot.
 
     # Ensure that the "specifics" string isn't too long for the filename:
@@ -741,12 +1044,13 @@ def _logScreenshot(logScreenshot, funcName, funcArgs, folder="."):
     filepath = os.path.join(folder, filename)
 
     # Delete the oldest screenshot if we've reached the maximum:
-    if (LOG_SCREENSHOTS_LIMIT is not None) and (len(G_LOG_SCREENSHOTS_FILENAMES) >= LOG_SCREENSHOTS_LIMIT):
-        os.unlink(os.path.join(folder, G_LOG_SCREENSHOTS_FILENAMES[0]))
-        del G_LOG_SCREENSHOTS_FILENAMES[0]
+    filenames = session.G_LOG_SCREENSHOTS_FILENAMES
+    if (session.LOG_SCREENSHOTS_LIMIT is not None) and (len(filenames) >= session.LOG_SCREENSHOTS_LIMIT):
+        os.unlink(os.path.join(folder, filenames[0]))
+        del filenames[0]
 
-    screenshot(filepath)
-    G_LOG_SCREENSHOTS_FILENAMES.append(filename)
+    _lazyGlobal("screenshot")(filepath)
+    filenames.append(filename)
 
 
 def position(x=None, y=None):
@@ -764,9 +1068,7 @@ def position(x=None, y=None):
 
     NOTE: The position() function doesn't check for failsafe.
     """
-    posx, posy = platformModule._position()
-    posx = int(posx)
-    posy = int(posy)
+    posx, posy = _cursorPosition()
     if x is not None:  # If set, the x parameter overrides the return value.
         posx = int(x)
     if y is not None:  # If set, the y parameter overrides the return value.
@@ -774,6 +1076,40 @@ def position(x=None, y=None):
     return Point(posx, posy)
 
 
+def _cursorPosition(forFailSafe=False):
+    """
+    Returns the mouse cursor's position as an (x, y) tuple of ints, following the current session's
+    ``POSITION_TRACKING`` setting. If ``forFailSafe`` is True, ``TRUST_POSITION`` is treated like
+    ``VALIDATE_POSITION``, so that the fail-safe still notices the user moving the mouse cursor.
+    """
+    session = _currentSession()
+    policy = session.POSITION_TRACKING
+    if policy != QUERY_POSITION:
+        watcher = session._failSafeWatcher
+        if watcher is not None and watcher.position is not None:
+            return watcher.position
+        tracked = session._trackedPosition
+        if tracked is not None:
+            if policy == TRUST_POSITION and not forFailSafe:
+                return tracked
+            if _clock() - session._positionQueriedAt < session.POSITION_VALIDATE_INTERVAL:
+                return tracked
+
+    posx, posy = platformModule._position()
+    session._trackedPosition = (int(posx), int(posy))
+    session._positionQueriedAt = _clock()
+    return session._trackedPosition
+
+
+def _trackPosition(x, y):
+    """
+    Records that PyAutoGUI moved the mouse cursor to ``x``, ``y``, for _cursorPosition(). Positions off of the screen
+    aren't recorded, since the OS might not have put the mouse cursor there.
+    """
+    session = _currentSession()
+    session._trackedPosition = (x, y) if onScreen(x, y) else None
+
+
 def size():
     """Returns the width and height of the screen as a two-integer tuple.
 
@@ -822,6 +1158,18 @@ button numbers but rather just "left" or "right").
 """
 
 
+# The buttons that _normalizeButton() returns for each of its button arguments, other than PRIMARY and SECONDARY. The
+# scroll wheel buttons 4 to 7 can only be used on Linux.
+_BUTTONS = {LEFT: LEFT, MIDDLE: MIDDLE, RIGHT: RIGHT, 1: LEFT, 2: MIDDLE, 3: RIGHT}
+if platform.system() == "Linux":
+    _BUTTONS.update({4: 4, 5: 5, 6: 6, 7: 7})
+    _INVALID_BUTTON_MESSAGE = (
+        "button argument must be one of ('left', 'middle', 'right', 'primary', 'secondary', 1, 2, 3, 4, 5, 6, 7)"
+    )
+else:
+    _INVALID_BUTTON_MESSAGE = "button argument must be one of ('left', 'middle', 'right', 'primary', 'secondary', 1, 2, 3)"
+
+
 def _normalizeButton(button):
     """
     The left, middle, and right mouse buttons are button numbers 1, 2, and 3 respectively. This is the numbering that
@@ -839,44 +1187,23 @@ def _normalizeButton(button):
     settings.
 
     If the buttons are swapped, the primary button is the right mouse button and the secondary button is the left mouse
-    button. If not swapped, the primary and secondary buttons are the left and right buttons, respectively.
-
-    NOTE: Swap detection has not been implemented yet.
+    button. If not swapped, the primary and secondary buttons are the left and right buttons, respectively. On Windows,
+    this is the mouse setting for swapping the buttons. On Linux, it's the X server's pointer mapping (as set by
+    ``xmodmap -e "pointer = 3 2 1"``), which the platform module caches. On macOS, the buttons are never swapped.
     """
-    # TODO - The swap detection hasn't been done yet. For Windows, see https://stackoverflow.com/questions/45627956/check-if-mouse-buttons-are-swapped-or-not-in-c
-    # TODO - We should check the OS settings to see if it's a left-hand setup, where button 1 would be "right".
-
-    # Check that `button` has a valid value:
-    button = button.lower()
-    if platform.system() == "Linux":
-        # Check for valid button arg on Linux:
-        if button not in (LEFT, MIDDLE, RIGHT, PRIMARY, SECONDARY, 1, 2, 3, 4, 5, 6, 7):
-            raise PyAutoGUIException(
-                "button argument must be one of ('left', 'middle', 'right', 'primary', 'secondary', 1, 2, 3, 4, 5, 6, 7)"
-            )
-    else:
-        # Check for valid button arg on Windows and macOS:
-        if button not in (LEFT, MIDDLE, RIGHT, PRIMARY, SECONDARY, 1, 2, 3):
-            raise PyAutoGUIException(
-                "button argument must be one of ('left', 'middle', 'right', 'primary', 'secondary', 1, 2, 3)"
-            )
+    if isinstance(button, str):
+        button = button.lower()
 
-    # TODO - Check if the primary/secondary mouse buttons have been swapped:
-    if button in (PRIMARY, SECONDARY):
-        swapped = platformModule._mouse_is_swapped()
-        if swapped:
-            if button == PRIMARY:
-                return RIGHT
-            elif button == SECONDARY:
-                return LEFT
-        else:
-            if button == PRIMARY:
-                return LEFT
-            elif button == SECONDARY:
-                return RIGHT
+    if button == PRIMARY:
+        return RIGHT if platformModule._mouse_is_swapped() else LEFT
+    elif button == SECONDARY:
+        return LEFT if platformModule._mouse_is_swapped() else RIGHT
 
     # Return a mouse button integer value, not a string like 'left':
-    return {LEFT: LEFT, MIDDLE: MIDDLE, RIGHT: RIGHT, 1: LEFT, 2: MIDDLE, 3: RIGHT, 4: 4, 5: 5, 6: 6, 7: 7}[button]
+    try:
+        return _BUTTONS[button]
+    except (KeyError, TypeError):
+        raise PyAutoGUIException(_INVALID_BUTTON_MESSAGE)
 
 
 @_genericPyAutoGUIChecks
@@ -995,12 +1322,13 @@ def click(
             if button in (LEFT, MIDDLE, RIGHT):
                 platformModule._multiClick(x, y, button, 1, interval)
     else:
-        for i in range(clicks):
-            failSafeCheck()
-            if button in (LEFT, MIDDLE, RIGHT):
-                platformModule._click(x, y, button)
+        with _eventTimeline() as timeline:
+            for i in range(clicks):
+                failSafeCheck()
+                if button in (LEFT, MIDDLE, RIGHT):
+                    platformModule._click(x, y, button)
 
-            time.sleep(interval)
+                timeline.wait(interval)
 
 
 @_genericPyAutoGUIChecks
@@ -1172,7 +1500,7 @@ def tripleClick(x=None, y=None, interval=0.0, button=LEFT, duration=0.0, tween=l
 
 
 @_genericPyAutoGUIChecks
-def scroll(clicks, x=None, y=None, logScreenshot=None, _pause=True):
+def scroll(clicks, x=None, y=None, logScreenshot=None, _pause=True, interval=0.0):
     """Performs a scroll of the mouse scroll wheel.
 
     Whether this is a vertical or horizontal scroll depends on the underlying
@@ -1189,6 +1517,9 @@ def scroll(clicks, x=None, y=None, logScreenshot=None, _pause=True):
         click happens. None by default. If tuple, this is used for x and y.
       y (int, float, None, optional): The y position on the screen where the
         click happens. None by default.
+      interval (float, optional): The number of seconds between each notch of
+        scrolling, for apps that miss scroll events that come too quickly.
+        0.0 by default, for all of the notches at once.
 
     Returns:
       None
@@ -1198,11 +1529,11 @@ def scroll(clicks, x=None, y=None, logScreenshot=None, _pause=True):
     x, y = position(x, y)
 
     _logScreenshot(logScreenshot, "scroll", "%s,%s,%s" % (clicks, x, y), folder=".")
-    platformModule._scroll(clicks, x, y)
+    _scrollNotches(platformModule._scroll, clicks, x, y, interval)
 
 
 @_genericPyAutoGUIChecks
-def hscroll(clicks, x=None, y=None, logScreenshot=None, _pause=True):
+def hscroll(clicks, x=None, y=None, logScreenshot=None, _pause=True, interval=0.0):
     """Performs an explicitly horizontal scroll of the mouse scroll wheel,
     if this is supported by the operating system. (Currently just Linux.)
 
@@ -1217,6 +1548,9 @@ def hscroll(clicks, x=None, y=None, logScreenshot=None, _pause=True):
         click happens. None by default. If tuple, this is used for x and y.
       y (int, float, None, optional): The y position on the screen where the
         click happens. None by default.
+      interval (float, optional): The number of seconds between each notch of
+        scrolling, for apps that miss scroll events that come too quickly.
+        0.0 by default, for all of the notches at once.
 
     Returns:
       None
@@ -1226,11 +1560,11 @@ def hscroll(clicks, x=None, y=None, logScreenshot=None, _pause=True):
     x, y = position(x, y)
 
     _logScreenshot(logScreenshot, "hscroll", "%s,%s,%s" % (clicks, x, y), folder=".")
-    platformModule._hscroll(clicks, x, y)
+    _scrollNotches(platformModule._hscroll, clicks, x, y, interval)
 
 
 @_genericPyAutoGUIChecks
-def vscroll(clicks, x=None, y=None, logScreenshot=None, _pause=True):
+def vscroll(clicks, x=None, y=None, logScreenshot=None, _pause=True, interval=0.0):
     """Performs an explicitly vertical scroll of the mouse scroll wheel,
     if this is supported by the operating system. (Currently just Linux.)
 
@@ -1245,6 +1579,9 @@ def vscroll(clicks, x=None, y=None, logScreenshot=None, _pause=True):
         click happens. None by default. If tuple, this is used for x and y.
       y (int, float, None, optional): The y position on the screen where the
         click happens. None by default.
+      interval (float, optional): The number of seconds between each notch of
+        scrolling, for apps that miss scroll events that come too quickly.
+        0.0 by default, for all of the notches at once.
 
     Returns:
       None
@@ -1254,11 +1591,227 @@ def vscroll(clicks, x=None, y=None, logScreenshot=None, _pause=True):
     x, y = position(x, y)
 
     _logScreenshot(logScreenshot, "vscroll", "%s,%s,%s" % (clicks, x, y), folder=".")
-    platformModule._vscroll(clicks, x, y)
+    _scrollNotches(platformModule._vscroll, clicks, x, y, interval)
+
+
+def _scrollNotches(scrollFunction, clicks, x, y, interval):
+    """
+    Scrolls ``clicks`` notches at ``x``, ``y`` with ``scrollFunction`` (the platform module's ``_scroll()``,
+    ``_hscroll()``, or ``_vscroll()``). Without an ``interval``, all of the notches are sent at once. With one, they're
+    sent one at a time, with a wait of ``interval`` seconds after each, the same as the clicks of click(). The notches
+    and the time they took to send are added to the session's scroll stats (see getScrollStats()).
+    """
+    clicks = int(clicks)
+    if clicks == 0:
+        return
+    interval = float(interval)
+    start = _clock()
+    if interval <= 0:
+        scrollFunction(clicks, x, y)
+        seconds = _clock() - start
+    else:
+        notch = 1 if clicks > 0 else -1
+        with _eventTimeline() as timeline:
+            for i in range(abs(clicks)):
+                if i > 0:
+                    failSafeCheck()  # The first notch was checked by _genericPyAutoGUIChecks.
+                scrollFunction(notch, x, y)
+                timeline.wait(interval)
+            if timeline.serverTimed:
+                seconds = abs(clicks) * interval  # The notches are played back at this rate by the OS.
+            else:
+                seconds = _clock() - start
+
+    scrollStats = _currentSession()._scrollStats
+    scrollStats[0] += abs(clicks)
+    scrollStats[1] += seconds
+
+
+class _MotionCancelled(Exception):
+    """Raised on the input thread when the ``Motion`` that's running is cancelled, to stop it wherever it is."""
+
+
+class Motion(object):
+    """
+    A mouse movement started by ``moveTo()``, ``moveRel()``, ``dragTo()``, or ``dragRel()`` with ``block=False``. The
+    movement is made on the session's input thread, while the function that started it returns this right away.
+    Movements started this way are made one after another, in the order they were started.
+
+    >>> motion = pyautogui.moveTo(500, 500, duration=2, block=False)  # doctest: +SKIP
+    >>> motion.progress  # doctest: +SKIP
+    0.25
+    >>> motion.cancel()  # doctest: +SKIP
+    >>> motion.join()  # doctest: +SKIP
+    True
+
+    To change where the mouse cursor is going partway through a movement, cancel it and start a new one.
+    """
+
+    def __init__(self, function, args, kwargs):
+        self._function = function
+        self._args = args
+        self._kwargs = kwargs
+        self._cancelEvent = threading.Event()
+        self._doneEvent = threading.Event()
+        self._progress = 0.0
+        self._cancelled = False
+        self._exception = None
+
+    def __repr__(self):
+        if self._cancelled:
+            state = "cancelled"
+        elif self._doneEvent.is_set():
+            state = "done"
+        else:
+            state = "progress=%.2f" % (self._progress)
+        return "<%s %s %s>" % (self.__class__.__name__, self._function.__name__, state)
+
+    @property
+    def progress(self):
+        """
+        How far along the movement's duration the mouse cursor has been moved, from ``0.0`` before it starts to
+        ``1.0`` once it reaches its destination. This stays where it was if the movement is cancelled.
+        """
+        return self._progress
+
+    @property
+    def done(self):
+        """True once the movement has finished, been cancelled, or raised an exception."""
+        return self._doneEvent.is_set()
 
+    @property
+    def cancelled(self):
+        """True if the movement was cancelled before it finished."""
+        return self._cancelled
 
+    def cancel(self):
+        """
+        Stops the movement where the mouse cursor is now, or keeps it from starting if it hasn't yet. A cancelled
+        drag releases its mouse button. This returns right away; call ``join()`` to wait until the movement has
+        stopped. Cancelling a movement that has finished does nothing. With ``SERVER_TIMING``, the steps that were
+        already sent to the X server can't be cancelled.
+        """
+        self._cancelEvent.set()
+
+    def join(self, timeout=None):
+        """
+        Waits until the movement has finished or stopped, for up to ``timeout`` seconds (or for as long as it takes,
+        if ``timeout`` is ``None``). Returns True if it has, or False if the time ran out first. If the movement
+        raised an exception, such as ``FailSafeException``, it's raised here.
+        """
+        if not self._doneEvent.wait(timeout):
+            return False
+        if self._exception is not None:
+            raise self._exception
+        return True
+
+    def _run(self, session):
+        """Makes the movement. Called on ``session``'s input thread."""
+        if self._cancelEvent.is_set():
+            self._cancelled = True
+            self._doneEvent.set()
+            return
+
+        _sessionState.motion = self
+        try:
+            with session:
+                self._function(*self._args, **self._kwargs)
+            self._progress = 1.0
+        except _MotionCancelled:
+            # Cancelling during the pause after the mouse cursor reached its destination only cuts the pause short.
+            self._cancelled = self._progress < 1.0
+        except Exception as exc:
+            self._exception = exc
+        finally:
+            _sessionState.motion = None
+            self._doneEvent.set()
+
+    def _trackSteps(self, steps, duration):
+        """
+        Yields each ``PathStep`` in ``steps``, recording the progress after each one has been sent, and raises
+        _MotionCancelled instead of yielding the next one once the movement is cancelled.
+        """
+        for step in steps:
+            if self._cancelEvent.is_set():
+                raise _MotionCancelled()
+            yield step
+            self._progress = step.time / duration if duration > 0 else 1.0
+
+
+def _motionStage(steps, duration):
+    """
+    If the current thread is the input thread making a ``Motion``, returns ``steps`` with that motion's progress
+    tracking and cancelling added. Otherwise returns ``steps`` as is.
+    """
+    motion = getattr(_sessionState, "motion", None)
+    if motion is None:
+        return steps
+    return motion._trackSteps(steps, duration)
+
+
+class _InputThread(threading.Thread):
+    """
+    The thread that a session makes its ``Motion`` movements on, one at a time in the order they were started. It's
+    started the first time it's needed and runs until the session is closed (or the program exits, for the default
+    session).
+
+    The thread has its own connection to the OS (see ``Session._getConnection()``), so that the session can still be
+    used on other threads while a movement is being made.
+    """
+
+    def __init__(self, session):
+        threading.Thread.__init__(self, name="PyAutoGUI input thread")
+        self.daemon = True  # Don't keep the program running.
+        self._session = session
+        self._motions = queue.Queue()
+        self.connection = None
+
+    def submit(self, motion):
+        self._motions.put(motion)
+        return motion
+
+    def stop(self):
+        """Stops the thread once the movements already started have been made, and waits for it."""
+        self._motions.put(None)
+        self.join()
+
+    def run(self):
+        try:
+            while True:
+                motion = self._motions.get()
+                if motion is None:
+                    return
+                motion._run(self._session)
+        finally:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+
+# Keeps two threads from starting input threads for the same session at the same time.
+_inputThreadLock = threading.Lock()
+
+
+def _nonBlocking(wrappedFunction):
+    """
+    A decorator for the mouse functions that have a ``block`` argument. If ``block=False`` is passed, the function is
+    called on the current session's input thread instead (fail-safe check, pause, and all) and a ``Motion`` for it is
+    returned right away.
+    """
+
+    @functools.wraps(wrappedFunction)
+    def wrapper(*args, **kwargs):
+        if kwargs.get("block", True):
+            return wrappedFunction(*args, **kwargs)
+        kwargs["block"] = True
+        return _currentSession()._getInputThread().submit(Motion(wrappedFunction, args, kwargs))
+
+    return wrapper
+
+
+@_nonBlocking
 @_genericPyAutoGUIChecks
-def moveTo(x=None, y=None, duration=0.0, tween=linear, logScreenshot=False, _pause=True):
+def moveTo(x=None, y=None, duration=0.0, tween=linear, logScreenshot=False, _pause=True, block=True):
     """Moves the mouse cursor to a point on the screen.
 
     The x and y parameters detail where the mouse event happens. If None, the
@@ -1278,9 +1831,12 @@ def moveTo(x=None, y=None, duration=0.0, tween=linear, logScreenshot=False, _pau
         instantaneously. 0.0 by default.
       tween (func, optional): The tweening function used if the duration is not
         0. A linear tween is used by default.
+      block (bool, optional): If False, the movement is made on the
+        session's input thread and a Motion is returned right away, so that
+        it can be watched or cancelled. True by default.
 
     Returns:
-      None
+      None, or a Motion if block is False.
     """
     x, y = _normalizeXYArgs(x, y)
 
@@ -1288,8 +1844,9 @@ def moveTo(x=None, y=None, duration=0.0, tween=linear, logScreenshot=False, _pau
     _mouseMoveDrag("move", x, y, 0, 0, duration, tween)
 
 
+@_nonBlocking
 @_genericPyAutoGUIChecks
-def moveRel(xOffset=None, yOffset=None, duration=0.0, tween=linear, logScreenshot=False, _pause=True):
+def moveRel(xOffset=None, yOffset=None, duration=0.0, tween=linear, logScreenshot=False, _pause=True, block=True):
     """Moves the mouse cursor to a point on the screen, relative to its current
     position.
 
@@ -1308,9 +1865,12 @@ def moveRel(xOffset=None, yOffset=None, duration=0.0, tween=linear, logScreensho
         instantaneously. 0.0 by default.
       tween (func, optional): The tweening function used if the duration is not
         0. A linear tween is used by default.
+      block (bool, optional): If False, the movement is made on the
+        session's input thread and a Motion is returned right away, so that
+        it can be watched or cancelled. True by default.
 
     Returns:
-      None
+      None, or a Motion if block is False.
     """
     xOffset, yOffset = _normalizeXYArgs(xOffset, yOffset)
 
@@ -1321,9 +1881,86 @@ def moveRel(xOffset=None, yOffset=None, duration=0.0, tween=linear, logScreensho
 move = moveRel  # For PyAutoGUI 1.0, move() replaces moveRel().
 
 
+@_genericPyAutoGUIChecks
+def nudge(xOffset=0, yOffset=0, duration=0.0, tween=linear, logScreenshot=False, _pause=True):
+    """Moves the mouse cursor by xOffset, yOffset pixels without finding out
+    where it is first.
+
+    On Linux, this sends relative motion events to the X server, so unlike
+    moveRel() it doesn't need a round trip to the X server to get the mouse
+    cursor's position before moving it. This adds up for many small
+    movements, such as when drawing or playing a game. The X server keeps the
+    mouse cursor on the screen, so a nudge past the edge of the screen stops
+    at the edge. While a mouse button is held down, a nudge drags. On other
+    platforms, this is the same as moveRel().
+
+    The fail-safe is checked before the movement and before each of its
+    steps, like the other mouse functions.
+
+    Args:
+      xOffset (int, float, optional): How far left (for negative values) or
+        right (for positive values) to move the cursor. 0 by default.
+      yOffset (int, float, optional): How far up (for negative values) or
+        down (for positive values) to move the cursor. 0 by default.
+      duration (float, optional): The amount of time it takes to move the mouse
+        cursor. If 0, then the mouse cursor is moved instantaneously. 0.0 by
+        default.
+      tween (func, optional): The tweening function used if the duration is not
+        0. A linear tween is used by default.
+
+    Returns:
+      None
+    """
+    xOffset = int(xOffset)
+    yOffset = int(yOffset)
+
+    _logScreenshot(logScreenshot, "nudge", "%s,%s" % (xOffset, yOffset), folder=".")
+    if not hasattr(platformModule, "_moveRel"):
+        _mouseMoveDrag("move", None, None, xOffset, yOffset, duration, tween)
+        return
+    if xOffset == 0 and yOffset == 0:
+        return
+
+    with _eventTimeline() as timeline:
+        if duration > 0:
+            # The path is tweened from 0, 0 and each step is sent as the difference from the step before it.
+            path = _paceStage(iterPath(0, 0, xOffset, yOffset, duration, tween), duration, timeline)
+        else:
+            path = [PathStep(xOffset, yOffset, 0.0)]
+
+        previousX = previousY = 0
+        for i, step in enumerate(path):
+            if i > 0:
+                failSafeCheck()  # The first step was checked by _genericPyAutoGUIChecks.
+            platformModule._moveRel(step.x - previousX, step.y - previousY)
+            _nudgeTrackedPosition(step.x - previousX, step.y - previousY)
+            previousX, previousY = step.x, step.y
+
+
+def _nudgeTrackedPosition(xOffset, yOffset):
+    """Moves the tracked mouse cursor position (see _cursorPosition()) by ``xOffset``, ``yOffset``, like nudge() does."""
+    session = _currentSession()
+    if session._trackedPosition is None:
+        return
+    # The OS keeps the mouse cursor on the screen.
+    width, height = size()
+    x = min(max(session._trackedPosition[0] + xOffset, 0), width - 1)
+    y = min(max(session._trackedPosition[1] + yOffset, 0), height - 1)
+    session._trackedPosition = (x, y)
+
+
+@_nonBlocking
 @_genericPyAutoGUIChecks
 def dragTo(
-    x=None, y=None, duration=0.0, tween=linear, button=PRIMARY, logScreenshot=None, _pause=True, mouseDownUp=True
+    x=None,
+    y=None,
+    duration=0.0,
+    tween=linear,
+    button=PRIMARY,
+    logScreenshot=None,
+    _pause=True,
+    mouseDownUp=True,
+    block=True,
 ):
     """Performs a mouse drag (mouse movement while a button is held down) to a
     point on the screen.
@@ -1348,23 +1985,35 @@ def dragTo(
       button (str, int, optional): The mouse button released. TODO
       mouseDownUp (True, False): When true, the mouseUp/Down actions are not performed.
         Which allows dragging over multiple (small) actions. 'True' by default.
+      block (bool, optional): If False, the movement is made on the
+        session's input thread and a Motion is returned right away, so that
+        it can be watched or cancelled. True by default.
 
     Returns:
-      None
+      None, or a Motion if block is False.
     """
     x, y = _normalizeXYArgs(x, y)
 
     _logScreenshot(logScreenshot, "dragTo", "%s,%s" % (x, y), folder=".")
-    if mouseDownUp:
-        mouseDown(button=button, logScreenshot=False, _pause=False)
-    _mouseMoveDrag("drag", x, y, 0, 0, duration, tween, button)
-    if mouseDownUp:
-        mouseUp(button=button, logScreenshot=False, _pause=False)
+    if not mouseDownUp:
+        _mouseMoveDrag("drag", x, y, 0, 0, duration, tween, _normalizeButton(button))
+        return
+    with Drag(button=button, logScreenshot=False, _pause=False) as drag:
+        drag.moveTo(x, y, duration, tween)
 
 
+@_nonBlocking
 @_genericPyAutoGUIChecks
 def dragRel(
-    xOffset=0, yOffset=0, duration=0.0, tween=linear, button=PRIMARY, logScreenshot=None, _pause=True, mouseDownUp=True
+    xOffset=0,
+    yOffset=0,
+    duration=0.0,
+    tween=linear,
+    button=PRIMARY,
+    logScreenshot=None,
+    _pause=True,
+    mouseDownUp=True,
+    block=True,
 ):
     """Performs a mouse drag (mouse movement while a button is held down) to a
     point on the screen, relative to its current position.
@@ -1387,9 +2036,12 @@ def dragRel(
       button (str, int, optional): The mouse button released. TODO
       mouseDownUp (True, False): When true, the mouseUp/Down actions are not performed.
         Which allows dragging over multiple (small) actions. 'True' by default.
+      block (bool, optional): If False, the movement is made on the
+        session's input thread and a Motion is returned right away, so that
+        it can be watched or cancelled. True by default.
 
     Returns:
-      None
+      None, or a Motion if block is False.
     """
     if xOffset is None:
         xOffset = 0
@@ -1402,21 +2054,834 @@ def dragRel(
     if xOffset == 0 and yOffset == 0:
         return  # no-op case
 
-    mousex, mousey = platformModule._position()
     _logScreenshot(logScreenshot, "dragRel", "%s,%s" % (xOffset, yOffset), folder=".")
-    if mouseDownUp:
-        mouseDown(button=button, logScreenshot=False, _pause=False)
-    _mouseMoveDrag("drag", mousex, mousey, xOffset, yOffset, duration, tween, button)
-    if mouseDownUp:
-        mouseUp(button=button, logScreenshot=False, _pause=False)
+    if not mouseDownUp:
+        _mouseMoveDrag("drag", None, None, xOffset, yOffset, duration, tween, _normalizeButton(button))
+        return
+    with Drag(button=button, logScreenshot=False, _pause=False) as drag:
+        drag.moveRel(xOffset, yOffset, duration, tween)
 
 
 drag = dragRel  # For PyAutoGUI 1.0, we want drag() to replace dragRel().
 
 
-def _mouseMoveDrag(moveOrDrag, x, y, xOffset, yOffset, duration, tween=linear, button=None):
-    """Handles the actual move or drag event, since different platforms
-    implement them differently.
+class Drag(object):
+    """
+    A mouse drag made up of any number of movements, with one or more mouse buttons held down the whole time. Use it
+    in a ``with`` statement: the buttons are pressed when it starts and released (wherever the mouse cursor is) when it
+    ends, even if it ends with an exception such as ``FailSafeException``.
+
+    >>> with pyautogui.Drag(100, 200) as drag:  # doctest: +SKIP
+    ...     drag.moveTo(400, 300, duration=0.5)
+    ...     drag.hover(0.3)  # Give the drop target time to notice the mouse cursor.
+    ...     drag.moveThrough([(500, 300), (500, 400)], duration=0.5)
+
+    ``x`` and ``y`` are where the drag starts, and default to the mouse cursor's current position. ``button`` is the
+    mouse button to hold down, or a list of buttons to hold down together (a chord) such as ``[LEFT, RIGHT]``. The
+    buttons are pressed in order and released in the reverse order.
+
+    The whole drag is one action: the fail-safe is checked when it starts and before each step of its movements, and
+    there is only one ``PAUSE`` pause, after the buttons are released. The ``Drag`` uses whichever ``Session`` is
+    current on the thread that uses it.
+    """
+
+    def __init__(self, x=None, y=None, button=PRIMARY, logScreenshot=None, _pause=True):
+        if type(button) in (tuple, list):
+            self._buttons = [_normalizeButton(b) for b in button]
+        else:
+            self._buttons = [_normalizeButton(button)]
+        if not self._buttons:
+            raise PyAutoGUIException("button argument must have at least one button")
+        self._x = x
+        self._y = y
+        self._logScreenshot = logScreenshot
+        self._pause = _pause
+        self._held = []  # The buttons that are being held down, in the order they were pressed.
+
+    def __repr__(self):
+        buttons = "+".join(str(button) for button in self._buttons)
+        return "<%s %s %s>" % (self.__class__.__name__, buttons, "held" if self._held else "released")
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self._release()
+        if excType is None:
+            _handlePause(self._pause)
+
+    @property
+    def held(self):
+        """True while the drag's mouse buttons are held down."""
+        return bool(self._held)
+
+    def start(self):
+        """
+        Moves the mouse cursor to where the drag starts and presses the buttons. The ``with`` statement calls this, so
+        only call it when using the ``Drag`` without one, and then call ``release()`` when the drag is over.
+        """
+        if self._held:
+            raise PyAutoGUIException("This drag has already started.")
+        failSafeCheck()
+        with batch():
+            x, y = _normalizeXYArgs(self._x, self._y)
+            _mouseMoveDrag("move", x, y, 0, 0, duration=0, tween=None)
+            _logScreenshot(self._logScreenshot, "drag", "%s,%s" % (x, y), folder=".")
+            try:
+                for button in self._buttons:
+                    platformModule._mouseDown(x, y, button)
+                    self._held.append(button)
+            except BaseException:
+                self._release()
+                raise
+
+    def release(self):
+        """Releases the drag's mouse buttons where the mouse cursor is now, and then pauses for ``PAUSE`` seconds."""
+        self._release()
+        _handlePause(self._pause)
+
+    def _release(self):
+        """
+        Releases any buttons that are held down. This doesn't check the fail-safe or wait for anything, so that it
+        can't be stopped partway by a ``FailSafeException`` or by cancelling a ``Motion``.
+        """
+        if not self._held:
+            return
+        with batch():
+            x, y = position()
+            while self._held:
+                platformModule._mouseUp(x, y, self._held.pop())
+
+    def _checkHeld(self):
+        if not self._held:
+            raise PyAutoGUIException("The drag's mouse buttons aren't held down. Use the Drag in a with statement.")
+
+    def moveTo(self, x=None, y=None, duration=0.0, tween=linear):
+        """Drags the mouse cursor to ``x``, ``y``. The arguments are the same as ``moveTo()``'s."""
+        self._checkHeld()
+        with batch():
+            x, y = _normalizeXYArgs(x, y)
+            _mouseMoveDrag("drag", x, y, 0, 0, duration, tween, self._buttons[0])
+
+    def moveRel(self, xOffset=0, yOffset=0, duration=0.0, tween=linear):
+        """Drags the mouse cursor relative to where it is now. The arguments are the same as ``moveRel()``'s."""
+        self._checkHeld()
+        if type(xOffset) in (tuple, list):
+            xOffset, yOffset = xOffset[0], xOffset[1]
+        with batch():
+            _mouseMoveDrag("drag", None, None, xOffset, yOffset, duration, tween, self._buttons[0])
+
+    move = moveRel
+
+    def moveThrough(self, points, duration=0.0, tween=linear, curve=LINEAR_CURVE):
+        """Drags the mouse cursor along a path through each of the points, with the same arguments as ``moveThrough()``."""
+        self._checkHeld()
+        with batch():
+            _moveDragThrough("drag", points, duration, tween, curve, self._buttons[0])
+
+    def follow(self, path):
+        """
+        Drags the mouse cursor along ``path``, an iterable of ``PathStep`` tuples such as ``iterPath()`` returns. Each
+        step is sent ``time`` seconds after the movement starts, and steps are dropped if the movement falls behind.
+        The path can be a generator that works out each step as it's asked for, such as to follow something that's
+        moving on the screen.
+        """
+        self._checkHeld()
+        moveOrDrag = "drag" if sys.platform == "darwin" else "move"  # Only OS X needs the drag event specifically.
+        with batch():
+            with _eventTimeline() as timeline:
+                _sendPath(moveOrDrag, _motionStage(_paceStage(path, 0.0, timeline), 0.0), self._buttons[0])
+
+    def hover(self, seconds):
+        """
+        Waits for ``seconds`` with the buttons held down and the mouse cursor where it is, for drop targets that only
+        react once the mouse cursor has been over them for a moment.
+        """
+        self._checkHeld()
+        _Timeline().wait(seconds)
+
+
+@_genericPyAutoGUIChecks
+def moveThrough(points, duration=0.0, tween=linear, curve=LINEAR_CURVE, logScreenshot=None, _pause=True):
+    """Moves the mouse cursor along a path from its current position through
+    each of the points, in order.
+
+    The whole path is worked out before the mouse starts moving, and is
+    followed as a single movement, without a pause or a check of the mouse
+    cursor's position at each point. The tween is applied to the distance
+    along the path, so the mouse cursor moves at the same speed along short
+    and long parts of it. With a duration of 0, the mouse cursor is moved to
+    each point (and each corner of a curved path) in turn, as quickly as
+    possible.
+
+    Args:
+      points (list): The (x, y) points for the path to go through.
+      duration (float, optional): The amount of time it takes to move the mouse
+        cursor along the whole path. 0.0 by default.
+      tween (func, optional): The tweening function used if the duration is not
+        0. A linear tween is used by default. Tweens that overshoot, like
+        easeOutElastic(), stop at the ends of the path.
+      curve (str, optional): The shape of the path. LINEAR_CURVE ('linear', the
+        default) goes straight from point to point. CATMULL_ROM_CURVE
+        ('catmull-rom') is a smooth curve through all of the points.
+        BEZIER_CURVE ('bezier') is a series of cubic Bezier curves, where
+        each curve is given by two control points and an end point, so the
+        number of points must be a multiple of 3.
+
+    Returns:
+      None
+    """
+    _logScreenshot(logScreenshot, "moveThrough", "%s points" % (len(points)), folder=".")
+    _moveDragThrough("move", points, duration, tween, curve)
+
+
+@_genericPyAutoGUIChecks
+def dragThrough(
+    points,
+    duration=0.0,
+    tween=linear,
+    curve=LINEAR_CURVE,
+    button=PRIMARY,
+    logScreenshot=None,
+    _pause=True,
+    mouseDownUp=True,
+):
+    """Performs a mouse drag along a path from the mouse cursor's current
+    position through each of the points, in order. See moveThrough() for how
+    the path is followed.
+
+    Args:
+      points (list): The (x, y) points for the path to go through.
+      duration (float, optional): The amount of time it takes to move the mouse
+        cursor along the whole path. 0.0 by default.
+      tween (func, optional): The tweening function used if the duration is not
+        0. A linear tween is used by default.
+      curve (str, optional): The shape of the path: LINEAR_CURVE,
+        CATMULL_ROM_CURVE, or BEZIER_CURVE. See moveThrough().
+      button (str, int, optional): The mouse button released. TODO
+      mouseDownUp (True, False): When true, the mouseUp/Down actions are not performed.
+        Which allows dragging over multiple (small) actions. 'True' by default.
+
+    Returns:
+      None
+    """
+    _logScreenshot(logScreenshot, "dragThrough", "%s points" % (len(points)), folder=".")
+    if not mouseDownUp:
+        _moveDragThrough("drag", points, duration, tween, curve, _normalizeButton(button))
+        return
+    with Drag(button=button, logScreenshot=False, _pause=False) as drag:
+        drag.moveThrough(points, duration, tween, curve)
+
+
+# NumPy isn't imported until the first tweened mouse movement, since importing it is slow. See _numpy().
+_NOT_IMPORTED = object()
+_numpyModule = _NOT_IMPORTED
+
+
+def _numpy():
+    """
+    Returns the ``numpy`` module, or ``None`` if it isn't installed or ``USE_NUMPY`` is ``False``. NumPy is used to
+    work out all of the steps of a tweened mouse movement at once, instead of one at a time.
+    """
+    global _numpyModule
+    if not USE_NUMPY:
+        return None
+    if _numpyModule is _NOT_IMPORTED:
+        try:
+            import numpy as _numpyModule
+        except ImportError:
+            _numpyModule = None
+    return _numpyModule
+
+
+# NumPy versions of the tween functions, which take and return arrays. The keys are the names of the PyTweening
+# functions. The tween functions that aren't in here still work with NumPy, but they're called once per step.
+def _arrayEaseOutElastic(np, n, amplitude=1, period=0.3):
+    s = period / (2 * math.pi) * math.asin(1 / amplitude)
+    return amplitude * 2 ** (-10 * n) * np.sin((n - s) * (2 * math.pi / period)) + 1
+
+
+def _arrayEaseInElastic(np, n, amplitude=1, period=0.3):
+    return 1 - _arrayEaseOutElastic(np, 1 - n, amplitude, period)
+
+
+def _arrayEaseInOutElastic(np, n, amplitude=1, period=0.5):
+    n = n * 2
+    return np.where(
+        n < 1,
+        _arrayEaseInElastic(np, n, amplitude, period) / 2,
+        _arrayEaseOutElastic(np, n - 1, amplitude, period) / 2 + 0.5,
+    )
+
+
+def _arrayEaseOutBounce(np, n):
+    return np.select(
+        [n < 1 / 2.75, n < 2 / 2.75, n < 2.5 / 2.75],
+        [
+            7.5625 * n * n,
+            7.5625 * (n - 1.5 / 2.75) ** 2 + 0.75,
+            7.5625 * (n - 2.25 / 2.75) ** 2 + 0.9375,
+        ],
+        7.5625 * (n - 2.65 / 2.75) ** 2 + 0.984375,
+    )
+
+
+def _arrayEaseInBounce(np, n):
+    return 1 - _arrayEaseOutBounce(np, 1 - n)
+
+
+def _arrayEaseInOutBack(np, n, s=1.70158):
+    n = n * 2
+    s *= 1.525
+    return np.where(n < 1, 0.5 * (n * n * ((s + 1) * n - s)), 0.5 * ((n - 2) ** 2 * ((s + 1) * (n - 2) + s) + 2))
+
+
+def _arrayEaseInOutExpo(np, n):
+    with np.errstate(over="ignore"):
+        n2 = n * 2
+        values = np.where(n2 < 1, 0.5 * 2 ** (10 * (n2 - 1)), 0.5 * (-(2 ** (-10 * (n2 - 1))) + 2))
+    return np.where(n == 0, 0.0, np.where(n == 1, 1.0, values))
+
+
+_ARRAY_TWEENS = {
+    "linear": lambda np, n: n,
+    "easeInQuad": lambda np, n: n ** 2,
+    "easeOutQuad": lambda np, n: -n * (n - 2),
+    "easeInOutQuad": lambda np, n: np.where(n < 0.5, 2 * n ** 2, -0.5 * ((n * 2 - 1) * (n * 2 - 3) - 1)),
+    "easeInCubic": lambda np, n: n ** 3,
+    "easeOutCubic": lambda np, n: (n - 1) ** 3 + 1,
+    "easeInOutCubic": lambda np, n: np.where(n < 0.5, 0.5 * (n * 2) ** 3, 0.5 * ((n * 2 - 2) ** 3 + 2)),
+    "easeInQuart": lambda np, n: n ** 4,
+    "easeOutQuart": lambda np, n: -((n - 1) ** 4 - 1),
+    "easeInOutQuart": lambda np, n: np.where(n < 0.5, 0.5 * (n * 2) ** 4, -0.5 * ((n * 2 - 2) ** 4 - 2)),
+    "easeInQuint": lambda np, n: n ** 5,
+    "easeOutQuint": lambda np, n: (n - 1) ** 5 + 1,
+    "easeInOutQuint": lambda np, n: np.where(n < 0.5, 0.5 * (n * 2) ** 5, 0.5 * ((n * 2 - 2) ** 5 + 2)),
+    "easeInSine": lambda np, n: -1 * np.cos(n * math.pi / 2) + 1,
+    "easeOutSine": lambda np, n: np.sin(n * math.pi / 2),
+    "easeInOutSine": lambda np, n: -0.5 * (np.cos(math.pi * n) - 1),
+    "easeInExpo": lambda np, n: np.where(n == 0, 0.0, 2 ** (10 * (n - 1))),
+    "easeOutExpo": lambda np, n: np.where(n == 1, 1.0, -(2 ** (-10 * n)) + 1),
+    "easeInOutExpo": _arrayEaseInOutExpo,
+    "easeInCirc": lambda np, n: -1 * (np.sqrt(1 - n * n) - 1),
+    "easeOutCirc": lambda np, n: np.sqrt(1 - (n - 1) ** 2),
+    "easeInOutCirc": lambda np, n: np.where(
+        n < 0.5, -0.5 * (np.sqrt(np.maximum(0, 1 - (n * 2) ** 2)) - 1), 0.5 * (np.sqrt(np.maximum(0, 1 - (n * 2 - 2) ** 2)) + 1)
+    ),
+    "easeInElastic": _arrayEaseInElastic,
+    "easeOutElastic": _arrayEaseOutElastic,
+    "easeInOutElastic": _arrayEaseInOutElastic,
+    "easeInBack": lambda np, n, s=1.70158: n * n * ((s + 1) * n - s),
+    "easeOutBack": lambda np, n, s=1.70158: (n - 1) ** 2 * ((s + 1) * (n - 1) + s) + 1,
+    "easeInOutBack": _arrayEaseInOutBack,
+    "easeInBounce": _arrayEaseInBounce,
+    "easeOutBounce": _arrayEaseOutBounce,
+    "easeInOutBounce": lambda np, n: np.where(
+        n < 0.5, _arrayEaseInBounce(np, n * 2) * 0.5, _arrayEaseOutBounce(np, n * 2 - 1) * 0.5 + 0.5
+    ),
+}
+
+
+def _tweenArray(np, tween, n):
+    """
+    Returns ``tween`` applied to each number in the NumPy array ``n``. PyAutoGUI's ``linear()`` and the PyTweening
+    functions are done with array operations, and any other function is called once for each number.
+    """
+    if tween is linear or getattr(tween, "__module__", None) == "pytweening":
+        arrayTween = _ARRAY_TWEENS.get(getattr(tween, "__name__", None))
+        if arrayTween is not None:
+            return arrayTween(np, n)
+    return np.array([tween(value) for value in n.tolist()], dtype=float)
+
+
+def _frameCount(duration, distance=None):
+    """
+    Returns the number of steps (frames) for a tweened mouse movement that takes ``duration`` seconds, at the current
+    session's ``FRAME_RATE``. The last frame is the destination, so this is always at least 1.
+
+    If ``distance`` is given, it's how many pixels the mouse cursor moves (see _pixelDistance()), and there are no more
+    frames than that. A short, slow movement would otherwise have many frames in a row at the same pixel, which would
+    all be worked out only to be left out of the path.
+    """
+    if duration <= 0:
+        return 1
+    # Rounding first keeps floating point error from adding a frame, as in 0.1 * 60 == 6.000000000000001.
+    numFrames = int(math.ceil(round(duration * _currentSession().FRAME_RATE, 6)))
+    if distance is not None:
+        numFrames = min(numFrames, int(math.ceil(distance)))
+    return max(1, numFrames)
+
+
+def _pixelDistance(xs, ys):
+    """
+    Returns the number of pixels the mouse cursor passes through when it moves along the polyline with corners at
+    ``xs``, ``ys``, not counting the first one. Each line of it passes through one pixel for each pixel along its
+    longer axis, so moving 300 pixels right and 100 pixels down is a distance of 300.
+    """
+    return sum(max(abs(xs[i + 1] - xs[i]), abs(ys[i + 1] - ys[i])) for i in range(len(xs) - 1))
+
+
+def _tweenFractions(numFrames, tween):
+    """
+    Returns a list of how far along a tweened mouse movement of ``numFrames`` frames the mouse cursor is at each
+    frame (as returned by ``tween``), ending with ``1.0`` so that the last frame is the actual destination.
+    """
+    np = _numpy()
+    if np is not None:
+        fractions = _tweenArray(np, tween, np.arange(1, numFrames) / numFrames).tolist()
+    else:
+        fractions = [tween(n / numFrames) for n in range(1, numFrames)]
+    # Making sure the last position is the actual destination.
+    fractions.append(1.0)
+    return fractions
+
+
+# The number of frames that iterPath() works out at a time with NumPy. Paths are made in chunks of this size so that
+# a long movement doesn't need memory for all of its frames at once.
+_PATH_CHUNK_SIZE = 256
+
+
+def _tweenStage(startx, starty, x, y, numFrames, tween):
+    """
+    The first stage of iterPath()'s pipeline. Yields ``(frame, pointX, pointY)`` tuples with the float point for each
+    of the frames 1 to ``numFrames`` of a tweened movement, the last of which is the destination.
+    """
+    np = _numpy()
+    if np is None:
+        for frame in range(1, numFrames):
+            pointX, pointY = getPointOnLine(startx, starty, x, y, tween(frame / numFrames))
+            yield frame, pointX, pointY
+    else:
+        for chunkStart in range(1, numFrames, _PATH_CHUNK_SIZE):
+            frames = np.arange(chunkStart, min(chunkStart + _PATH_CHUNK_SIZE, numFrames))
+            fractions = _tweenArray(np, tween, frames / numFrames)
+            # np.rint() rounds halves to even, the same as Python 3's round() in _roundStage().
+            pointXs = np.rint(startx + (x - startx) * fractions)
+            pointYs = np.rint(starty + (y - starty) * fractions)
+            for frame, pointX, pointY in zip(frames.tolist(), pointXs.tolist(), pointYs.tolist()):
+                yield frame, pointX, pointY
+    # Making sure the last position is the actual destination.
+    yield numFrames, x, y
+
+
+def _fractionStage(startx, starty, x, y, fractions):
+    """
+    Like _tweenStage(), but for a movement whose tween ``fractions`` were already worked out by _tweenFractions().
+    """
+    for frame, fraction in enumerate(fractions, 1):
+        yield frame, startx + (x - startx) * fraction, starty + (y - starty) * fraction
+
+
+def _roundStage(frames):
+    """The second stage of iterPath()'s pipeline. Rounds each frame's point to integers."""
+    for frame, pointX, pointY in frames:
+        yield frame, int(round(pointX)), int(round(pointY))
+
+
+def _dedupStage(frames, startx, starty):
+    """
+    The third stage of iterPath()'s pipeline. Leaves out the frames that wouldn't move the mouse cursor, because their
+    point is the same as the one before them (or the start, for the first frame).
+    """
+    previousX, previousY = startx, starty
+    for frame, pointX, pointY in frames:
+        if pointX != previousX or pointY != previousY:
+            yield frame, pointX, pointY
+            previousX, previousY = pointX, pointY
+
+
+def _pathStepStage(frames, duration, numFrames):
+    """The last stage of iterPath()'s pipeline. Turns each frame into a ``PathStep`` with the time of the frame."""
+    for frame, pointX, pointY in frames:
+        yield PathStep(pointX, pointY, duration * frame / numFrames)
+
+
+def iterPath(startx, starty, x, y, duration=0.0, tween=linear):
+    """
+    Yields the steps that moveTo() and dragTo() take to move the mouse cursor from ``startx``, ``starty`` to ``x``,
+    ``y`` over ``duration`` seconds, as ``PathStep(x, y, time)`` namedtuples. ``x`` and ``y`` are the integer
+    coordinates to move the mouse cursor to, and ``time`` is the number of seconds after the start of the movement to
+    move it there. There is a step for each frame at the session's ``FRAME_RATE``, but no more steps than the number
+    of pixels the mouse cursor moves, and the last step is the destination, at ``duration`` seconds. Steps that
+    wouldn't move the mouse cursor are left out.
+
+    The steps are worked out as they're needed, so the path takes the same amount of memory no matter how long the
+    movement is. If NumPy is installed, it's used to work out the steps in chunks.
+
+    >>> list(iterPath(0, 0, 3, 0))
+    [PathStep(x=3, y=0, time=0.0)]
+    """
+    startx, starty, x, y = int(startx), int(starty), int(x), int(y)
+    duration = max(0.0, float(duration))
+    numFrames = _frameCount(duration, _pixelDistance((startx, x), (starty, y)))
+
+    # The path is worked out as if it started at 0, 0 so that it can be cached, and then moved to the start.
+    frames = _cachedPathStage(x - startx, y - starty, numFrames, tween)
+    frames = _offsetStage(frames, startx, starty)
+    return _pathStepStage(frames, duration, numFrames)
+
+
+def _offsetStage(frames, xOffset, yOffset):
+    """Adds ``xOffset`` and ``yOffset`` to each frame's point."""
+    for frame, pointX, pointY in frames:
+        yield frame, pointX + xOffset, pointY + yOffset
+
+
+# The most memory, in bytes, that the cache of mouse movement paths can use. Each step of a path takes 12 bytes. Set
+# this to 0 to turn the cache off.
+PATH_CACHE_MAX_BYTES = 1024 * 1024
+
+PathCacheInfo = collections.namedtuple("PathCacheInfo", "hits misses paths bytes")
+
+
+class _PathCache(object):
+    """
+    A least recently used cache of mouse movement paths that start at 0, 0, so that moving the same distance with the
+    same tween and frame count again doesn't have to work out the path again. The keys are ``(xOffset, yOffset,
+    numFrames, tween)`` tuples, and the paths are ``array.array`` objects with the frame, x, and y of each step one
+    after another. The cache is shared by all sessions and threads.
+    """
+
+    def __init__(self):
+        self._paths = collections.OrderedDict()  # The least recently used path is first.
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+
+    def get(self, key):
+        with self._lock:
+            path = self._paths.pop(key, None)
+            if path is None:
+                self.misses += 1
+                return None
+            self._paths[key] = path  # Move it to the end, since it was just used.
+            self.hits += 1
+            return path
+
+    def put(self, key, path):
+        size = path.itemsize * len(path)
+        with self._lock:
+            if key in self._paths or size > PATH_CACHE_MAX_BYTES:
+                return
+            self._paths[key] = path
+            self.bytes += size
+            while self.bytes > PATH_CACHE_MAX_BYTES:
+                unused, oldPath = self._paths.popitem(last=False)
+                self.bytes -= oldPath.itemsize * len(oldPath)
+
+    def clear(self):
+        with self._lock:
+            self._paths.clear()
+            self.hits = self.misses = self.bytes = 0
+
+    def info(self):
+        with self._lock:
+            return PathCacheInfo(self.hits, self.misses, len(self._paths), self.bytes)
+
+
+_pathCache = _PathCache()
+
+
+def _isCacheableTween(tween):
+    """
+    Returns True if the paths made with ``tween`` can be cached. Only PyAutoGUI's own tween functions (which come from
+    PyTweening) are, since a custom tween function might not return the same values every time, as with a tween that
+    adds some randomness to look more like a person moving the mouse.
+    """
+    return tween is linear or getattr(tween, "__module__", None) == "pytweening"
+
+
+def _cachedPathStage(xOffset, yOffset, numFrames, tween):
+    """
+    Yields the rounded, deduplicated ``(frame, pointX, pointY)`` frames of a path from 0, 0 to ``xOffset``,
+    ``yOffset``, from the path cache if it's there. Otherwise the frames are worked out as they're needed and the path
+    is added to the cache once all of them have been.
+    """
+    frames = _tweenStage(0, 0, xOffset, yOffset, numFrames, tween)
+    frames = _roundStage(frames)
+    frames = _dedupStage(frames, 0, 0)
+    if PATH_CACHE_MAX_BYTES <= 0 or not _isCacheableTween(tween):
+        for frame in frames:
+            yield frame
+        return
+
+    key = (xOffset, yOffset, numFrames, tween)
+    path = _pathCache.get(key)
+    if path is not None:
+        for i in range(0, len(path), 3):
+            yield path[i], path[i + 1], path[i + 2]
+        return
+
+    path = array.array("i")
+    for frame in frames:
+        if path is not None:
+            path.extend(frame)
+            if path.itemsize * len(path) > PATH_CACHE_MAX_BYTES:
+                path = None  # Too big to cache.
+        yield frame
+    if path is not None:
+        _pathCache.put(key, path)
+
+
+def getPathCacheInfo():
+    """
+    Returns a ``PathCacheInfo`` namedtuple with the number of times a mouse movement's path was found in the path
+    cache (``hits``) and had to be worked out (``misses``), and the number of paths and bytes of memory in the cache.
+    """
+    return _pathCache.info()
+
+
+def clearPathCache():
+    """Empties the mouse movement path cache and resets the numbers returned by ``getPathCacheInfo()`` to zero."""
+    _pathCache.clear()
+
+
+def _paceSchedule(steps, duration, start, session):
+    """
+    Yields a ``(step, time, requested)`` tuple for each ``PathStep`` in ``steps`` that should be sent, where ``time``
+    is when to send it (in seconds after ``start``) and ``requested`` is the number of seconds since the step before
+    it. The caller waits until then, sends the step, and asks for the next one. If the movement's last steps were left
+    out of the path because they wouldn't move the cursor, a last ``(None, duration, requested)`` tuple is yielded for
+    the time they still take up.
+
+    If the movement has fallen so far behind that the next step's time has passed too, a step is dropped instead of
+    yielded, so that the movement catches up and ends on time rather than running long. The last step is never
+    dropped. This is shared by _paceStage() and the ``pyautogui.aio`` module, which wait in different ways.
+    """
+    previousTime = 0.0
+    pending = None
+    for step in steps:
+        if pending is not None:
+            if _clock() - start >= step.time:
+                session._timingStats[4] += 1  # Drop the pending step, since this one is already due.
+            else:
+                yield pending, pending.time, pending.time - previousTime
+                previousTime = pending.time
+        pending = step
+    if pending is not None:
+        yield pending, pending.time, pending.time - previousTime
+        previousTime = pending.time
+    if duration > previousTime:
+        yield None, duration, duration - previousTime
+
+
+def _paceStage(steps, duration, timeline):
+    """
+    Yields each ``PathStep`` in ``steps`` when its time comes, counting from when the first step is asked for, and
+    then waits until ``duration`` seconds after the start. ``timeline`` is moved on to the end of the movement, so that
+    waits on it afterwards are counted from there.
+
+    The time spent moving the mouse cursor and checking the fail-safe between steps is made up for, and steps are
+    dropped if the movement falls behind. See _paceSchedule().
+
+    If ``timeline`` is a ``_ServerTimeline``, the OS does the timing, so every step is yielded right away with the
+    wait before it added to the timeline.
+    """
+    if timeline.serverTimed:
+        previousTime = 0.0
+        for step in steps:
+            timeline.wait(step.time - previousTime)
+            previousTime = step.time
+            yield step
+        return
+
+    _numpy()  # The first tweened movement imports NumPy, which would use up the time of its first few steps.
+    start = _clock()
+    for step, stepTime, requested in _paceSchedule(steps, duration, start, _currentSession()):
+        _sleepUntil(start + stepTime, requested)
+        if step is not None:
+            yield step
+    timeline.deadline = start + duration
+
+
+def _failSafeStage(steps, session):
+    """
+    Does a fail-safe check before each step in ``steps``, to see if the user moved the mouse to a fail-safe position.
+    This isn't done for steps where the mouse cursor moves to a fail-safe position as a result of the movement. (Just
+    because a step isn't in a fail-safe position doesn't mean the user couldn't have moved the mouse cursor to a
+    fail-safe position.)
+    """
+    for step in steps:
+        if (step.x, step.y) not in session.FAILSAFE_POINTS:
+            failSafeCheck()
+        yield step
+
+
+def _sendPath(moveOrDrag, path, button=None):
+    """
+    Moves (or on macOS, drags) the mouse cursor to each ``PathStep`` in ``path``, with a fail-safe check before each
+    step. See _mouseMoveDrag() for ``moveOrDrag`` and ``button``.
+    """
+    session = _currentSession()
+    for step in _failSafeStage(path, session):
+        if moveOrDrag == "move":
+            platformModule._moveTo(step.x, step.y)
+        elif moveOrDrag == "drag":
+            platformModule._dragTo(step.x, step.y, button)
+        else:
+            raise NotImplementedError("Unknown value of moveOrDrag: {0}".format(moveOrDrag))
+
+        _trackPosition(step.x, step.y)
+        if session._failSafeWatcher is not None:
+            # Let the watcher know about this move right away, rather than waiting for the motion event to arrive.
+            session._failSafeWatcher.update(step.x, step.y)
+
+
+# Curved segments of a moveThrough() path are measured by splitting them into straight lines about this many pixels
+# long, but into no more than _CURVE_MAX_SAMPLES lines, so that paths through thousands of far apart points stay fast.
+_CURVE_SAMPLE_SPACING = 4
+_CURVE_MAX_SAMPLES = 64
+
+
+def _catmullRom(a, b, c, d, t):
+    """Returns the point ``t`` (from 0.0 to 1.0) of the way along a Catmull-Rom spline segment from ``b`` to ``c``."""
+    return 0.5 * (
+        2 * b + (c - a) * t + (2 * a - 5 * b + 4 * c - d) * t * t + (3 * b - a - 3 * c + d) * t * t * t
+    )
+
+
+def _cubicBezier(a, b, c, d, t):
+    """Returns the point ``t`` (from 0.0 to 1.0) of the way along a cubic Bezier curve from ``a`` to ``d``."""
+    u = 1 - t
+    return u * u * u * a + 3 * u * u * t * b + 3 * u * t * t * c + t * t * t * d
+
+
+def _curveVertices(startx, starty, points, curve):
+    """
+    Returns ``(xs, ys)``, the lists of the corners of the polyline that a moveThrough() path follows, starting at
+    ``startx``, ``starty``. For the ``LINEAR_CURVE``, these are just the points. Other curves are split into short
+    straight lines.
+    """
+    xs = [startx] + [float(point[0]) for point in points]
+    ys = [starty] + [float(point[1]) for point in points]
+    if curve == LINEAR_CURVE:
+        return xs, ys
+
+    if curve == CATMULL_ROM_CURVE:
+        # Each segment goes from one point to the next, shaped by the points before and after them. The first and
+        # last points are repeated so that the curve goes all the way to them.
+        curveFunction = _catmullRom
+        xs = [xs[0]] + xs + [xs[-1]]
+        ys = [ys[0]] + ys + [ys[-1]]
+        segmentStarts = range(len(xs) - 3)
+    elif curve == BEZIER_CURVE:
+        # Each segment is two control points and an end point, and starts where the one before it ended.
+        if len(points) % 3 != 0:
+            raise PyAutoGUIException(
+                "A bezier curve needs two control points and an end point for each segment, so the number of points must be a multiple of 3, not %s."
+                % (len(points))
+            )
+        curveFunction = _cubicBezier
+        segmentStarts = range(0, len(xs) - 1, 3)
+    else:
+        raise PyAutoGUIException(
+            "curve must be %r, %r, or %r, not %r." % (LINEAR_CURVE, CATMULL_ROM_CURVE, BEZIER_CURVE, curve)
+        )
+
+    # The number of lines to split each segment into comes from the length of its control points' polygon, which is
+    # never shorter than the curve.
+    sampleCounts = []
+    for i in segmentStarts:
+        polygonLength = sum(math.hypot(xs[j + 1] - xs[j], ys[j + 1] - ys[j]) for j in range(i, i + 3))
+        sampleCounts.append(min(max(1, int(math.ceil(polygonLength / _CURVE_SAMPLE_SPACING))), _CURVE_MAX_SAMPLES))
+
+    np = _numpy()
+    if np is not None:
+        # Every sample of every segment is worked out at once: seg is the segment of each sample, and t is how far
+        # along its segment it is.
+        counts = np.array(sampleCounts)
+        seg = np.array(segmentStarts).repeat(counts)
+        t = (np.arange(counts.sum()) - (np.cumsum(counts) - counts).repeat(counts)) / counts.repeat(counts)
+        controlXs = np.array(xs)
+        controlYs = np.array(ys)
+        curveXs = curveFunction(controlXs[seg], controlXs[seg + 1], controlXs[seg + 2], controlXs[seg + 3], t)
+        curveYs = curveFunction(controlYs[seg], controlYs[seg + 1], controlYs[seg + 2], controlYs[seg + 3], t)
+        curveXs = curveXs.tolist()
+        curveYs = curveYs.tolist()
+    else:
+        curveXs = []
+        curveYs = []
+        for i, count in zip(segmentStarts, sampleCounts):
+            for n in range(count):
+                curveXs.append(curveFunction(xs[i], xs[i + 1], xs[i + 2], xs[i + 3], n / count))
+                curveYs.append(curveFunction(ys[i], ys[i + 1], ys[i + 2], ys[i + 3], n / count))
+    # Making sure the path ends at the last point.
+    curveXs.append(xs[-1] if curve == BEZIER_CURVE else xs[-2])
+    curveYs.append(ys[-1] if curve == BEZIER_CURVE else ys[-2])
+    return curveXs, curveYs
+
+
+def _arcLengthStage(xs, ys, duration, numFrames, tween):
+    """
+    Like _tweenStage(), but for the polyline with corners at ``xs``, ``ys``. The tween is applied to the distance
+    along the polyline, so the mouse cursor moves at the same speed along short and long lines. With a ``duration`` of
+    0, each corner of the polyline is a frame.
+    """
+    if duration <= 0:
+        for frame, (pointX, pointY) in enumerate(zip(xs, ys)):
+            yield frame, pointX, pointY
+        return
+
+    np = _numpy()
+    if np is not None:
+        xs = np.array(xs)
+        ys = np.array(ys)
+        lengths = np.concatenate(([0.0], np.cumsum(np.hypot(np.diff(xs), np.diff(ys)))))
+        for chunkStart in range(1, numFrames, _PATH_CHUNK_SIZE):
+            frames = np.arange(chunkStart, min(chunkStart + _PATH_CHUNK_SIZE, numFrames))
+            # Tweens that overshoot (like easeOutElastic()) stop at the ends of the path.
+            distances = np.clip(_tweenArray(np, tween, frames / numFrames), 0.0, 1.0) * lengths[-1]
+            pointXs = np.rint(np.interp(distances, lengths, xs))
+            pointYs = np.rint(np.interp(distances, lengths, ys))
+            for frame, pointX, pointY in zip(frames.tolist(), pointXs.tolist(), pointYs.tolist()):
+                yield frame, pointX, pointY
+    else:
+        lengths = [0.0]
+        for i in range(len(xs) - 1):
+            lengths.append(lengths[-1] + math.hypot(xs[i + 1] - xs[i], ys[i + 1] - ys[i]))
+        for frame in range(1, numFrames):
+            distance = min(max(tween(frame / numFrames), 0.0), 1.0) * lengths[-1]
+            i = max(1, bisect.bisect_left(lengths, distance))
+            if i >= len(lengths):
+                yield frame, xs[-1], ys[-1]
+                continue
+            segmentLength = lengths[i] - lengths[i - 1]
+            n = (distance - lengths[i - 1]) / segmentLength if segmentLength else 1.0
+            yield (frame,) + getPointOnLine(xs[i - 1], ys[i - 1], xs[i], ys[i], n)
+    # Making sure the last position is the actual destination.
+    yield numFrames, xs[-1], ys[-1]
+
+
+def _moveDragThrough(moveOrDrag, points, duration, tween, curve, button=None):
+    """Handles moveThrough() and dragThrough(), in the same way that _mouseMoveDrag() handles moveTo() and dragTo()."""
+    if sys.platform != "darwin":
+        moveOrDrag = "move"  # Only OS X needs the drag event specifically.
+
+    points = [_normalizeXYArgs(point, None) for point in points]
+    if not points:
+        return
+    startx, starty = position()
+    xs, ys = _curveVertices(startx, starty, points, curve)
+
+    duration = max(0.0, float(duration))
+    numFrames = _frameCount(duration, _pixelDistance(xs, ys)) if duration > 0 else len(xs) - 1
+    with _eventTimeline() as timeline:
+        frames = _arcLengthStage(xs, ys, duration, numFrames, tween)
+        frames = _dedupStage(_roundStage(frames), startx, starty)
+        path = _pathStepStage(frames, duration, numFrames)
+        if duration > 0:
+            path = _paceStage(path, duration, timeline)
+        _sendPath(moveOrDrag, path, button)
+
+        if tuple(points[-1]) not in _currentSession().FAILSAFE_POINTS:
+            failSafeCheck()
+
+
+def _mouseMoveDrag(moveOrDrag, x, y, xOffset, yOffset, duration, tween=linear, button=None):
+    """Handles the actual move or drag event, since different platforms
+    implement them differently.
 
     On Windows & Linux, a drag is a normal mouse move while a mouse button is
     held down. On OS X, a distinct "drag" event must be used instead.
@@ -1459,6 +2924,7 @@ def _mouseMoveDrag(moveOrDrag, x, y, xOffset, yOffset, duration, tween=linear, b
     if x is None and y is None and xOffset == 0 and yOffset == 0:
         return  # Special case for no mouse movement at all.
 
+    session = _currentSession()
     startx, starty = position()
 
     x = int(x) if x is not None else startx
@@ -1468,50 +2934,21 @@ def _mouseMoveDrag(moveOrDrag, x, y, xOffset, yOffset, duration, tween=linear, b
     x += xOffset
     y += yOffset
 
-    width, height = size()
-
     # Make sure x and y are within the screen bounds.
     # x = max(0, min(x, width - 1))
     # y = max(0, min(y, height - 1))
 
-    # If the duration is small enough, just move the cursor there instantly.
-    steps = [(x, y)]
-
-    if duration > MINIMUM_DURATION:
-        # Non-instant moving/dragging involves tweening:
-        num_steps = max(width, height)
-        sleep_amount = duration / num_steps
-        if sleep_amount < MINIMUM_SLEEP:
-            num_steps = int(duration / MINIMUM_SLEEP)
-            sleep_amount = duration / num_steps
-
-        steps = [getPointOnLine(startx, starty, x, y, tween(n / num_steps)) for n in range(num_steps)]
-        # Making sure the last position is the actual destination.
-        steps.append((x, y))
-
-    for tweenX, tweenY in steps:
-        if len(steps) > 1:
-            # A single step does not require tweening.
-            time.sleep(sleep_amount)
-
-        tweenX = int(round(tweenX))
-        tweenY = int(round(tweenY))
-
-        # Do a fail-safe check to see if the user moved the mouse to a fail-safe position, but not if the mouse cursor
-        # moved there as a result of this function. (Just because tweenX and tweenY aren't in a fail-safe position
-        # doesn't mean the user couldn't have moved the mouse cursor to a fail-safe position.)
-        if (tweenX, tweenY) not in FAILSAFE_POINTS:
-            failSafeCheck()
-
-        if moveOrDrag == "move":
-            platformModule._moveTo(tweenX, tweenY)
-        elif moveOrDrag == "drag":
-            platformModule._dragTo(tweenX, tweenY, button)
+    with _eventTimeline() as timeline:
+        if duration > 0:
+            # Non-instant moving/dragging involves tweening:
+            path = _paceStage(iterPath(startx, starty, x, y, duration, tween), duration, timeline)
         else:
-            raise NotImplementedError("Unknown value of moveOrDrag: {0}".format(moveOrDrag))
+            path = [PathStep(x, y, 0.0)]
 
-    if (tweenX, tweenY) not in FAILSAFE_POINTS:
-        failSafeCheck()
+        _sendPath(moveOrDrag, _motionStage(path, duration), button)
+
+        if (x, y) not in session.FAILSAFE_POINTS:
+            failSafeCheck()
 
 
 # Keyboard Functions
@@ -1535,6 +2972,9 @@ def isValidKey(key):
     Returns:
       bool: True if key is a valid value, False if not.
     """
+    if hasattr(platformModule, "_resolveKey"):
+        # Don't use the X11 platform module's keyboardMapping, since each session's connection has its own.
+        return platformModule._resolveKey(key) is not None
     return platformModule.keyboardMapping.get(key, None) is not None
 
 
@@ -1608,12 +3048,13 @@ def press(keys, presses=1, interval=0.0, logScreenshot=None, _pause=True):
         keys = lowerKeys
     interval = float(interval)
     _logScreenshot(logScreenshot, "press", ",".join(keys), folder=".")
-    for i in range(presses):
-        for k in keys:
-            failSafeCheck()
-            platformModule._keyDown(k)
-            platformModule._keyUp(k)
-        time.sleep(interval)
+    with _eventTimeline() as timeline:
+        for i in range(presses):
+            for k in keys:
+                failSafeCheck()
+                platformModule._keyDown(k)
+                platformModule._keyUp(k)
+            timeline.wait(interval)
 
 
 @contextmanager
@@ -1679,12 +3120,13 @@ def typewrite(message, interval=0.0, logScreenshot=None, _pause=True):
     interval = float(interval)  # TODO - this should be taken out.
 
     _logScreenshot(logScreenshot, "write", message, folder=".")
-    for c in message:
-        if len(c) > 1:
-            c = c.lower()
-        press(c, _pause=False)
-        time.sleep(interval)
-        failSafeCheck()
+    with _eventTimeline() as timeline:
+        for c in message:
+            if len(c) > 1:
+                c = c.lower()
+            press(c, _pause=False)
+            timeline.wait(interval)
+            failSafeCheck()
 
 
 write = typewrite  # In PyAutoGUI 1.0, write() replaces typewrite().
@@ -1714,28 +3156,117 @@ def hotkey(*args, **kwargs):
         args = tuple(args[0])
 
     _logScreenshot(kwargs.get("logScreenshot"), "hotkey", ",".join(args), folder=".")
-    for c in args:
-        if len(c) > 1:
-            c = c.lower()
-        platformModule._keyDown(c)
-        time.sleep(interval)
-    for c in reversed(args):
-        if len(c) > 1:
-            c = c.lower()
-        platformModule._keyUp(c)
-        time.sleep(interval)
+    with _eventTimeline() as timeline:
+        for c in args:
+            if len(c) > 1:
+                c = c.lower()
+            platformModule._keyDown(c)
+            timeline.wait(interval)
+        for c in reversed(args):
+            if len(c) > 1:
+                c = c.lower()
+            platformModule._keyUp(c)
+            timeline.wait(interval)
 
 
 shortcut = hotkey  # shortcut() is an alias for htotkey()
 
 
 def failSafeCheck():
-    if FAILSAFE and tuple(position()) in FAILSAFE_POINTS:
+    session = _currentSession()
+    if not session.FAILSAFE or session._serverTimed:
+        # While the OS times the events, they've only been sent, not played, so there's nothing new to check yet.
+        return
+
+    # If the fail-safe watcher is running, it already knows where the mouse cursor is and we can skip asking the OS.
+    watcher = session._failSafeWatcher
+    if watcher is not None and watcher.position is not None:
+        currentPosition = watcher.position
+    else:
+        currentPosition = _cursorPosition(forFailSafe=True)
+
+    if currentPosition in session.FAILSAFE_POINTS:
         raise FailSafeException(
             "PyAutoGUI fail-safe triggered from mouse moving to a corner of the screen. To disable this fail-safe, set pyautogui.FAILSAFE to False. DISABLING FAIL-SAFE IS NOT RECOMMENDED."
         )
 
 
+class _FailSafeWatcher(object):
+    """
+    Keeps track of the mouse cursor position on a background thread so that failSafeCheck() is a memory read instead
+    of a call to the operating system. Use startFailSafeWatcher() and stopFailSafeWatcher() instead of creating this
+    object directly.
+
+    If the platform module has a ``_watchPointer()`` function, it is used to receive pointer motion events. Otherwise
+    the cursor position is polled every ``FAILSAFE_WATCHER_POLL_INTERVAL`` seconds.
+
+    The watcher belongs to one ``Session``, and its thread uses that session's connection settings.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.position = None  # An (x, y) tuple, or None if the cursor position isn't known yet.
+        self.error = None  # Set to the exception if the background thread crashed.
+        self._stopEvent = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="PyAutoGUIFailSafeWatcher")
+        self._thread.daemon = True
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopEvent.set()
+        self._thread.join()
+        self.position = None
+
+    def update(self, x, y):
+        """Records that the mouse cursor is now at ``x``, ``y``."""
+        self.position = (int(x), int(y))
+
+    def _run(self):
+        try:
+            with self.session:
+                if hasattr(platformModule, "_watchPointer"):
+                    platformModule._watchPointer(self.update, self._stopEvent)
+                else:
+                    while not self._stopEvent.is_set():
+                        self.update(*platformModule._position())
+                        self._stopEvent.wait(FAILSAFE_WATCHER_POLL_INTERVAL)
+        except Exception as exc:
+            # failSafeCheck() goes back to querying the cursor position if the watcher can't be trusted.
+            self.error = exc
+        self.position = None
+
+
+def startFailSafeWatcher():
+    """
+    Starts a background thread that watches the mouse cursor so that the fail-safe check done by every PyAutoGUI
+    function doesn't need to ask the operating system for the mouse position. The ``FAILSAFE`` and ``FAILSAFE_POINTS``
+    settings work the same as before. Calling this function when the watcher is already running does nothing.
+
+    On Linux, the watcher is woken up by XInput2 raw motion events. On other platforms, it polls the mouse position
+    every ``FAILSAFE_WATCHER_POLL_INTERVAL`` seconds.
+    """
+    session = _currentSession()
+    if session._failSafeWatcher is not None:
+        return
+    session._failSafeWatcher = _FailSafeWatcher(session)
+    session._failSafeWatcher.start()
+
+
+def stopFailSafeWatcher():
+    """
+    Stops the background thread started by startFailSafeWatcher(). Calling this function when the watcher isn't
+    running does nothing.
+    """
+    session = _currentSession()
+    watcher = session._failSafeWatcher
+    if watcher is None:
+        return
+    session._failSafeWatcher = None
+    watcher.stop()
+
+
 def displayMousePosition(xOffset=0, yOffset=0):
     """This function is meant to be run from the command line. It will
     automatically display the location and RGB of the mouse cursor."""
@@ -1749,14 +3280,14 @@ def displayMousePosition(xOffset=0, yOffset=0):
         print("xOffset: %s yOffset: %s" % (xOffset, yOffset))
     try:
         while True:
-            # Get and print the mouse coordinates.
-            x, y = position()
+            # Get and print the mouse coordinates. This asks the OS every time, since the user is moving the mouse.
+            x, y = platformModule._position()
             positionStr = "X: " + str(x - xOffset).rjust(4) + " Y: " + str(y - yOffset).rjust(4)
             if not onScreen(x - xOffset, y - yOffset) or sys.platform == "darwin":
                 # Pixel color can only be found for the primary monitor, and also not on mac due to the screenshot having the mouse cursor in the way.
                 pixelColor = ("NaN", "NaN", "NaN")
             else:
-                pixelColor = pyscreeze.screenshot().getpixel(
+                pixelColor = _lazyGlobal("screenshot")().getpixel(
                     (x, y)
                 )  # NOTE: On Windows & Linux, getpixel() returns a 3-integer tuple, but on macOS it returns a 4-integer tuple.
             positionStr += " RGB: (" + str(pixelColor[0]).rjust(3)
@@ -1799,11 +3330,11 @@ def _snapshot(tag, folder=None, region=None, radius=None):
         tag,
     )
     filepath = os.path.join(folder, filename)
-    screenshot(filepath)
+    _lazyGlobal("screenshot")(filepath)
 
 
 def sleep(seconds):
-    time.sleep(seconds)
+    _sleep(seconds)
 
 
 def countdown(seconds):
@@ -2029,7 +3560,6 @@ def _tokenizeCommandStr(commandStr):
 
 
 def _runCommandList(commandList, _ssCount):
-    global PAUSE
     i = 0
     while i < len(commandList):
         command = commandList[i]
@@ -2047,13 +3577,13 @@ def _runCommandList(commandList, _ssCount):
         elif command == "sd":
             scroll(-1)  # scroll down
         elif command == "ss":
-            screenshot("screenshot%s.png" % (_ssCount[0]))
+            _lazyGlobal("screenshot")("screenshot%s.png" % (_ssCount[0]))
             _ssCount[0] += 1
         elif command == "s":
             sleep(float(commandList[i + 1]))
             i += 1
         elif command == "p":
-            PAUSE = float(commandList[i + 1])
+            _currentSession().PAUSE = float(commandList[i + 1])
             i += 1
         elif command == "g":
             if commandList[i + 1][0] in ("+", "-") and commandList[i + 2][0] in ("+", "-"):
@@ -2077,7 +3607,7 @@ def _runCommandList(commandList, _ssCount):
             hotkey(*commandList[i + 1].replace(" ", "").split(","))
             i += 1
         elif command == "a":
-            alert(commandList[i + 1])
+            _lazyGlobal("alert")(commandList[i + 1])
             i += 1
         elif command == "f":
             for j in range(int(commandList[i + 1])):
@@ -2125,15 +3655,15 @@ def run(commandStr, _ssCount=None):
     `fN(commands)` => for i in range(N): run(commands)
 
     Note that any changes to `PAUSE` with the `p` command will be undone when
-    this function returns. The original `PAUSE` setting will be reset.
+    this function returns. The original `PAUSE` setting will be reset. The `p`
+    command only changes the `PAUSE` setting of the session that `run()` was
+    called for, so it doesn't affect other threads running their own sessions.
 
     TODO - This function is under development.
     """
 
     # run("ccc")  straight forward
     # run("susu") if 's' then peek at the next character
-    global PAUSE
-
     if _ssCount is None:
         _ssCount = [
             0
@@ -2142,9 +3672,814 @@ def run(commandStr, _ssCount=None):
     commandList = _tokenizeCommandStr(commandStr)
 
     # Carry out each command.
-    originalPAUSE = PAUSE
+    session = _currentSession()
+    originalPAUSE = session.PAUSE
     _runCommandList(commandList, _ssCount)
-    PAUSE = originalPAUSE
+    session.PAUSE = originalPAUSE
+
+
+# The kinds of events in an ActionPlan:
+_PLAN_FAILSAFE = 0  # (_PLAN_FAILSAFE,)
+_PLAN_MOVE = 1  # (_PLAN_MOVE, x, y, isRelative, fractions, duration, dragButton)
+_PLAN_MOUSE_DOWN = 2  # (_PLAN_MOUSE_DOWN, button)
+_PLAN_MOUSE_UP = 3  # (_PLAN_MOUSE_UP, button)
+_PLAN_CLICK = 4  # (_PLAN_CLICK, button)
+_PLAN_SCROLL = 5  # (_PLAN_SCROLL, scrollFunction, clicks, x, y)
+_PLAN_KEY_DOWN = 6  # (_PLAN_KEY_DOWN, resolvedKey)
+_PLAN_KEY_UP = 7  # (_PLAN_KEY_UP, resolvedKey)
+_PLAN_SLEEP = 8  # (_PLAN_SLEEP, seconds)
+_PLAN_CALL = 9  # (_PLAN_CALL, function, args)
+
+
+class ActionPlan(object):
+    """
+    A sequence of mouse and keyboard actions that is worked out once and can then be replayed with ``run()`` as many
+    times as needed. Mouse buttons, key codes, whether the shift key is needed, tweening steps, and pauses are all
+    resolved when the action is added to the plan, so replaying it only sends the input events.
+
+    The methods for adding actions have the same names and arguments as the PyAutoGUI functions (without
+    ``logScreenshot``), and return the plan so that they can be chained:
+
+    >>> plan = pyautogui.ActionPlan().click(100, 200).write('hello').press('enter')  # doctest: +SKIP
+    >>> plan.run()  # doctest: +SKIP
+    >>> plan.run(xOffset=300)  # Does the same thing, 300 pixels to the right.  # doctest: +SKIP
+
+    The ``pause`` argument is the number of seconds to pause after each action. If it is ``None``, the value that
+    ``PAUSE`` had (in the current ``Session``) when the action was added is used. Like the PyAutoGUI functions,
+    passing ``_pause=False`` to an action leaves its pause out. The fail-safe is checked before each action and each
+    key press while the plan runs.
+
+    Use the ``compilePlan()`` function to create a plan from a ``run()`` command string.
+    """
+
+    def __init__(self, pause=None):
+        self.pause = pause
+        self._events = []
+
+    def __len__(self):
+        return len(self._events)
+
+    def __repr__(self):
+        return "<%s with %s events>" % (self.__class__.__name__, len(self._events))
+
+    def _addPause(self, _pause):
+        pause = _currentSession().PAUSE if self.pause is None else self.pause
+        if _pause and pause:
+            self._events.append((_PLAN_SLEEP, pause))
+
+    def _addSleep(self, seconds):
+        if seconds:
+            self._events.append((_PLAN_SLEEP, seconds))
+
+    def _addMove(self, x, y, isRelative, duration, tween, dragButton=None):
+        if x is None and y is None:
+            return  # No mouse movement at all.
+        if isRelative:
+            x = int(x) if x is not None else 0
+            y = int(y) if y is not None else 0
+            if x == 0 and y == 0:
+                return
+        else:
+            # For absolute moves, None means "keep the current x or y coordinate", which can only be found out when
+            # the plan is run.
+            x = int(x) if x is not None else None
+            y = int(y) if y is not None else None
+
+        if duration > 0:
+            # The length of an absolute movement isn't known until the plan is run, since it depends on where the
+            # mouse cursor is then.
+            distance = _pixelDistance((0, x), (0, y)) if isRelative else None
+            fractions = tuple(_tweenFractions(_frameCount(duration, distance), tween))
+        else:
+            fractions, duration = (1.0,), 0.0
+        self._events.append((_PLAN_MOVE, x, y, isRelative, fractions, duration, dragButton))
+
+    def _addKeys(self, keys, eventKinds):
+        for key in keys:
+            if len(key) > 1:
+                key = key.lower()
+            if hasattr(platformModule, "_resolveKey"):
+                resolvedKey = platformModule._resolveKey(key)
+                if resolvedKey is None:
+                    continue  # Invalid keys are ignored, just like the keyboard functions do.
+            else:
+                resolvedKey = key
+            for kind in eventKinds:
+                self._events.append((kind, resolvedKey))
+
+    def moveTo(self, x=None, y=None, duration=0.0, tween=linear, _pause=True):
+        """Adds a moveTo() call to the plan."""
+        x, y = _normalizePlanXYArgs(x, y)
+        self._events.append((_PLAN_FAILSAFE,))
+        self._addMove(x, y, False, duration, tween)
+        self._addPause(_pause)
+        return self
+
+    def moveRel(self, xOffset=None, yOffset=None, duration=0.0, tween=linear, _pause=True):
+        """Adds a moveRel() call to the plan."""
+        xOffset, yOffset = _normalizePlanXYArgs(xOffset, yOffset)
+        self._events.append((_PLAN_FAILSAFE,))
+        self._addMove(xOffset, yOffset, True, duration, tween)
+        self._addPause(_pause)
+        return self
+
+    move = moveRel
+
+    def mouseDown(self, x=None, y=None, button=PRIMARY, _pause=True):
+        """Adds a mouseDown() call to the plan."""
+        button = _normalizeButton(button)
+        x, y = _normalizePlanXYArgs(x, y)
+        self._events.append((_PLAN_FAILSAFE,))
+        self._addMove(x, y, False, 0, None)
+        self._events.append((_PLAN_MOUSE_DOWN, button))
+        self._addPause(_pause)
+        return self
+
+    def mouseUp(self, x=None, y=None, button=PRIMARY, _pause=True):
+        """Adds a mouseUp() call to the plan."""
+        button = _normalizeButton(button)
+        x, y = _normalizePlanXYArgs(x, y)
+        self._events.append((_PLAN_FAILSAFE,))
+        self._addMove(x, y, False, 0, None)
+        self._events.append((_PLAN_MOUSE_UP, button))
+        self._addPause(_pause)
+        return self
+
+    def click(self, x=None, y=None, clicks=1, interval=0.0, button=PRIMARY, duration=0.0, tween=linear, _pause=True):
+        """Adds a click() call to the plan."""
+        button = _normalizeButton(button)
+        x, y = _normalizePlanXYArgs(x, y)
+        self._events.append((_PLAN_FAILSAFE,))
+        self._addMove(x, y, False, duration, tween)
+        if button in (LEFT, MIDDLE, RIGHT):
+            for i in range(clicks):
+                self._events.append((_PLAN_FAILSAFE,))
+                self._events.append((_PLAN_CLICK, button))
+                self._addSleep(interval)
+        self._addPause(_pause)
+        return self
+
+    def leftClick(self, x=None, y=None, interval=0.0, duration=0.0, tween=linear, _pause=True):
+        """Adds a leftClick() call to the plan."""
+        return self.click(x, y, 1, interval, LEFT, duration, tween, _pause=_pause)
+
+    def rightClick(self, x=None, y=None, interval=0.0, duration=0.0, tween=linear, _pause=True):
+        """Adds a rightClick() call to the plan."""
+        return self.click(x, y, 1, interval, RIGHT, duration, tween, _pause=_pause)
+
+    def middleClick(self, x=None, y=None, interval=0.0, duration=0.0, tween=linear, _pause=True):
+        """Adds a middleClick() call to the plan."""
+        return self.click(x, y, 1, interval, MIDDLE, duration, tween, _pause=_pause)
+
+    def doubleClick(self, x=None, y=None, interval=0.0, button=LEFT, duration=0.0, tween=linear, _pause=True):
+        """Adds a doubleClick() call to the plan."""
+        return self.click(x, y, 2, interval, button, duration, tween, _pause=_pause)
+
+    def tripleClick(self, x=None, y=None, interval=0.0, button=LEFT, duration=0.0, tween=linear, _pause=True):
+        """Adds a tripleClick() call to the plan."""
+        return self.click(x, y, 3, interval, button, duration, tween, _pause=_pause)
+
+    def dragTo(self, x=None, y=None, duration=0.0, tween=linear, button=PRIMARY, _pause=True, mouseDownUp=True):
+        """Adds a dragTo() call to the plan."""
+        button = _normalizeButton(button)
+        x, y = _normalizePlanXYArgs(x, y)
+        self._events.append((_PLAN_FAILSAFE,))
+        if mouseDownUp:
+            self._events.append((_PLAN_MOUSE_DOWN, button))
+        self._addMove(x, y, False, duration, tween, dragButton=button)
+        if mouseDownUp:
+            self._events.append((_PLAN_MOUSE_UP, button))
+        self._addPause(_pause)
+        return self
+
+    def dragRel(self, xOffset=0, yOffset=0, duration=0.0, tween=linear, button=PRIMARY, _pause=True, mouseDownUp=True):
+        """Adds a dragRel() call to the plan."""
+        button = _normalizeButton(button)
+        xOffset, yOffset = _normalizePlanXYArgs(xOffset, yOffset)
+        self._events.append((_PLAN_FAILSAFE,))
+        if mouseDownUp:
+            self._events.append((_PLAN_MOUSE_DOWN, button))
+        self._addMove(xOffset, yOffset, True, duration, tween, dragButton=button)
+        if mouseDownUp:
+            self._events.append((_PLAN_MOUSE_UP, button))
+        self._addPause(_pause)
+        return self
+
+    drag = dragRel
+
+    def _addScroll(self, scrollFunction, clicks, x, y, _pause):
+        if type(x) in (tuple, list):
+            x, y = x[0], x[1]
+        self._events.append((_PLAN_FAILSAFE,))
+        self._events.append((_PLAN_SCROLL, scrollFunction, clicks, x, y))
+        self._addPause(_pause)
+        return self
+
+    def scroll(self, clicks, x=None, y=None, _pause=True):
+        """Adds a scroll() call to the plan."""
+        return self._addScroll(platformModule._scroll, clicks, x, y, _pause)
+
+    def hscroll(self, clicks, x=None, y=None, _pause=True):
+        """Adds an hscroll() call to the plan."""
+        return self._addScroll(platformModule._hscroll, clicks, x, y, _pause)
+
+    def vscroll(self, clicks, x=None, y=None, _pause=True):
+        """Adds a vscroll() call to the plan."""
+        return self._addScroll(platformModule._vscroll, clicks, x, y, _pause)
+
+    def keyDown(self, key, _pause=True):
+        """Adds a keyDown() call to the plan."""
+        self._events.append((_PLAN_FAILSAFE,))
+        self._addKeys([key], (_PLAN_KEY_DOWN,))
+        self._addPause(_pause)
+        return self
+
+    def keyUp(self, key, _pause=True):
+        """Adds a keyUp() call to the plan."""
+        self._events.append((_PLAN_FAILSAFE,))
+        self._addKeys([key], (_PLAN_KEY_UP,))
+        self._addPause(_pause)
+        return self
+
+    def press(self, keys, presses=1, interval=0.0, _pause=True):
+        """Adds a press() call to the plan."""
+        if type(keys) == str:
+            keys = [keys]
+        self._events.append((_PLAN_FAILSAFE,))
+        for i in range(presses):
+            for key in keys:
+                self._events.append((_PLAN_FAILSAFE,))
+                self._addKeys([key], (_PLAN_KEY_DOWN, _PLAN_KEY_UP))
+            self._addSleep(interval)
+        self._addPause(_pause)
+        return self
+
+    def typewrite(self, message, interval=0.0, _pause=True):
+        """Adds a typewrite() call to the plan."""
+        self._events.append((_PLAN_FAILSAFE,))
+        for c in message:
+            self._events.append((_PLAN_FAILSAFE,))
+            self._addKeys([c], (_PLAN_KEY_DOWN, _PLAN_KEY_UP))
+            self._addSleep(interval)
+        self._addPause(_pause)
+        return self
+
+    write = typewrite
+
+    def hotkey(self, *args, **kwargs):
+        """Adds a hotkey() call to the plan."""
+        interval = float(kwargs.get("interval", 0.0))
+        if len(args) and isinstance(args[0], Sequence) and not isinstance(args[0], str):
+            args = tuple(args[0])
+        self._events.append((_PLAN_FAILSAFE,))
+        for c in args:
+            self._addKeys([c], (_PLAN_KEY_DOWN,))
+            self._addSleep(interval)
+        for c in reversed(args):
+            self._addKeys([c], (_PLAN_KEY_UP,))
+            self._addSleep(interval)
+        self._addPause(kwargs.get("_pause", True))
+        return self
+
+    shortcut = hotkey
+
+    def sleep(self, seconds):
+        """Adds a pause of ``seconds`` seconds to the plan."""
+        self._addSleep(seconds)
+        return self
+
+    def call(self, function, *args):
+        """Adds a call to ``function(*args)`` to the plan, for anything that doesn't send input events."""
+        self._events.append((_PLAN_CALL, function, args))
+        return self
+
+    def run(self, xOffset=0, yOffset=0):
+        """
+        Performs the actions in the plan. The ``xOffset`` and ``yOffset`` arguments are added to every XY coordinate
+        in the plan (except for relative moves), so the same plan can be used for a window at different positions.
+        """
+        if hasattr(platformModule, "_resolveKey"):
+            keyDownFunction, keyUpFunction = platformModule._keyCodeDown, platformModule._keyCodeUp
+            resolvedKeyDown = lambda resolvedKey: keyDownFunction(*resolvedKey)
+            resolvedKeyUp = lambda resolvedKey: keyUpFunction(resolvedKey[0])
+        else:
+            resolvedKeyDown, resolvedKeyUp = platformModule._keyDown, platformModule._keyUp
+
+        # The cursor position is tracked as the plan runs, and only asked for if the plan doesn't set it first.
+        cursorx = cursory = None
+        timeline = _Timeline()
+        session = _currentSession()
+
+        with batch():
+            for event in self._events:
+                kind = event[0]
+                if kind == _PLAN_FAILSAFE:
+                    failSafeCheck()
+                elif kind == _PLAN_MOVE:
+                    unused, x, y, isRelative, fractions, duration, dragButton = event
+                    needsCursor = isRelative or x is None or y is None or len(fractions) > 1
+                    if needsCursor and cursorx is None:
+                        cursorx, cursory = position()
+                    if isRelative:
+                        x, y = cursorx + x, cursory + y
+                    else:
+                        x = cursorx if x is None else x + xOffset
+                        y = cursory if y is None else y + yOffset
+                    if dragButton is not None and sys.platform == "darwin":
+                        moveFunction = lambda stepx, stepy: platformModule._dragTo(stepx, stepy, dragButton)
+                    else:
+                        moveFunction = platformModule._moveTo
+
+                    if duration > 0:
+                        frames = _fractionStage(cursorx, cursory, x, y, fractions)
+                        frames = _dedupStage(_roundStage(frames), cursorx, cursory)
+                        path = _pathStepStage(frames, duration, len(fractions))
+                        path = _paceStage(path, duration, timeline)
+                    else:
+                        path = [PathStep(x, y, 0.0)]
+                    for step in _failSafeStage(path, session):
+                        moveFunction(step.x, step.y)
+                    cursorx, cursory = x, y
+                    _trackPosition(cursorx, cursory)
+                    if session._failSafeWatcher is not None:
+                        session._failSafeWatcher.update(cursorx, cursory)
+                elif kind == _PLAN_SLEEP:
+                    timeline.wait(event[1])
+                elif kind == _PLAN_KEY_DOWN:
+                    resolvedKeyDown(event[1])
+                elif kind == _PLAN_KEY_UP:
+                    resolvedKeyUp(event[1])
+                else:
+                    if cursorx is None:
+                        cursorx, cursory = position()
+                    if kind == _PLAN_CLICK:
+                        if sys.platform == "darwin":
+                            platformModule._multiClick(cursorx, cursory, event[1], 1)
+                        else:
+                            platformModule._click(cursorx, cursory, event[1])
+                    elif kind == _PLAN_MOUSE_DOWN:
+                        platformModule._mouseDown(cursorx, cursory, event[1])
+                    elif kind == _PLAN_MOUSE_UP:
+                        platformModule._mouseUp(cursorx, cursory, event[1])
+                    elif kind == _PLAN_SCROLL:
+                        unused, scrollFunction, clicks, x, y = event
+                        x = cursorx if x is None else x + xOffset
+                        y = cursory if y is None else y + yOffset
+                        scrollFunction(clicks, x, y)
+                        cursorx, cursory = x, y
+                    elif kind == _PLAN_CALL:
+                        event[1](*event[2])
+                    else:
+                        raise NotImplementedError("Unknown plan event: {0}".format(event))
+
+
+def _normalizePlanXYArgs(firstArg, secondArg):
+    """
+    Like _normalizeXYArgs(), but leaves coordinates that aren't given as ``None`` instead of asking for the current
+    mouse position, since an ActionPlan only knows that when it runs. Image filenames are located right away.
+    """
+    if firstArg is None or secondArg is None and not isinstance(firstArg, (Sequence, str)):
+        return firstArg, secondArg
+    return _normalizeXYArgs(firstArg, secondArg)
+
+
+def compilePlan(commandStr):
+    """
+    Returns an ``ActionPlan`` for a ``run()`` command string. Running the plan does the same thing as calling
+    ``run(commandStr)``, but the command string is only parsed once and the plan can be replayed as often as needed.
+
+    For example, ``plan = compilePlan('g100,200 c w\'hello\'')`` followed by ``plan.run()`` moves the mouse to 100,
+    200, clicks, and types "hello".
+    """
+    plan = ActionPlan(pause=_currentSession().PAUSE)
+    _compileCommandList(plan, _tokenizeCommandStr(commandStr), [0])
+    return plan
+
+
+def _compileCommandList(plan, commandList, _ssCount):
+    """Adds the commands in commandList to the ActionPlan. This mirrors _runCommandList()."""
+    i = 0
+    while i < len(commandList):
+        command = commandList[i]
+
+        if command == "c":
+            plan.click(button=PRIMARY)
+        elif command == "l":
+            plan.click(button=LEFT)
+        elif command == "m":
+            plan.click(button=MIDDLE)
+        elif command == "r":
+            plan.click(button=RIGHT)
+        elif command == "su":
+            plan.scroll(1)  # scroll up
+        elif command == "sd":
+            plan.scroll(-1)  # scroll down
+        elif command == "ss":
+            plan.call(_lazyGlobal("screenshot"), "screenshot%s.png" % (_ssCount[0]))
+            _ssCount[0] += 1
+        elif command == "s":
+            plan.sleep(float(commandList[i + 1]))
+            i += 1
+        elif command == "p":
+            plan.pause = float(commandList[i + 1])
+            i += 1
+        elif command == "g":
+            if commandList[i + 1][0] in ("+", "-") and commandList[i + 2][0] in ("+", "-"):
+                plan.move(int(commandList[i + 1]), int(commandList[i + 2]))
+            else:
+                plan.moveTo(int(commandList[i + 1]), int(commandList[i + 2]))
+            i += 2
+        elif command == "d":
+            if commandList[i + 1][0] in ("+", "-") and commandList[i + 2][0] in ("+", "-"):
+                plan.drag(int(commandList[i + 1]), int(commandList[i + 2]))
+            else:
+                plan.dragTo(int(commandList[i + 1]), int(commandList[i + 2]))
+            i += 2
+        elif command == "k":
+            plan.press(commandList[i + 1])
+            i += 1
+        elif command == "w":
+            plan.write(commandList[i + 1])
+            i += 1
+        elif command == "h":
+            plan.hotkey(*commandList[i + 1].replace(" ", "").split(","))
+            i += 1
+        elif command == "a":
+            plan.call(_lazyGlobal("alert"), commandList[i + 1])
+            i += 1
+        elif command == "f":
+            for j in range(int(commandList[i + 1])):
+                _compileCommandList(plan, commandList[i + 2], _ssCount)
+            i += 2
+        i += 1
+
+
+# Sessions
+# ========
+
+# The settings that each Session has its own copy of. The default session uses the module's global variables for
+# these, so that code that sets ``pyautogui.PAUSE`` and friends keeps working.
+_SESSION_SETTINGS = (
+    "PAUSE",
+    "FAILSAFE",
+    "FAILSAFE_POINTS",
+    "FRAME_RATE",
+    "SERVER_TIMING",
+    "POSITION_TRACKING",
+    "POSITION_VALIDATE_INTERVAL",
+    "LOG_SCREENSHOTS",
+    "LOG_SCREENSHOTS_LIMIT",
+    "G_LOG_SCREENSHOTS_FILENAMES",
+)
+
+
+class Session(object):
+    """
+    A PyAutoGUI session has its own copy of the ``PAUSE``, ``FAILSAFE``, ``FAILSAFE_POINTS``, ``FRAME_RATE``,
+    ``SERVER_TIMING``, ``POSITION_TRACKING``, ``POSITION_VALIDATE_INTERVAL``, ``LOG_SCREENSHOTS``,
+    ``LOG_SCREENSHOTS_LIMIT``, and ``G_LOG_SCREENSHOTS_FILENAMES`` settings, along with its own pause timing, timing
+    stats, tracked mouse cursor position, fail-safe watcher, and (on Linux) its own connection to the X server. Each
+    thread that automates something independently from the others should use its own session.
+
+    A session has all of the mouse, keyboard, and screenshot functions as methods:
+
+    >>> session = pyautogui.Session(PAUSE=0.5, FAILSAFE=False)  # doctest: +SKIP
+    >>> session.click(100, 200)  # doctest: +SKIP
+    >>> session.write('Hello world!')  # doctest: +SKIP
+
+    New sessions start with the values that the module's settings have at the time, and any of the settings can be
+    passed as keyword arguments. Inside of a ``with session:`` block, the plain PyAutoGUI functions (and
+    ``ActionPlan.run()``) use the session too, on the current thread. The module-level functions use the default
+    session, whose settings are the module's global variables.
+
+    Sessions normally share the one mouse cursor and keyboard focus, so two sessions automating the same display at
+    the same time get in each other's way. On Linux, if ``ownPointer`` is True, the session creates its own XInput2
+    master pointer and keyboard (the X server's multi-pointer support) when its connection is opened. It then has its
+    own mouse cursor, with its own position and held buttons, and its own keyboard focus, so several sessions can
+    automate one display at once. The X server must support XInput 2.0, and python-xlib must have its ``xinput``
+    module. The devices are removed by ``close()``; if the program ends without closing the session, they stay until
+    the X server exits.
+
+    Call ``close()`` when the session isn't needed anymore.
+    """
+
+    def __init__(self, ownPointer=False, **settings):
+        if ownPointer and not hasattr(platformModule, "_Connection"):
+            raise PyAutoGUIException("Sessions with their own mouse cursor are only supported on Linux.")
+        self._initState()
+        self._ownPointer = ownPointer
+        self.PAUSE = PAUSE
+        self.FAILSAFE = FAILSAFE
+        if "FAILSAFE_POINTS" not in settings:
+            self.FAILSAFE_POINTS = list(_lazyGlobal("FAILSAFE_POINTS"))
+        self.FRAME_RATE = FRAME_RATE
+        self.SERVER_TIMING = SERVER_TIMING
+        self.POSITION_TRACKING = POSITION_TRACKING
+        self.POSITION_VALIDATE_INTERVAL = POSITION_VALIDATE_INTERVAL
+        self.LOG_SCREENSHOTS = LOG_SCREENSHOTS
+        self.LOG_SCREENSHOTS_LIMIT = LOG_SCREENSHOTS_LIMIT
+        self.G_LOG_SCREENSHOTS_FILENAMES = []
+
+        for name, value in settings.items():
+            if name not in _SESSION_SETTINGS:
+                raise TypeError("Session() got an unexpected keyword argument %r" % (name,))
+            setattr(self, name, value)
+
+    def _initState(self):
+        self._pauseTimeline = _Timeline()  # Used for the PAUSE pause after each PyAutoGUI function.
+        # The number of waits, the total seconds of waiting requested, the total and maximum number of seconds that
+        # the waits ended late, and the number of mouse movement frames dropped. See getTimingStats().
+        self._timingStats = [0, 0.0, 0.0, 0.0, 0]
+        self._scrollStats = [0, 0.0]  # The number of notches scrolled and the seconds it took. See getScrollStats().
+        # The number of mouse motion events sent and left out by the platform module. See getMotionStats().
+        self._motionStats = [0, 0]
+        self._failSafeWatcher = None
+        # Where PyAutoGUI last put the mouse cursor (or None if it doesn't know), and the _clock() time it last asked
+        # the OS where the mouse cursor is. See _cursorPosition().
+        self._trackedPosition = None
+        self._positionQueriedAt = 0.0
+        self._serverTimed = False  # True while the events being sent are timed by the OS. See _eventTimeline().
+        self._connection = None
+        self._connectionLock = threading.Lock()  # Held while opening the connections.
+        self._displayName = None  # The display name passed to the platform module's _Connection, if it has one.
+        self._ownPointer = False  # True if the _Connection creates its own master pointer and keyboard.
+        self._inputThread = None  # The _InputThread for Motion movements, once one has been started.
+
+    def __repr__(self):
+        return "<%s PAUSE=%r FAILSAFE=%r>" % (self.__class__.__name__, self.PAUSE, self.FAILSAFE)
+
+    def __enter__(self):
+        if not hasattr(_sessionState, "previous"):
+            _sessionState.previous = []
+        _sessionState.previous.append(getattr(_sessionState, "session", None))
+        _sessionState.session = self
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        _sessionState.session = _sessionState.previous.pop()
+
+    def _getConnection(self):
+        """
+        Returns this session's connection object for the platform module, opening it the first time it's needed. The
+        platform module calls this. Platforms that don't need a connection don't have a ``_Connection`` class, and
+        this returns ``None`` for them.
+        """
+        inputThread = self._inputThread
+        if inputThread is not None and threading.current_thread() is inputThread:
+            # The input thread has a copy of the connection, with the same mouse cursor, so that the session can still
+            # be used on other threads while a Motion is running.
+            if inputThread.connection is None:
+                connection = self._openConnection()
+                if connection is not None:
+                    inputThread.connection = self._setUpConnection(connection.copy())
+            return inputThread.connection
+        if self._connection is None:
+            return self._openConnection()
+        return self._connection
+
+    def _openConnection(self):
+        """Opens the session's connection, if it isn't open yet, and returns it."""
+        with self._connectionLock:
+            if self._connection is None and hasattr(platformModule, "_Connection"):
+                connection = platformModule._Connection(self._displayName, self._ownPointer)
+                self._connection = self._setUpConnection(connection)
+            return self._connection
+
+    def _setUpConnection(self, connection):
+        connection.screenSizeChanged = self._screenSizeChanged
+        connection.motionStats = self._motionStats
+        return connection
+
+    def _screenSizeChanged(self, oldSize, newSize):
+        """
+        Called by the platform module when the size of this session's screen changes. The ``FAILSAFE_POINTS`` that were
+        corners of the old screen are moved to the corners of the new one, and the tracked mouse cursor position is
+        forgotten, since the mouse cursor may have moved.
+        """
+        newCorners = dict(zip(_screenCorners(*oldSize), _screenCorners(*newSize)))
+        self.FAILSAFE_POINTS = [newCorners.get(tuple(point), point) for point in self.FAILSAFE_POINTS]
+        self._trackedPosition = None
+
+    def _getInputThread(self):
+        """Returns the session's _InputThread, starting it the first time it's needed."""
+        with _inputThreadLock:
+            if self._inputThread is None:
+                self._inputThread = _InputThread(self)
+                self._inputThread.start()
+            return self._inputThread
+
+    def close(self):
+        """
+        Waits for the session's ``Motion`` movements to finish, stops its fail-safe watcher (if it's running), and
+        closes its connection to the OS.
+        """
+        if self._inputThread is not None:
+            self._inputThread.stop()
+            self._inputThread = None
+        with self:
+            stopFailSafeWatcher()
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    @contextmanager
+    def batch(self):
+        """Works the same as ``pyautogui.batch()``, for this session."""
+        with self:
+            with batch():
+                yield
+
+    @contextmanager
+    def hold(self, keys, logScreenshot=None, _pause=True):
+        """Works the same as ``pyautogui.hold()``, for this session."""
+        with self:
+            with hold(keys, logScreenshot, _pause):
+                yield
+
+
+def _sessionMethod(function):
+    """Returns a Session method that calls ``function`` with the session active on the current thread."""
+
+    @functools.wraps(function)
+    def method(self, *args, **kwargs):
+        previousSession = getattr(_sessionState, "session", None)
+        _sessionState.session = self
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _sessionState.session = previousSession
+
+    return method
+
+
+def _lazySessionMethod(name):
+    """Returns a Session method that calls the lazily loaded function ``name`` with the session active."""
+
+    def method(self, *args, **kwargs):
+        previousSession = getattr(_sessionState, "session", None)
+        _sessionState.session = self
+        try:
+            return _lazyGlobal(name)(*args, **kwargs)
+        finally:
+            _sessionState.session = previousSession
+
+    method.__name__ = name
+    method.__doc__ = "Works the same as ``pyautogui.%s()``, for this session." % (name)
+    return method
+
+
+for _name in (
+    "position",
+    "size",
+    "onScreen",
+    "mouseDown",
+    "mouseUp",
+    "click",
+    "leftClick",
+    "rightClick",
+    "middleClick",
+    "doubleClick",
+    "tripleClick",
+    "scroll",
+    "hscroll",
+    "vscroll",
+    "moveTo",
+    "moveRel",
+    "move",
+    "nudge",
+    "dragTo",
+    "dragRel",
+    "drag",
+    "moveThrough",
+    "dragThrough",
+    "keyDown",
+    "keyUp",
+    "press",
+    "typewrite",
+    "write",
+    "hotkey",
+    "shortcut",
+    "failSafeCheck",
+    "startFailSafeWatcher",
+    "stopFailSafeWatcher",
+    "getTimingStats",
+    "getScrollStats",
+    "getMotionStats",
+    "resetTimingStats",
+    "sleep",
+    "countdown",
+    "run",
+    "compilePlan",
+):
+    setattr(Session, _name, _sessionMethod(globals()[_name]))
+
+# PyScreeze isn't imported until one of these methods is called.
+for _name in ("screenshot", "pixel", "pixelMatchesColor", "locateOnScreen", "locateAllOnScreen", "locateCenterOnScreen"):
+    setattr(Session, _name, _lazySessionMethod(_name))
+del _name
+
+
+def _settingProperty(name):
+    """Returns a property for _DefaultSession that reads and writes the module's global variable ``name``."""
+
+    def getter(self):
+        return _lazyGlobal(name)
+
+    def setter(self, value):
+        globals()[name] = value
+
+    return property(getter, setter)
+
+
+class _DefaultSession(Session):
+    """
+    The session that the module-level functions use. Its settings are the module's global variables. Like any other
+    session, its connection isn't opened until it's first needed.
+    """
+
+    def __init__(self):
+        self._initState()
+
+    def _screenSizeChanged(self, oldSize, newSize):
+        if "FAILSAFE_POINTS" in globals():
+            Session._screenSizeChanged(self, oldSize, newSize)
+        else:
+            # FAILSAFE_POINTS hasn't been loaded yet, and will be worked out from the new size when it's first used.
+            self._trackedPosition = None
+
+    def close(self):
+        raise PyAutoGUIException("The default session can't be closed.")
+
+
+for _name in _SESSION_SETTINGS:
+    setattr(_DefaultSession, _name, _settingProperty(_name))
+del _name
+
+_defaultSession = _DefaultSession()
+
+
+class Controller(Session):
+    """
+    A ``Session`` that controls the X display named ``display`` (such as ``":7"``) instead of the one in the
+    ``DISPLAY`` environment variable. Each controller has its own connection to its X server, along with its own
+    keyboard mapping and screen size, so a single process can drive many displays at once, one thread per display:
+
+    >>> controllers = [pyautogui.Controller(display=":%s" % (n)) for n in range(1, 9)]  # doctest: +SKIP
+    >>> with concurrent.futures.ThreadPoolExecutor(len(controllers)) as pool:  # doctest: +SKIP
+    ...     list(pool.map(lambda controller: controller.click(100, 200), controllers))
+
+    The ``FAILSAFE_POINTS`` of a controller are the corners of its own display. The screenshot functions capture the
+    controller's display too. ``ownPointer`` and the other keyword arguments are the same as for ``Session``.
+
+    Controlling other displays is only supported on Linux.
+    """
+
+    def __init__(self, display=None, ownPointer=False, **settings):
+        if display is not None and not hasattr(platformModule, "_Connection"):
+            raise PyAutoGUIException("Controlling other displays is only supported on Linux.")
+        ownFailSafePoints = "FAILSAFE_POINTS" not in settings and hasattr(platformModule, "_Connection")
+        if ownFailSafePoints:
+            settings["FAILSAFE_POINTS"] = []  # Replaced below, once the display's size is known.
+        Session.__init__(self, ownPointer, **settings)
+        self._displayName = display
+
+        if ownFailSafePoints:
+            self.FAILSAFE_POINTS = _screenCorners(*self.size())
+
+    def __repr__(self):
+        displayName = self._connection.displayName if self._connection is not None else None
+        return "<%s display=%r PAUSE=%r FAILSAFE=%r>" % (self.__class__.__name__, displayName, self.PAUSE, self.FAILSAFE)
+
+    def screenshot(self, imageFilename=None, region=None):
+        """Works the same as ``pyautogui.screenshot()``, but captures this controller's display."""
+        if not hasattr(platformModule, "_screenshot"):
+            return Session.screenshot(self, imageFilename, region)
+        with self:
+            return platformModule._screenshot(imageFilename, region)
+
+    def pixel(self, x, y):
+        """Works the same as ``pyautogui.pixel()``, for this controller's display."""
+        return self.screenshot(region=(x, y, 1, 1)).getpixel((0, 0))[:3]
+
+    def pixelMatchesColor(self, x, y, expectedRGBColor, tolerance=0):
+        """Works the same as ``pyautogui.pixelMatchesColor()``, for this controller's display."""
+        pix = self.pixel(x, y)
+        return all(abs(actual - expected) <= tolerance for actual, expected in zip(pix, expectedRGBColor))
+
+    def locateOnScreen(self, image, **kwargs):
+        """Works the same as ``pyautogui.locateOnScreen()``, for this controller's display."""
+        return _lazyGlobal("locate")(image, self.screenshot(), **kwargs)
+
+    def locateAllOnScreen(self, image, **kwargs):
+        """Works the same as ``pyautogui.locateAllOnScreen()``, for this controller's display."""
+        return _lazyGlobal("locateAll")(image, self.screenshot(), **kwargs)
+
+    def locateCenterOnScreen(self, image, **kwargs):
+        """Works the same as ``pyautogui.locateCenterOnScreen()``, for this controller's display."""
+        coords = self.locateOnScreen(image, **kwargs)
+        if coords is None:
+            return None
+        return _lazyGlobal("center")(coords)
 
 
 def printInfo(dontPrint=False):
@@ -2166,6 +4501,146 @@ def getInfo():
     return (sys.platform, sys.version, __version__, sys.executable, size(), datetime.datetime.now())
 
 
-# Add the bottom left, top right, and bottom right corners to FAILSAFE_POINTS.
-_right, _bottom = size()
-FAILSAFE_POINTS.extend([(0, _bottom - 1), (_right - 1, 0), (_right - 1, _bottom - 1)])
+def _screenCorners(width, height):
+    """Returns a list of the top left, bottom left, top right, and bottom right corners of a screen of this size."""
+    return [(0, 0), (0, height - 1), (width - 1, 0), (width - 1, height - 1)]
+
+
+def _loadFailSafePoints():
+    """Sets FAILSAFE_POINTS to the corners of the screen."""
+    global FAILSAFE_POINTS
+    FAILSAFE_POINTS = _screenCorners(*size())
+
+
+_LAZY_LOADERS["FAILSAFE_POINTS"] = _loadFailSafePoints
+
+# The names "from pyautogui import *" imports. The lazily loaded names in this list get loaded then.
+__all__ = [
+    "ActionPlan",
+    "BEZIER_CURVE",
+    "CATMULL_ROM_CURVE",
+    "Controller",
+    "DARWIN_CATCH_UP_TIME",
+    "Drag",
+    "FAILSAFE",
+    "FAILSAFE_POINTS",
+    "FAILSAFE_WATCHER_POLL_INTERVAL",
+    "FRAME_RATE",
+    "FailSafeException",
+    "G_LOG_SCREENSHOTS_FILENAMES",
+    "ImageNotFoundException",
+    "KEYBOARD_KEYS",
+    "KEY_NAMES",
+    "LEFT",
+    "LINEAR_CURVE",
+    "LOG_SCREENSHOTS",
+    "LOG_SCREENSHOTS_LIMIT",
+    "MAX_BATCHED_EVENTS",
+    "MIDDLE",
+    "MINIMUM_DURATION",
+    "MINIMUM_SLEEP",
+    "Motion",
+    "MotionStats",
+    "PATH_CACHE_MAX_BYTES",
+    "PAUSE",
+    "POSITION_TRACKING",
+    "POSITION_VALIDATE_INTERVAL",
+    "PRIMARY",
+    "PathCacheInfo",
+    "PathStep",
+    "Point",
+    "PyAutoGUIException",
+    "QUERY_POSITION",
+    "QWERTY",
+    "QWERTZ",
+    "RIGHT",
+    "SECONDARY",
+    "SERVER_TIMING",
+    "SPIN_THRESHOLD",
+    "ScrollStats",
+    "Session",
+    "Size",
+    "TRUST_POSITION",
+    "TimingStats",
+    "USE_NUMPY",
+    "VALIDATE_POSITION",
+    "alert",
+    "batch",
+    "center",
+    "clearPathCache",
+    "click",
+    "compilePlan",
+    "confirm",
+    "countdown",
+    "displayMousePosition",
+    "doubleClick",
+    "drag",
+    "dragRel",
+    "dragThrough",
+    "dragTo",
+    "failSafeCheck",
+    "getInfo",
+    "getMotionStats",
+    "getPathCacheInfo",
+    "getPointOnLine",
+    "getScrollStats",
+    "getTimingStats",
+    "hold",
+    "hotkey",
+    "hscroll",
+    "isShiftCharacter",
+    "isValidKey",
+    "iterPath",
+    "keyDown",
+    "keyUp",
+    "leftClick",
+    "linear",
+    "locate",
+    "locateAll",
+    "locateAllOnScreen",
+    "locateCenterOnScreen",
+    "locateOnScreen",
+    "locateOnWindow",
+    "middleClick",
+    "mouseDown",
+    "mouseInfo",
+    "mouseUp",
+    "move",
+    "moveRel",
+    "moveThrough",
+    "moveTo",
+    "nudge",
+    "onScreen",
+    "password",
+    "pixel",
+    "pixelMatchesColor",
+    "position",
+    "press",
+    "printInfo",
+    "prompt",
+    "raisePyAutoGUIImageNotFoundException",
+    "resetTimingStats",
+    "resolution",
+    "rightClick",
+    "run",
+    "screenshot",
+    "scroll",
+    "shortcut",
+    "size",
+    "sleep",
+    "startFailSafeWatcher",
+    "stopFailSafeWatcher",
+    "tripleClick",
+    "typewrite",
+    "useImageNotFoundException",
+    "vscroll",
+    "write",
+] + list(_PYTWEENING_NAMES)
+if sys.platform == "win32":
+    __all__ += list(_PYGETWINDOW_NAMES)
+
+if sys.version_info[0:2] < (3, 7):
+    # Module __getattr__() was added in Python 3.7, so older versions have to load everything right away.
+    for _loader in set(_LAZY_LOADERS.values()):
+        _loader()
+    del _loader
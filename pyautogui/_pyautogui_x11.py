@@ -3,14 +3,23 @@
 import pyautogui
 import sys
 import os
-import subprocess
+import select
+import struct
+import itertools
 from pyautogui import LEFT, MIDDLE, RIGHT
 
-from Xlib.display import Display
 from Xlib import X
 from Xlib.ext.xtest import fake_input
+from Xlib.protocol import rq
 import Xlib.XK
 
+try:
+    # XInput2 is only available in newer versions of python-xlib. It's used by the fail-safe watcher and for sessions
+    # with their own mouse cursor.
+    from Xlib.ext import xinput
+except ImportError:
+    xinput = None
+
 BUTTON_NAME_MAPPING = {LEFT: 1, MIDDLE: 2, RIGHT: 3, 1: 1, 2: 2, 3: 3, 4: 4, 5: 5, 6: 6, 7: 7}
 
 
@@ -30,12 +39,19 @@ def _position():
     Returns:
       (x, y) tuple of the current xy coordinates of the mouse cursor.
     """
-    coord = _display.screen().root.query_pointer()._data
-    return coord["root_x"], coord["root_y"]
+    conn = _connection()
+    coord = conn.display.screen().root.query_pointer()._data
+    # This is also where the mouse cursor is for _fakeMotion(), until PyAutoGUI waits or the batch ends.
+    conn.pointerPosition = (coord["root_x"], coord["root_y"])
+    return conn.pointerPosition
 
 
 def _size():
-    return _display.screen().width_in_pixels, _display.screen().height_in_pixels
+    # Checking for a ScreenChangeNotify event doesn't need a round trip, just
+    # a look at what the X server has already sent.
+    conn = _connection()
+    conn.processEvents()
+    return conn.screenSize
 
 
 
@@ -48,8 +64,7 @@ def _vscroll(clicks, x=None, y=None):
     else:
         button = 5 # scroll down
 
-    for i in range(abs(clicks)):
-        _click(x, y, button=button)
+    _scrollNotches(button, abs(clicks), x, y)
 
 
 def _hscroll(clicks, x=None, y=None):
@@ -61,8 +76,25 @@ def _hscroll(clicks, x=None, y=None):
     else:
         button = 6 # scroll left
 
-    for i in range(abs(clicks)):
-        _click(x, y, button=button)
+    _scrollNotches(button, abs(clicks), x, y)
+
+
+def _scrollNotches(button, notches, x, y):
+    """Moves the mouse cursor to x, y (if they aren't None) and scrolls the
+    wheel `button` (4 to 7) by `notches`, as a press and release of the button
+    for each notch. The events are sent back to back and only synced once at
+    the end, instead of syncing after each press and release the way _click()
+    does. Inside a batch, the sync is put off until the end of the batch, or
+    until MAX_BATCHED_EVENTS events are waiting."""
+    if x is not None and y is not None:
+        _fakeMotion(x, y)
+    conn = _connection()
+    for i in range(notches):
+        _fakeInput(X.ButtonPress, button)
+        _fakeInput(X.ButtonRelease, button)
+        if conn.batchDepth > 0 and conn.pendingEvents >= pyautogui.MAX_BATCHED_EVENTS:
+            _sync()
+    _sync()
 
 
 def _scroll(clicks, x=None, y=None):
@@ -77,45 +109,383 @@ def _click(x, y, button):
     _mouseUp(x, y, button)
 
 
-_mouse_is_swapped_setting = None
-
-
 def _mouse_is_swapped():
-    # TODO - for performance reasons, we only check the swapped mouse button
-    # setting from the OS once at start up, rather than every mouse click.
-    # Testing shows this takes about 0.02 seconds on my machine in a vm.
-    # This may change in the future.
-    global _mouse_is_swapped_setting
-    if _mouse_is_swapped_setting is None:
+    """Returns True if the X server's pointer mapping has the primary and
+    secondary buttons swapped for left-handed use, so that pressing the
+    physical right button (3) is logical button 1. The mapping is looked up
+    with GetPointerMapping the first time it's needed, and again after a
+    MappingNotify event says that it changed, so most clicks don't need a
+    round trip for it."""
+    conn = _connection()
+    if conn.mouseSwapped is None:
+        mapping = conn.display.get_pointer_mapping()
+        conn.mouseSwapped = len(mapping) >= 3 and mapping[2] == 1
+    return conn.mouseSwapped
+
+
+class _XIChangeHierarchy(rq.Request):
+    # python-xlib's xinput module doesn't have this request. `changes` is the
+    # packed XIAddMasterInfo and XIRemoveMasterInfo structs.
+    _request = rq.Struct(
+        rq.Card8('opcode'),
+        rq.Opcode(43),
+        rq.RequestLength(),
+        rq.Card8('num_changes'),
+        rq.Pad(3),
+        rq.String8('changes'),
+    )
+
+
+class _XISetClientPointer(rq.Request):
+    # python-xlib's xinput module doesn't have this request either.
+    _request = rq.Struct(
+        rq.Card8('opcode'),
+        rq.Opcode(44),
+        rq.RequestLength(),
+        rq.Window('window'),
+        rq.Card16('deviceid'),
+        rq.Pad(2),
+    )
+
+
+_XI_ADD_MASTER = 1
+_XI_REMOVE_MASTER = 2
+_XI_FLOATING = 2
+
+_masterDeviceNumbers = itertools.count(1)  # Keeps the names of the master devices this process creates different.
+
+
+def _addMasterDevices(display):
+    """Creates an XInput2 master pointer and master keyboard on the X server,
+    for a session that has its own mouse cursor, and returns the master
+    pointer's device ID. The X server gives each new master an XTest slave
+    device, which is what the fake input events of a connection whose client
+    pointer is that master go through (see _setClientPointer()).
+
+    The devices stay on the X server until they're removed with
+    _removeMasterDevices(), even after the connection is closed."""
+    if xinput is None or not display.has_extension('XInputExtension'):
+        raise pyautogui.PyAutoGUIException(
+            'A session with its own mouse cursor needs an X server with the XInput2 extension and python-xlib 0.16 '
+            'or later. (The python3-xlib package has no XInput support.)'
+        )
+    if display.xinput_query_version().major_version < 2:
+        raise pyautogui.PyAutoGUIException('A session with its own mouse cursor needs XInput 2.0 or later.')
+
+    name = 'PyAutoGUI %s.%s' % (os.getpid(), next(_masterDeviceNumbers))
+    nameBytes = name.encode('ascii')
+    paddedName = nameBytes + b'\0' * (-len(nameBytes) % 4)
+    # XIAddMasterInfo: type, length in 4-byte units, name length, send_core, enable, and then the name.
+    change = struct.pack('=HHHBB', _XI_ADD_MASTER, 2 + len(paddedName) // 4, len(nameBytes), 1, 1) + paddedName
+    _XIChangeHierarchy(
+        display=display.display,
+        opcode=display.display.get_extension_major('XInputExtension'),
+        num_changes=1,
+        changes=change,
+    )
+
+    # The X server names the new master pointer after the master device.
+    for device in display.xinput_query_device(xinput.AllMasterDevices).devices:
+        if device.use == xinput.MasterPointer and device.name == name + ' pointer':
+            return device.deviceid
+    raise pyautogui.PyAutoGUIException('The X server did not create the master pointer %r.' % (name))
+
+
+def _removeMasterDevices(display, deviceid):
+    """Removes the master pointer `deviceid` and the master keyboard paired
+    with it (along with their XTest slave devices) from the X server."""
+    # XIRemoveMasterInfo: type, length in 4-byte units, device ID, return mode, padding, and the return pointer and
+    # keyboard, which aren't used for the XIFloating return mode.
+    change = struct.pack('=HHHBxHH', _XI_REMOVE_MASTER, 3, deviceid, _XI_FLOATING, 0, 0)
+    _XIChangeHierarchy(
+        display=display.display,
+        opcode=display.display.get_extension_major('XInputExtension'),
+        num_changes=1,
+        changes=change,
+    )
+    display.sync()
+
+
+def _setClientPointer(display, deviceid):
+    """Makes the master pointer `deviceid` the client pointer of the `display`
+    connection. The X server uses a connection's client pointer for core
+    requests like QueryPointer and sends its XTest fake input events through
+    the XTest slave device of the client pointer (for motion and button
+    events) or of the master keyboard paired with it (for key events)."""
+    display.xinput_query_version()  # The X server needs to know that the client speaks XInput2.
+    _XISetClientPointer(
+        display=display.display,
+        opcode=display.display.get_extension_major('XInputExtension'),
+        window=X.NONE,
+        deviceid=deviceid,
+    )
+
+
+class _Connection(object):
+    """A connection to the X server, along with the state PyAutoGUI keeps for
+    it. Each pyautogui.Session has its own connection, since Xlib connections
+    (and the batching state below) shouldn't be shared between threads.
+
+    While a batch is open (see pyautogui.batch()), XTest requests are queued in
+    Xlib's output buffer and only sent (flushed) instead of waiting for the X
+    server to process each one (synced). The X server processes requests in
+    order, so this doesn't change what happens, only how many round trips it
+    takes.
+
+    `displayName` is the X display to connect to, such as ":7". If it's None,
+    the DISPLAY environment variable is used. The connection has its own
+    keyboard mapping and screen size. The screen size is looked up when it's
+    opened and again when the X server's RandR extension says it changed
+    (for example, after running xrandr), and `screenSizeChanged` (if it's
+    set) is then called with the old and new sizes.
+
+    If `ownPointer` is True, the connection creates its own XInput2 master
+    pointer and keyboard and sends all of its input through them, so it moves
+    its own mouse cursor and types with its own keyboard focus, independently
+    of the user's and of other connections. `masterPointer` is then the
+    master pointer's device ID, and closing the connection removes the
+    devices. If `masterPointer` is passed instead, the connection uses that
+    existing master pointer (see copy()), and closing it leaves it alone.
+
+    `pointerPosition` is where PyAutoGUI last put the mouse cursor (or found
+    it), or None if it doesn't know. Motion events to that same position are
+    left out, and `motionStats` counts the motion events that were sent and
+    left out. See _fakeMotion()."""
+
+    def __init__(self, displayName=None, ownPointer=False, masterPointer=None):
+        # Xlib.display imports all of python-xlib's extension modules, so it
+        # isn't imported until a connection is opened.
+        from Xlib.display import Display
+
+        if displayName is None:
+            displayName = os.environ['DISPLAY']
+        self.display = Display(displayName)
+        self.displayName = self.display.get_display_name()
+        self.batchDepth = 0
+        self.pendingEvents = 0
+        # Milliseconds for the X server to wait before the next event (see
+        # _delay()), and whether events with such a delay may still be waiting
+        # to be played by the server.
+        self.delay = 0.0
+        self.delayedEvents = False
+
+        screen = self.display.screen()
+        self.screenSize = (screen.width_in_pixels, screen.height_in_pixels)
+        self.screenSizeChanged = None
+        self.keyboardMapping = _KeyboardMapping(self.display)
+        self.mouseSwapped = None  # Looked up by _mouse_is_swapped() when it's first needed.
+        self.pointerPosition = None
+        self.motionStats = [0, 0]  # Replaced with the session's list by pyautogui.Session._getConnection().
+
+        self.masterPointer = masterPointer
+        self.ownsMasterPointer = False
+        try:
+            if ownPointer:
+                self.masterPointer = _addMasterDevices(self.display)
+                self.ownsMasterPointer = True
+            if self.masterPointer is not None:
+                _setClientPointer(self.display, self.masterPointer)
+        except Exception:
+            self.close()
+            raise
+
+        # Ask to be told when the screen's size changes. Selecting events
+        # doesn't need a round trip.
+        self.screenChangeEventType = None
+        if self.display.has_extension('RANDR'):
+            from Xlib.ext import randr
+
+            screen.root.xrandr_select_input(randr.RRScreenChangeNotifyMask)
+            self.screenChangeEventType = self.display.extension_event.ScreenChangeNotify
+
+    def copy(self):
+        """Opens another connection to the same display, with the same mouse
+        cursor and keyboard, for another thread to use. python-xlib's display
+        objects (and the batching state kept here) can't be shared between
+        threads."""
+        return _Connection(self.displayName, masterPointer=self.masterPointer)
+
+    def close(self):
         try:
-            proc = subprocess.Popen(['dconf', 'read', '/org/gnome/desktop/peripherals/mouse/left-handed'], stdout=subprocess.PIPE)
-            stdout_bytes, stderr_bytes = proc.communicate()
-            _mouse_is_swapped_setting = stdout_bytes.decode('utf-8') == 'true\n'
-        except FileNotFoundError:
-            # The user is not running Gnome (the default window manager on Ubuntu) so just assume it's not swapped.
-            _mouse_is_swapped_setting = False
-    return _mouse_is_swapped_setting
+            if self.ownsMasterPointer:
+                _removeMasterDevices(self.display, self.masterPointer)
+                self.ownsMasterPointer = False
+                self.masterPointer = None
+        finally:
+            self.display.close()
+
+    def processEvents(self):
+        """Handles any events the X server has sent to this connection: RandR
+        ScreenChangeNotify events, and the MappingNotify events that every
+        client is sent when the server's keyboard or pointer mapping changes.
+        This is called after each sync, when python-xlib has already read any
+        events that came before the sync's reply, and by _size()."""
+        display = self.display
+        while display.pending_events():
+            event = display.next_event()
+            if event.type == X.MappingNotify and event.request == X.MappingKeyboard:
+                # python-xlib fetches the changed part of the keyboard mapping with one request, and the keycodes
+                # that were looked up before have to be looked up again.
+                display.refresh_keyboard_mapping(event)
+                self.keyboardMapping.clear()
+            elif event.type == X.MappingNotify and event.request == X.MappingPointer:
+                self.mouseSwapped = None  # Look up the pointer mapping again the next time it's needed.
+            elif event.type == self.screenChangeEventType:
+                # The event's size doesn't account for rotation, so ask for the root window's size instead.
+                geometry = display.screen().root.get_geometry()
+                oldSize = self.screenSize
+                self.screenSize = (geometry.width, geometry.height)
+                self.pointerPosition = None  # The mouse cursor may have been moved onto the new screen.
+                if self.screenSize != oldSize and self.screenSizeChanged is not None:
+                    self.screenSizeChanged(oldSize, self.screenSize)
+
+
+def _connection():
+    """Returns the _Connection of the pyautogui.Session being used on this
+    thread."""
+    return pyautogui._currentSession()._getConnection()
+
+
+def _fakeInput(eventType, detail=0, x=0, y=0):
+    conn = _connection()
+    delay = int(conn.delay)
+    if delay:
+        # Whatever is left over after the whole milliseconds is carried to the
+        # next event, so a series of short delays doesn't lose time.
+        conn.delay -= delay
+        conn.delayedEvents = True
+    fake_input(conn.display, eventType, detail, time=delay, x=x, y=y)
+    conn.pendingEvents += 1
+
+
+def _fakeMotion(x, y):
+    """Moves the mouse cursor to x, y with a motion event, unless PyAutoGUI
+    already put it there, and returns True if the event was sent. Clicking
+    at x, y moves the mouse cursor there, and then _mouseDown() and
+    _mouseUp() each move it there again, so leaving out the motion events
+    that wouldn't move it saves two out of three of them.
+
+    Nothing stops the user (or another program) from moving the mouse cursor
+    too, so the position PyAutoGUI put it at is only relied on until
+    PyAutoGUI waits for anything or the outermost batch ends. The motion
+    events inside one PyAutoGUI function, such as the clicks of a double
+    click, are sent too quickly for anyone to move the mouse cursor in
+    between."""
+    conn = _connection()
+    if conn.pointerPosition == (x, y):
+        conn.motionStats[1] += 1
+        return False
+    _fakeInput(X.MotionNotify, x=x, y=y)
+    conn.pointerPosition = (x, y)
+    conn.motionStats[0] += 1
+    return True
+
+
+def _delay(seconds):
+    """Makes the X server wait `seconds` before processing the next event,
+    instead of PyAutoGUI sleeping before sending it. XTest's fake input
+    requests have a delay in milliseconds, during which the server doesn't
+    process any more requests from this connection. This is used while
+    pyautogui.SERVER_TIMING is on, inside of a batch, so that all the events
+    are sent at once and the server plays them back on time."""
+    conn = _connection()
+    conn.delay += seconds * 1000
+    conn.pointerPosition = None  # The mouse cursor could be moved while the server waits.
+
+
+def _sync():
+    """Waits for the X server to process the events sent so far. While a batch
+    is open, this only happens once pyautogui.MAX_BATCHED_EVENTS events are in
+    flight. Events with XTest delays (see _delay()) are only sent, not
+    waited for."""
+    conn = _connection()
+    if conn.batchDepth > 0 and conn.pendingEvents < pyautogui.MAX_BATCHED_EVENTS:
+        return
+    if conn.delayedEvents:
+        # Syncing would wait for the X server to play back the delayed events, as in _endBatch(). Sending them is
+        # enough to keep Xlib's output buffer from growing.
+        conn.display.flush()
+        conn.pendingEvents = 0
+        return
+    conn.display.sync()
+    conn.pendingEvents = 0
+    conn.delayedEvents = False
+    conn.processEvents()
+
+
+def _flush():
+    """Sends any queued events to the X server without waiting for them to be
+    processed. This is called before PyAutoGUI sleeps in the middle of a
+    batch, so the mouse cursor's position is forgotten too."""
+    conn = _connection()
+    conn.pointerPosition = None  # The mouse cursor could be moved while PyAutoGUI sleeps.
+    _sendEvents(conn)
+
+
+def _sendEvents(conn):
+    # Unlike _flush(), this doesn't forget the mouse cursor's position: it's used when a batch ends, which takes no
+    # time, so the position is still good for the rest of the outer batch.
+    if conn.pendingEvents:
+        conn.display.flush()
+
+
+def _beginBatch():
+    conn = _connection()
+    if conn.batchDepth == 0:
+        conn.pointerPosition = None  # The mouse cursor could have been moved since the last batch.
+    conn.batchDepth += 1
+
+
+def _endBatch():
+    conn = _connection()
+    conn.batchDepth -= 1
+    if conn.batchDepth > 0:
+        # An outer batch is still open: send the events now, but let the outer batch do the round trip.
+        _sendEvents(conn)
+        return
+    conn.delay = 0.0  # A delay after the last event has nothing left to delay.
+    if conn.delayedEvents:
+        # Syncing would wait for the X server to play back the delayed events, which is what the delays are meant to
+        # avoid. The next sync (or any request that needs a reply) will wait for them instead, so they don't count
+        # towards the next batch's MAX_BATCHED_EVENTS.
+        _sendEvents(conn)
+        conn.pendingEvents = 0
+        conn.delayedEvents = False
+    elif conn.pendingEvents:
+        conn.display.sync()
+        conn.pendingEvents = 0
+        conn.processEvents()
 
 
 def _moveTo(x, y):
-    fake_input(_display, X.MotionNotify, x=x, y=y)
-    _display.sync()
+    if _fakeMotion(x, y):
+        _sync()
+
+
+def _moveRel(xOffset, yOffset):
+    # A detail of 1 makes XTest move the pointer relative to where it is now. The X server may stop the mouse cursor
+    # at the edge of the screen, so where it ends up isn't known.
+    conn = _connection()
+    _fakeInput(X.MotionNotify, 1, x=xOffset, y=yOffset)
+    conn.pointerPosition = None
+    conn.motionStats[0] += 1
+    _sync()
 
 
 def _mouseDown(x, y, button):
-    _moveTo(x, y)
+    _fakeMotion(x, y)
     assert button in BUTTON_NAME_MAPPING.keys(), "button argument not in ('left', 'middle', 'right', 4, 5, 6, 7)"
     button = BUTTON_NAME_MAPPING[button]
-    fake_input(_display, X.ButtonPress, button)
-    _display.sync()
+    _fakeInput(X.ButtonPress, button)
+    _sync()
 
 
 def _mouseUp(x, y, button):
-    _moveTo(x, y)
+    _fakeMotion(x, y)
     assert button in BUTTON_NAME_MAPPING.keys(), "button argument not in ('left', 'middle', 'right', 4, 5, 6, 7)"
     button = BUTTON_NAME_MAPPING[button]
-    fake_input(_display, X.ButtonRelease, button)
-    _display.sync()
+    _fakeInput(X.ButtonRelease, button)
+    _sync()
 
 
 def _keyDown(key):
@@ -132,23 +502,10 @@ def _keyDown(key):
     Returns:
       None
     """
-    if key not in keyboardMapping or keyboardMapping[key] is None:
-        return
-
-    if type(key) == int:
-        fake_input(_display, X.KeyPress, key)
-        _display.sync()
+    resolvedKey = _resolveKey(key)
+    if resolvedKey is None:
         return
-
-    needsShift = pyautogui.isShiftCharacter(key)
-    if needsShift:
-        fake_input(_display, X.KeyPress, keyboardMapping['shift'])
-
-    fake_input(_display, X.KeyPress, keyboardMapping[key])
-
-    if needsShift:
-        fake_input(_display, X.KeyRelease, keyboardMapping['shift'])
-    _display.sync()
+    _keyCodeDown(*resolvedKey)
 
 
 def _keyUp(key):
@@ -166,156 +523,351 @@ def _keyUp(key):
     Release a given character key. Also works with character keycodes as
     integers, but not keysyms.
     """
-    if key not in keyboardMapping or keyboardMapping[key] is None:
+    resolvedKey = _resolveKey(key)
+    if resolvedKey is None:
         return
+    _keyCodeUp(resolvedKey[0])
+
+
+def _resolveKey(key):
+    """Returns a (keycode, needsShift) tuple for the given key, or None if the
+    key isn't valid. pyautogui.ActionPlan calls this ahead of time so that
+    replaying a plan doesn't need to look up keys again."""
+    keyboardMapping = _connection().keyboardMapping
+    if key not in keyboardMapping or keyboardMapping[key] is None:
+        return None
 
     if type(key) == int:
-        keycode = key
-    else:
-        keycode = keyboardMapping[key]
+        return (key, False)
+
+    return (keyboardMapping[key], pyautogui.isShiftCharacter(key))
+
+
+def _keyCodeDown(keycode, needsShift=False):
+    shiftKeycode = _connection().keyboardMapping['shift']
+    if needsShift:
+        _fakeInput(X.KeyPress, shiftKeycode)
+
+    _fakeInput(X.KeyPress, keycode)
+
+    if needsShift:
+        _fakeInput(X.KeyRelease, shiftKeycode)
+    _sync()
+
 
-    fake_input(_display, X.KeyRelease, keycode)
-    _display.sync()
+def _keyCodeUp(keycode):
+    _fakeInput(X.KeyRelease, keycode)
+    _sync()
 
 
-# Taken from PyKeyboard's ctor function.
-_display = Display(os.environ['DISPLAY'])
+def _screenshot(imageFilename=None, region=None):
+    """Returns a screenshot of the current session's X display as a PIL Image
+    object. This is used by pyautogui.Controller, since PyScreeze can only take
+    screenshots of the DISPLAY environment variable's display. It needs a
+    version of Pillow that was built with XCB support.
 
+    Args:
+      imageFilename (str, optional): If given, the screenshot is saved to this file.
+      region (tuple, optional): A (left, top, width, height) tuple of the part
+      of the screen to capture.
 
-""" Information for keyboardMapping derived from PyKeyboard's special_key_assignment() function.
+    Returns:
+      The PIL Image object.
+    """
+    from PIL import ImageGrab  # Pillow is only needed for screenshots.
+
+    bbox = None
+    if region is not None:
+        bbox = (region[0], region[1], region[0] + region[2], region[1] + region[3])
+    im = ImageGrab.grab(bbox=bbox, xdisplay=_connection().displayName)
+    if imageFilename is not None:
+        im.save(imageFilename)
+    return im
+
+
+def _watchPointer(callback, stopEvent):
+    """Calls ``callback(x, y)`` with the mouse cursor position every time the
+    pointer moves, until ``stopEvent`` is set. This is run on the fail-safe
+    watcher's background thread.
+
+    Xlib connections can't be shared between threads, so this opens its own
+    connection to the same X server as the current session, and watches the
+    session's own mouse cursor if it has one. If the server (or python-xlib)
+    doesn't support XInput2, the pointer position is polled instead.
+    """
+    from Xlib.display import Display
+
+    conn = _connection()
+    display = Display(conn.displayName)
+    try:
+        if conn.masterPointer is not None:
+            _setClientPointer(display, conn.masterPointer)
+        root = display.screen().root
+        useRawMotion = xinput is not None and display.has_extension('XInputExtension')
+        if useRawMotion:
+            display.xinput_query_version()
+            root.xinput_select_events([(xinput.AllMasterDevices, xinput.RawMotionMask)])
+            display.flush()
+
+        coord = root.query_pointer()._data
+        callback(coord["root_x"], coord["root_y"])
+
+        while not stopEvent.is_set():
+            if useRawMotion:
+                # Raw motion events don't include the cursor position, so they only tell us when to query it. Several
+                # events may have arrived since the last query, but one query covers all of them. Events that came in
+                # with the last query's reply are already in python-xlib's queue, and the socket won't be readable for
+                # them, so the queue is checked before waiting.
+                if display.pending_events() == 0:
+                    timeout = pyautogui.FAILSAFE_WATCHER_POLL_INTERVAL * 10
+                    readable, unused, unused = select.select([display], [], [], timeout)
+                    if not readable or display.pending_events() == 0:
+                        continue
+                while display.pending_events():
+                    display.next_event()
+            else:
+                stopEvent.wait(pyautogui.FAILSAFE_WATCHER_POLL_INTERVAL)
+
+            coord = root.query_pointer()._data
+            callback(coord["root_x"], coord["root_y"])
+    finally:
+        display.close()
+
+
+""" Information for _KEYSYM_NAMES derived from PyKeyboard's special_key_assignment() function.
 
 The *KB dictionaries in pyautogui map a string that can be passed to keyDown(),
 keyUp(), or press() into the code used for the OS-specific keyboard function.
 
-They should always be lowercase, and the same keys should be used across all OSes."""
-keyboardMapping = dict([(key, None) for key in pyautogui.KEY_NAMES])
-keyboardMapping.update({
-    'backspace':         _display.keysym_to_keycode(Xlib.XK.string_to_keysym('BackSpace')),
-    '\b':                _display.keysym_to_keycode(Xlib.XK.string_to_keysym('BackSpace')),
-    'tab':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Tab')),
-    'enter':             _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Return')),
-    'return':            _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Return')),
-    'shift':             _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Shift_L')),
-    'ctrl':              _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Control_L')),
-    'alt':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Alt_L')),
-    'pause':             _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Pause')),
-    'capslock':          _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Caps_Lock')),
-    'esc':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Escape')),
-    'escape':            _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Escape')),
-    'pgup':              _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Page_Up')),
-    'pgdn':              _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Page_Down')),
-    'pageup':            _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Page_Up')),
-    'pagedown':          _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Page_Down')),
-    'end':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('End')),
-    'home':              _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Home')),
-    'left':              _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Left')),
-    'up':                _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Up')),
-    'right':             _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Right')),
-    'down':              _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Down')),
-    'select':            _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Select')),
-    'print':             _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Print')),
-    'execute':           _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Execute')),
-    'prtsc':             _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Print')),
-    'prtscr':            _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Print')),
-    'prntscrn':          _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Print')),
-    'printscreen':       _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Print')),
-    'insert':            _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Insert')),
-    'del':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Delete')),
-    'delete':            _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Delete')),
-    'help':              _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Help')),
-    'win':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Super_L')),
-    'winleft':           _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Super_L')),
-    'winright':          _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Super_R')),
-    'apps':              _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Menu')),
-    'num0':              _display.keysym_to_keycode(Xlib.XK.string_to_keysym('KP_0')),
-    'num1':              _display.keysym_to_keycode(Xlib.XK.string_to_keysym('KP_1')),
-    'num2':              _display.keysym_to_keycode(Xlib.XK.string_to_keysym('KP_2')),
-    'num3':              _display.keysym_to_keycode(Xlib.XK.string_to_keysym('KP_3')),
-    'num4':              _display.keysym_to_keycode(Xlib.XK.string_to_keysym('KP_4')),
-    'num5':              _display.keysym_to_keycode(Xlib.XK.string_to_keysym('KP_5')),
-    'num6':              _display.keysym_to_keycode(Xlib.XK.string_to_keysym('KP_6')),
-    'num7':              _display.keysym_to_keycode(Xlib.XK.string_to_keysym('KP_7')),
-    'num8':              _display.keysym_to_keycode(Xlib.XK.string_to_keysym('KP_8')),
-    'num9':              _display.keysym_to_keycode(Xlib.XK.string_to_keysym('KP_9')),
-    'multiply':          _display.keysym_to_keycode(Xlib.XK.string_to_keysym('KP_Multiply')),
-    'add':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('KP_Add')),
-    'separator':         _display.keysym_to_keycode(Xlib.XK.string_to_keysym('KP_Separator')),
-    'subtract':          _display.keysym_to_keycode(Xlib.XK.string_to_keysym('KP_Subtract')),
-    'decimal':           _display.keysym_to_keycode(Xlib.XK.string_to_keysym('KP_Decimal')),
-    'divide':            _display.keysym_to_keycode(Xlib.XK.string_to_keysym('KP_Divide')),
-    'f1':                _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F1')),
-    'f2':                _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F2')),
-    'f3':                _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F3')),
-    'f4':                _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F4')),
-    'f5':                _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F5')),
-    'f6':                _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F6')),
-    'f7':                _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F7')),
-    'f8':                _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F8')),
-    'f9':                _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F9')),
-    'f10':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F10')),
-    'f11':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F11')),
-    'f12':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F12')),
-    'f13':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F13')),
-    'f14':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F14')),
-    'f15':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F15')),
-    'f16':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F16')),
-    'f17':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F17')),
-    'f18':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F18')),
-    'f19':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F19')),
-    'f20':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F20')),
-    'f21':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F21')),
-    'f22':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F22')),
-    'f23':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F23')),
-    'f24':               _display.keysym_to_keycode(Xlib.XK.string_to_keysym('F24')),
-    'numlock':           _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Num_Lock')),
-    'scrolllock':        _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Scroll_Lock')),
-    'shiftleft':         _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Shift_L')),
-    'shiftright':        _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Shift_R')),
-    'ctrlleft':          _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Control_L')),
-    'ctrlright':         _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Control_R')),
-    'altleft':           _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Alt_L')),
-    'altright':          _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Alt_R')),
+They should always be lowercase, and the same keys should be used across all OSes.
+
+On X11, the keycodes depend on the X server's keyboard mapping, so this maps
+each key to the name of its X keysym instead. Each _Connection's
+keyboardMapping looks up the keycode for a keysym the first time it's used.
+The letters and digits (which aren't in this dictionary) are their own keysym
+names."""
+_KEYSYM_NAMES = {
+    'backspace':         'BackSpace',
+    '\b':                'BackSpace',
+    'tab':               'Tab',
+    'enter':             'Return',
+    'return':            'Return',
+    'shift':             'Shift_L',
+    'ctrl':              'Control_L',
+    'alt':               'Alt_L',
+    'pause':             'Pause',
+    'capslock':          'Caps_Lock',
+    'esc':               'Escape',
+    'escape':            'Escape',
+    'pgup':              'Page_Up',
+    'pgdn':              'Page_Down',
+    'pageup':            'Page_Up',
+    'pagedown':          'Page_Down',
+    'end':               'End',
+    'home':              'Home',
+    'left':              'Left',
+    'up':                'Up',
+    'right':             'Right',
+    'down':              'Down',
+    'select':            'Select',
+    'print':             'Print',
+    'execute':           'Execute',
+    'prtsc':             'Print',
+    'prtscr':            'Print',
+    'prntscrn':          'Print',
+    'printscreen':       'Print',
+    'insert':            'Insert',
+    'del':               'Delete',
+    'delete':            'Delete',
+    'help':              'Help',
+    'win':               'Super_L',
+    'winleft':           'Super_L',
+    'winright':          'Super_R',
+    'apps':              'Menu',
+    'num0':              'KP_0',
+    'num1':              'KP_1',
+    'num2':              'KP_2',
+    'num3':              'KP_3',
+    'num4':              'KP_4',
+    'num5':              'KP_5',
+    'num6':              'KP_6',
+    'num7':              'KP_7',
+    'num8':              'KP_8',
+    'num9':              'KP_9',
+    'multiply':          'KP_Multiply',
+    'add':               'KP_Add',
+    'separator':         'KP_Separator',
+    'subtract':          'KP_Subtract',
+    'decimal':           'KP_Decimal',
+    'divide':            'KP_Divide',
+    'f1':                'F1',
+    'f2':                'F2',
+    'f3':                'F3',
+    'f4':                'F4',
+    'f5':                'F5',
+    'f6':                'F6',
+    'f7':                'F7',
+    'f8':                'F8',
+    'f9':                'F9',
+    'f10':               'F10',
+    'f11':               'F11',
+    'f12':               'F12',
+    'f13':               'F13',
+    'f14':               'F14',
+    'f15':               'F15',
+    'f16':               'F16',
+    'f17':               'F17',
+    'f18':               'F18',
+    'f19':               'F19',
+    'f20':               'F20',
+    'f21':               'F21',
+    'f22':               'F22',
+    'f23':               'F23',
+    'f24':               'F24',
+    'numlock':           'Num_Lock',
+    'scrolllock':        'Scroll_Lock',
+    'shiftleft':         'Shift_L',
+    'shiftright':        'Shift_R',
+    'ctrlleft':          'Control_L',
+    'ctrlright':         'Control_R',
+    'altleft':           'Alt_L',
+    'altright':          'Alt_R',
     # These are added because unlike a-zA-Z0-9, the single characters do not have a
-    ' ': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('space')),
-    'space': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('space')),
-    '\t': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Tab')),
-    '\n': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Return')),  # for some reason this needs to be cr, not lf
-    '\r': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Return')),
-    '\e': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('Escape')),
-    '!': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('exclam')),
-    '#': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('numbersign')),
-    '%': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('percent')),
-    '$': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('dollar')),
-    '&': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('ampersand')),
-    '"': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('quotedbl')),
-    "'": _display.keysym_to_keycode(Xlib.XK.string_to_keysym('apostrophe')),
-    '(': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('parenleft')),
-    ')': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('parenright')),
-    '*': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('asterisk')),
-    '=': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('equal')),
-    '+': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('plus')),
-    ',': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('comma')),
-    '-': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('minus')),
-    '.': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('period')),
-    '/': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('slash')),
-    ':': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('colon')),
-    ';': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('semicolon')),
-    '<': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('less')),
-    '>': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('greater')),
-    '?': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('question')),
-    '@': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('at')),
-    '[': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('bracketleft')),
-    ']': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('bracketright')),
-    '\\': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('backslash')),
-    '^': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('asciicircum')),
-    '_': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('underscore')),
-    '`': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('grave')),
-    '{': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('braceleft')),
-    '|': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('bar')),
-    '}': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('braceright')),
-    '~': _display.keysym_to_keycode(Xlib.XK.string_to_keysym('asciitilde')),
-})
-
-# Trading memory for time" populate winKB so we don't have to call VkKeyScanA each time.
-for c in """abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ1234567890""":
-    keyboardMapping[c] = _display.keysym_to_keycode(Xlib.XK.string_to_keysym(c))
+    ' ': 'space',
+    'space': 'space',
+    '\t': 'Tab',
+    '\n': 'Return',  # for some reason this needs to be cr, not lf
+    '\r': 'Return',
+    '\e': 'Escape',
+    '!': 'exclam',
+    '#': 'numbersign',
+    '%': 'percent',
+    '$': 'dollar',
+    '&': 'ampersand',
+    '"': 'quotedbl',
+    "'": 'apostrophe',
+    '(': 'parenleft',
+    ')': 'parenright',
+    '*': 'asterisk',
+    '=': 'equal',
+    '+': 'plus',
+    ',': 'comma',
+    '-': 'minus',
+    '.': 'period',
+    '/': 'slash',
+    ':': 'colon',
+    ';': 'semicolon',
+    '<': 'less',
+    '>': 'greater',
+    '?': 'question',
+    '@': 'at',
+    '[': 'bracketleft',
+    ']': 'bracketright',
+    '\\': 'backslash',
+    '^': 'asciicircum',
+    '_': 'underscore',
+    '`': 'grave',
+    '{': 'braceleft',
+    '|': 'bar',
+    '}': 'braceright',
+    '~': 'asciitilde',
+}
+
+
+_KEY_NAMES_SET = frozenset(pyautogui.KEY_NAMES)
+
+# Every key that a _KeyboardMapping has, in the order that the keyboardMapping
+# dictionary that was built when the module was imported had them.
+_ALL_KEYS = []
+_LETTERS_AND_DIGITS = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ1234567890'
+for _key in list(pyautogui.KEY_NAMES) + list(_KEYSYM_NAMES) + list(_LETTERS_AND_DIGITS):
+    if _key not in _ALL_KEYS:
+        _ALL_KEYS.append(_key)
+_ALL_KEYS = tuple(_ALL_KEYS)
+del _key
+
+
+class _KeyboardMapping(dict):
+    """The keyboardMapping dictionary of a _Connection, which maps the keys in
+    pyautogui.KEY_NAMES (and the letters and digits) to keycodes, or to None
+    for keys that X11 doesn't have.
+
+    Keycodes are looked up the first time each key is used, rather than all at
+    once when the connection is opened. python-xlib fetches the server's whole
+    keyboard mapping in one GetKeyboardMapping request when it connects, so
+    this doesn't make any requests. The cache is cleared when the server's
+    keyboard mapping changes (see _Connection.processEvents()).
+
+    Iterating over the mapping (or calling len(), keys(), values(), or
+    items()) looks up all of the keys first, so it has every key, the same
+    as a dictionary that was filled in ahead of time."""
+
+    def __init__(self, display):
+        dict.__init__(self)
+        self.display = display
+
+    def __missing__(self, key):
+        if key in _KEYSYM_NAMES:
+            keysymName = _KEYSYM_NAMES[key]
+        elif isinstance(key, str) and len(key) == 1 and key.isalnum() and ord(key) < 128:
+            keysymName = key
+        elif key in _KEY_NAMES_SET:
+            keysymName = None  # A key that only exists on other platforms.
+        else:
+            raise KeyError(key)
+
+        if keysymName is None:
+            keycode = None
+        else:
+            keycode = self.display.keysym_to_keycode(Xlib.XK.string_to_keysym(keysymName))
+        self[key] = keycode
+        return keycode
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except (KeyError, TypeError):
+            return default
+
+    def _lookUpAll(self):
+        if dict.__len__(self) < len(_ALL_KEYS):
+            for key in _ALL_KEYS:
+                self[key]
+
+    def __iter__(self):
+        self._lookUpAll()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self._lookUpAll()
+        return dict.__len__(self)
+
+    def keys(self):
+        self._lookUpAll()
+        return dict.keys(self)
+
+    def values(self):
+        self._lookUpAll()
+        return dict.values(self)
+
+    def items(self):
+        self._lookUpAll()
+        return dict.items(self)
+
+
+def __getattr__(name):
+    """The _display and keyboardMapping names are looked up from the default
+    session's connection, which isn't opened until it's first needed. (This
+    only works on Python 3.7 and later, see PEP 562.)"""
+    if name == '_display':
+        return pyautogui._defaultSession._getConnection().display
+    if name == 'keyboardMapping':
+        return pyautogui._defaultSession._getConnection().keyboardMapping
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -0,0 +1,419 @@
+# Coroutine versions of PyAutoGUI's functions, for asyncio programs. Needs Python 3.7 or later.
+
+"""
+The functions in this module work the same as the PyAutoGUI functions of the same names, but they're coroutines that
+wait with ``asyncio.sleep()`` instead of ``time.sleep()``: the ``PAUSE`` pause, ``interval`` waits, and the steps of
+tweened mouse movements all leave the event loop free to run other tasks. Everything that talks to the OS (sending
+input events, asking for the mouse position, and taking screenshots) is run in the event loop's default executor, one
+call at a time for each session, so it doesn't hold up the event loop either. One event loop can drive many displays
+at once:
+
+>>> async def work(controller):  # doctest: +SKIP
+...     with pyautogui.aio.useSession(controller):
+...         await pyautogui.aio.click(100, 200, duration=0.5)
+...         await pyautogui.aio.typewrite('Hello world!', interval=0.05)
+>>> async def main():  # doctest: +SKIP
+...     controllers = [pyautogui.Controller(display=":%s" % (n)) for n in range(1, 101)]
+...     await asyncio.gather(*[work(controller) for controller in controllers])
+
+The functions use the session set with ``useSession()`` for the current task, or the current thread's session (the
+default session, unless inside a ``with session:`` block) if there isn't one.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import functools
+import sys
+import weakref
+from collections.abc import Sequence
+
+import pyautogui
+from pyautogui import LEFT, MIDDLE, RIGHT, PRIMARY, linear, ImageNotFoundException
+from pyautogui import _clock, _currentSession, _logScreenshot, _normalizeButton, _normalizeXYArgs
+
+
+# The session set with useSession(). Each asyncio task has its own copy, so tasks can use different sessions.
+_sessionVar = contextvars.ContextVar("pyautogui.aio.session", default=None)
+
+
+@contextlib.contextmanager
+def useSession(session):
+    """
+    Context manager that makes the functions in this module use ``session`` (a ``pyautogui.Session`` or
+    ``pyautogui.Controller``) inside of it. Unlike ``with session:``, which is for the current thread, this is for the
+    current asyncio task, so other tasks running at the same time can use their own sessions.
+    """
+    token = _sessionVar.set(session)
+    try:
+        yield session
+    finally:
+        _sessionVar.reset(token)
+
+
+def _session():
+    """Returns the session that the functions in this module should use. See useSession()."""
+    session = _sessionVar.get()
+    if session is None:
+        return _currentSession()
+    return session
+
+
+def _callInSession(session, function, args, kwargs):
+    """Calls ``function`` with ``session`` active, batching the input events it sends. Runs in the executor."""
+    with session:
+        with pyautogui.batch():
+            return function(*args, **kwargs)
+
+
+# The asyncio.Lock of each session, which keeps its calls in the executor to one at a time.
+_sessionLocks = weakref.WeakKeyDictionary()
+
+
+async def _call(session, function, *args, **kwargs):
+    """
+    Calls ``function`` in the event loop's default executor with ``session`` active, and returns what it returns.
+    Calls that need the OS go through here, since they can block (on a round trip to the X server, for example).
+
+    A session's connection to the OS can't be used from two threads at once, so tasks that use the same session take
+    turns: the session's calls wait on the event loop (not in the executor) until the call before them is over.
+    """
+    lock = _sessionLocks.get(session)
+    if lock is None:
+        lock = _sessionLocks[session] = asyncio.Lock()
+    loop = asyncio.get_running_loop()
+    async with lock:
+        future = loop.run_in_executor(None, functools.partial(_callInSession, session, function, args, kwargs))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The call can't be stopped once it's running, so the session stays locked until it's over.
+            await asyncio.wait([future])
+            raise
+
+
+def _isServerTimed(session):
+    """
+    Returns True if ``session`` has the OS time the intervals between input events (see ``SERVER_TIMING``), in which
+    case the PyAutoGUI functions send all of their events right away and don't wait on their own.
+    """
+    return session.SERVER_TIMING and hasattr(pyautogui.platformModule, "_delay")
+
+
+async def _sleepUntil(session, deadline, requested):
+    """
+    Like ``pyautogui._sleepUntil()``, but awaits ``asyncio.sleep()``. The wait is counted in the session's timing
+    stats. The event loop's timer isn't as exact as ``_clock()``, so this keeps sleeping until the deadline has
+    really passed.
+    """
+    remaining = deadline - _clock()
+    while remaining > 0:
+        await asyncio.sleep(remaining)
+        remaining = deadline - _clock()
+
+    lateness = -remaining
+    timingStats = session._timingStats
+    timingStats[0] += 1
+    timingStats[1] += requested
+    timingStats[2] += lateness
+    timingStats[3] = max(timingStats[3], lateness)
+
+
+async def _wait(session, timeline, seconds):
+    """Like ``timeline.wait(seconds)`` for a ``pyautogui._Timeline``, but awaits instead of sleeping."""
+    if seconds <= 0:
+        return
+    now = _clock()
+    if now - timeline.deadline > seconds:
+        timeline.deadline = now
+    timeline.deadline += seconds
+    await _sleepUntil(session, timeline.deadline, seconds)
+
+
+async def _handlePause(session, _pause):
+    """Like ``pyautogui._handlePause()``. The pause is on the session's pause timeline, shared with its functions."""
+    if _pause:
+        await _wait(session, session._pauseTimeline, session.PAUSE)
+
+
+def _startMove(x, y, duration, tween):
+    """
+    Finds the start of a tweened mouse movement to ``x``, ``y`` (either of which can be None for the mouse cursor's
+    current coordinate), and returns the destination and the movement's ``iterPath()`` steps. Runs in the executor.
+    """
+    startx, starty = pyautogui.position()
+    x = int(x) if x is not None else startx
+    y = int(y) if y is not None else starty
+    pyautogui._numpy()  # Import NumPy here, instead of in the event loop once the movement's clock has started.
+    return x, y, pyautogui.iterPath(startx, starty, x, y, duration, tween)
+
+
+def _finishMove(x, y):
+    """Does the fail-safe check at the end of a mouse movement, as _mouseMoveDrag() does. Runs in the executor."""
+    if (x, y) not in _currentSession().FAILSAFE_POINTS:
+        pyautogui.failSafeCheck()
+
+
+# Where the OS can time input events (see SERVER_TIMING), a tweened movement's steps are sent in chunks of about this
+# many seconds, with one call in the executor for each chunk instead of one for each step.
+_MOVE_CHUNK_SECONDS = 0.1
+
+
+def _chunkSteps(steps, seconds):
+    """Yields lists of the ``PathStep`` objects in ``steps``, each covering less than ``seconds`` of the movement."""
+    chunk = []
+    for step in steps:
+        if chunk and step.time - chunk[0].time >= seconds:
+            yield chunk
+            chunk = []
+        chunk.append(step)
+    if chunk:
+        yield chunk
+
+
+def _sendChunk(steps, start):
+    """
+    Sends a chunk of a tweened movement's ``steps`` at once, with the OS waiting between them the same as with
+    ``SERVER_TIMING``. ``start`` is the ``_clock()`` time that the movement started. If the chunk is sent late, the
+    steps whose time has passed are dropped, except for the newest of them, so the chunk's last step is never dropped.
+    Runs in the executor.
+    """
+    session = _currentSession()
+    pyautogui.failSafeCheck()
+    elapsed = _clock() - start
+    due = sum(1 for step in steps if step.time <= elapsed)
+    if due > 1:
+        session._timingStats[4] += due - 1
+        steps = steps[due - 1 :]
+
+    def timedSteps():
+        timeline = pyautogui._ServerTimeline()
+        previousTime = max(steps[0].time, elapsed)
+        for step in steps:
+            timeline.wait(step.time - previousTime)
+            previousTime = max(step.time, previousTime)
+            yield step
+
+    # The fail-safe was checked above. Checking it between the steps would wait for the OS to play them back.
+    session._serverTimed = True
+    try:
+        pyautogui._sendPath("move", timedSteps())
+    finally:
+        session._serverTimed = False
+
+
+async def _moveTo(session, x, y, duration, tween):
+    """
+    Moves the mouse cursor to ``x``, ``y`` over ``duration`` seconds, awaiting the time between the steps (or between
+    the chunks of steps, where the OS can time them).
+    """
+    if duration <= 0:
+        await _call(session, pyautogui._mouseMoveDrag, "move", x, y, 0, 0, 0)
+        return
+
+    x, y, path = await _call(session, _startMove, x, y, float(duration), tween)
+    start = _clock()
+    if hasattr(pyautogui.platformModule, "_delay"):
+        previousTime = 0.0
+        for chunk in _chunkSteps(path, _MOVE_CHUNK_SECONDS):
+            await _sleepUntil(session, start + chunk[0].time, chunk[0].time - previousTime)
+            previousTime = chunk[0].time
+            await _call(session, _sendChunk, chunk, start)
+        await _sleepUntil(session, start + duration, duration - previousTime)
+    else:
+        for step, stepTime, requested in pyautogui._paceSchedule(path, duration, start, session):
+            await _sleepUntil(session, start + stepTime, requested)
+            if step is not None:
+                await _call(session, pyautogui._sendPath, "move", [step])
+    await _call(session, _finishMove, x, y)
+
+
+def _startAction(x, y):
+    """Does the fail-safe check and finds the point to move to at the start of a function. Runs in the executor."""
+    pyautogui.failSafeCheck()
+    return _normalizeXYArgs(x, y)
+
+
+async def moveTo(x=None, y=None, duration=0.0, tween=linear, logScreenshot=False, _pause=True):
+    """Works the same as ``pyautogui.moveTo()``, but awaits the steps of the movement and the pause after it."""
+    session = _session()
+    if duration <= 0 or _isServerTimed(session):
+        await _call(session, pyautogui.moveTo, x, y, duration, tween, logScreenshot, _pause=False)
+    else:
+        x, y = await _call(session, _startAction, x, y)
+        await _call(session, _logScreenshot, logScreenshot, "moveTo", "%s,%s" % (x, y), folder=".")
+        await _moveTo(session, x, y, duration, tween)
+    await _handlePause(session, _pause)
+
+
+def _clickOnce(x, y, button):
+    """Does the fail-safe check and clicks ``button`` once at ``x``, ``y``, as click() does. Runs in the executor."""
+    pyautogui.failSafeCheck()
+    if button in (LEFT, MIDDLE, RIGHT):
+        if sys.platform == "darwin":
+            pyautogui.platformModule._multiClick(x, y, button, 1)
+        else:
+            pyautogui.platformModule._click(x, y, button)
+
+
+async def click(
+    x=None, y=None, clicks=1, interval=0.0, button=PRIMARY, duration=0.0, tween=linear, logScreenshot=None, _pause=True
+):
+    """
+    Works the same as ``pyautogui.click()``, but awaits the steps of the movement to ``x``, ``y``, the ``interval``
+    between clicks, and the pause after it.
+    """
+    session = _session()
+    if (duration <= 0 and interval <= 0) or _isServerTimed(session):
+        await _call(
+            session, pyautogui.click, x, y, clicks, interval, button, duration, tween, logScreenshot, _pause=False
+        )
+    else:
+        button = await _call(session, _normalizeButton, button)
+        x, y = await _call(session, _startAction, x, y)
+        await _moveTo(session, x, y, duration, tween)
+        await _call(session, _logScreenshot, logScreenshot, "click", "%s,%s,%s,%s" % (button, clicks, x, y), ".")
+
+        timeline = pyautogui._Timeline()
+        for i in range(clicks):
+            await _call(session, _clickOnce, x, y, button)
+            await _wait(session, timeline, interval)
+    await _handlePause(session, _pause)
+
+
+def _startScroll(clicks, x, y, logScreenshot):
+    """Does the fail-safe check and finds the point to scroll at, as scroll() does. Runs in the executor."""
+    pyautogui.failSafeCheck()
+    if type(x) in (tuple, list):
+        x, y = x[0], x[1]
+    x, y = pyautogui.position(x, y)
+    _logScreenshot(logScreenshot, "scroll", "%s,%s,%s" % (clicks, x, y), folder=".")
+    return x, y
+
+
+def _scrollNotch(notch, x, y):
+    """Does the fail-safe check and scrolls one notch. Runs in the executor."""
+    pyautogui.failSafeCheck()
+    pyautogui.platformModule._scroll(notch, x, y)
+
+
+async def scroll(clicks, x=None, y=None, logScreenshot=None, _pause=True, interval=0.0):
+    """Works the same as ``pyautogui.scroll()``, but awaits the ``interval`` between notches and the pause after it."""
+    session = _session()
+    clicks = int(clicks)
+    interval = float(interval)
+    if interval <= 0 or _isServerTimed(session):
+        await _call(session, pyautogui.scroll, clicks, x, y, logScreenshot, _pause=False, interval=interval)
+    else:
+        x, y = await _call(session, _startScroll, clicks, x, y, logScreenshot)
+        timeline = pyautogui._Timeline()
+        start = _clock()
+        for i in range(abs(clicks)):
+            await _call(session, _scrollNotch, 1 if clicks > 0 else -1, x, y)
+            await _wait(session, timeline, interval)
+        session._scrollStats[0] += abs(clicks)
+        session._scrollStats[1] += _clock() - start
+    await _handlePause(session, _pause)
+
+
+async def typewrite(message, interval=0.0, logScreenshot=None, _pause=True):
+    """Works the same as ``pyautogui.typewrite()``, but awaits the ``interval`` between keys and the pause after it."""
+    session = _session()
+    interval = float(interval)
+    if interval <= 0 or _isServerTimed(session):
+        await _call(session, pyautogui.typewrite, message, interval, logScreenshot, _pause=False)
+    else:
+        await _call(session, pyautogui.failSafeCheck)
+        await _call(session, _logScreenshot, logScreenshot, "write", message, folder=".")
+        timeline = pyautogui._Timeline()
+        for c in message:
+            if len(c) > 1:
+                c = c.lower()
+            await _call(session, pyautogui.press, c, _pause=False)
+            await _wait(session, timeline, interval)
+    await _handlePause(session, _pause)
+
+
+write = typewrite
+
+
+def _releaseKeys(keys):
+    """Releases each of ``keys``, in reverse order. Runs in the executor."""
+    for c in reversed(keys):
+        pyautogui.platformModule._keyUp(c)
+
+
+async def hotkey(*args, **kwargs):
+    """
+    Works the same as ``pyautogui.hotkey()``, but awaits the ``interval`` between keys and the pause after it. If the
+    task is cancelled partway through, the keys that are down are released.
+    """
+    session = _session()
+    interval = float(kwargs.get("interval", 0.0))
+    logScreenshot = kwargs.get("logScreenshot")
+    _pause = kwargs.get("_pause", True)
+
+    if len(args) and isinstance(args[0], Sequence) and not isinstance(args[0], str):
+        # Let the user pass a list of strings
+        args = tuple(args[0])
+
+    if interval <= 0 or _isServerTimed(session):
+        await _call(session, pyautogui.hotkey, *args, interval=interval, logScreenshot=logScreenshot, _pause=False)
+    else:
+        keys = [c.lower() if len(c) > 1 else c for c in args]
+        await _call(session, pyautogui.failSafeCheck)
+        await _call(session, _logScreenshot, logScreenshot, "hotkey", ",".join(args), folder=".")
+        timeline = pyautogui._Timeline()
+        down = []
+        try:
+            for c in keys:
+                # The key is counted as down before it's pressed, since the press can still happen in the executor
+                # after the task is cancelled. Releasing a key that isn't down does nothing.
+                down.append(c)
+                await _call(session, pyautogui.platformModule._keyDown, c)
+                await _wait(session, timeline, interval)
+            while down:
+                await _call(session, pyautogui.platformModule._keyUp, down[-1])
+                down.pop()
+                await _wait(session, timeline, interval)
+        finally:
+            if down:
+                await _call(session, _releaseKeys, down)
+    await _handlePause(session, _pause)
+
+
+shortcut = hotkey
+
+
+async def locateOnScreen(image, minSearchTime=0, **kwargs):
+    """
+    Works the same as ``pyautogui.locateOnScreen()`` (or the ``locateOnScreen()`` method of the current session, for
+    a ``Controller``). Each screenshot is taken and searched in the executor, and while ``minSearchTime`` seconds
+    haven't passed, the event loop can run other tasks between tries.
+    """
+    session = _session()
+    deadline = _clock() + minSearchTime
+    while True:
+        try:
+            box = await _call(session, session.locateOnScreen, image, **kwargs)
+        except ImageNotFoundException:
+            if _clock() >= deadline:
+                raise
+        else:
+            if box is not None or _clock() >= deadline:
+                return box
+        await asyncio.sleep(0)
+
+
+async def sleep(seconds):
+    """Works the same as ``pyautogui.sleep()``, but awaits ``asyncio.sleep()``."""
+    if seconds > 0:
+        await _sleepUntil(_session(), _clock() + seconds, seconds)
+
+
+async def countdown(seconds):
+    """Works the same as ``pyautogui.countdown()``, but awaits ``asyncio.sleep()``."""
+    for i in range(seconds, 0, -1):
+        print(str(i), end=" ", flush=True)
+        await asyncio.sleep(1)
+    print()
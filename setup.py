@@ -29,8 +29,7 @@ setup(
     test_suite='tests',
     install_requires=['pyobjc-core;platform_system=="Darwin"',
                       'pyobjc-framework-quartz;platform_system=="Darwin"',
-                      'python3-Xlib;platform_system=="Linux" and python_version>="3.0"',
-                      'python-xlib;platform_system=="Linux" and python_version<"3.0"',
+                      'python-xlib>=0.16;platform_system=="Linux"',
                       'pymsgbox',
                       'pytweening>=1.0.4',
                       'pyscreeze>=0.1.21',
@@ -89,6 +89,132 @@ class P(namedtuple("P", ["x", "y"])):
         return P(abs(self.x), abs(self.y))
 
 
+class _FakeXObject(object):
+    """A bag of attributes, for the reply objects of FakeXDisplay."""
+
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+class _FakeProtocolDisplay(object):
+    """The protocol-level display of a FakeXDisplay, which python-xlib's request classes are sent through."""
+
+    XINPUT_OPCODE = 131
+
+    def __init__(self, display):
+        self._display = display
+
+    def get_extension_major(self, extname):
+        return self.XINPUT_OPCODE
+
+    def send_request(self, request, waitForResponse):
+        self._display.requests.append(bytes(request._binary))
+        self._display._handleRequest(bytearray(request._binary))
+
+
+class FakeXDisplay(object):
+    """
+    Stands in for an Xlib.display.Display in TestX11Backend, so that the input PyAutoGUI sends to the X server can be
+    checked without an X server. It records the XTest events in ``events`` and the round trips in ``syncs`` (with
+    the number of events sent before each one in ``syncedAt``). Like python-xlib's display, the protocol-level
+    methods, such as ``get_extension_major()``, are only on its ``display`` attribute.
+    """
+
+    def __init__(self, name=None):
+        self.name = name or ":99"
+        self.display = _FakeProtocolDisplay(self)
+        self.extensions = set()
+        self.events = []  # An (event type, detail, x, y) tuple for each XTest event.
+        self.eventDelays = []  # The XTest delay of each event, in milliseconds.
+        self.syncs = 0
+        self.syncedAt = []
+        self.flushes = 0
+        self.pointer = [500, 500]
+        self.pointerMapping = [1, 2, 3, 4, 5, 6, 7]
+        self.pointerMappingRequests = 0
+        self.keycodeLookups = 0
+        self.queuedEvents = []  # The events for pending_events() and next_event() to return.
+        self.requests = []  # The XInput requests sent through the protocol display.
+        self.masterDevices = []  # The (device ID, name) of each XInput2 master pointer.
+        self.clientPointer = None
+        self.closed = False
+
+        root = _FakeXObject(query_pointer=self._queryPointer)
+        self._screen = _FakeXObject(width_in_pixels=1000, height_in_pixels=800, root=root)
+
+    def _queryPointer(self):
+        return _FakeXObject(_data={"root_x": self.pointer[0], "root_y": self.pointer[1]})
+
+    def _handleRequest(self, binary):
+        import struct
+
+        minorOpcode = binary[1]
+        if minorOpcode == 43 and struct.unpack("=H", bytes(binary[8:10]))[0] == 1:  # XIChangeHierarchy, XIAddMaster
+            nameLength = struct.unpack("=H", bytes(binary[12:14]))[0]
+            name = bytes(binary[16 : 16 + nameLength]).decode("ascii")
+            self.masterDevices.append((100 + len(self.requests), name + " pointer"))
+        elif minorOpcode == 43:  # XIChangeHierarchy, XIRemoveMaster
+            deviceid = struct.unpack("=H", bytes(binary[12:14]))[0]
+            self.masterDevices = [device for device in self.masterDevices if device[0] != deviceid]
+        elif minorOpcode == 44:  # XISetClientPointer
+            self.clientPointer = struct.unpack("=H", bytes(binary[8:10]))[0]
+
+    def get_display_name(self):
+        return self.name
+
+    def screen(self):
+        return self._screen
+
+    def has_extension(self, name):
+        return name in self.extensions
+
+    def keysym_to_keycode(self, keysym):
+        self.keycodeLookups += 1
+        return keysym % 200 + 8 if keysym else 0
+
+    def refresh_keyboard_mapping(self, event):
+        pass
+
+    def get_pointer_mapping(self):
+        self.pointerMappingRequests += 1
+        return list(self.pointerMapping)
+
+    def xinput_query_version(self):
+        return _FakeXObject(major_version=2, minor_version=0)
+
+    def xinput_query_device(self, deviceid):
+        devices = [_FakeXObject(deviceid=2, name="Virtual core pointer", use=1)]
+        for masterid, name in self.masterDevices:
+            devices.append(_FakeXObject(deviceid=masterid, name=name, use=1))
+        return _FakeXObject(devices=devices)
+
+    def pending_events(self):
+        return len(self.queuedEvents)
+
+    def next_event(self):
+        return self.queuedEvents.pop(0)
+
+    def sync(self):
+        self.syncs += 1
+        self.syncedAt.append(len(self.events))
+
+    def flush(self):
+        self.flushes += 1
+
+    def close(self):
+        self.closed = True
+
+    def fakeInput(self, eventType, detail=0, time=0, root=0, x=0, y=0):
+        from Xlib import X
+
+        self.events.append((eventType, detail, x, y))
+        self.eventDelays.append(time)
+        if eventType == X.MotionNotify and detail:
+            self.pointer = [self.pointer[0] + x, self.pointer[1] + y]
+        elif eventType == X.MotionNotify:
+            self.pointer = [x, y]
+
+
 class TestGeneral(unittest.TestCase):
     def setUp(self):
         self.oldFailsafeSetting = pyautogui.FAILSAFE
@@ -255,6 +381,44 @@ class TestGeneral(unittest.TestCase):
 
         pyautogui.PAUSE = oldValue  # restore the old PAUSE value
 
+    def test_timingStats(self):
+        pyautogui.resetTimingStats()
+        self.assertEqual(pyautogui.getTimingStats(), (0, 0.0, 0.0, 0.0, 0))
+
+        startTime = time.time()
+        pyautogui.press("shift", presses=10, interval=0.05, _pause=False)
+        elapsed = time.time() - startTime
+        self.assertTrue(0.5 <= elapsed < 0.55, "Took %s seconds, expected 0.5 < 0.55 seconds." % (elapsed))
+
+        stats = pyautogui.getTimingStats()
+        self.assertEqual(stats.waits, 10)
+        self.assertAlmostEqual(stats.requested, 0.5)
+        self.assertTrue(stats.maxLateness <= stats.lateness)
+
+        pyautogui.resetTimingStats()
+        self.assertEqual(pyautogui.getTimingStats().waits, 0)
+
+    @unittest.skipIf(sys.version_info[0:2] < (3, 7), "Lazy loading needs module __getattr__().")
+    def test_lazyImports(self):
+        # Importing pyautogui shouldn't import its optional dependencies.
+        import subprocess
+
+        script = "import sys, pyautogui; print(sorted(sys.modules))"
+        output = subprocess.check_output([sys.executable, "-c", script], universal_newlines=True)
+        for moduleName in ("pyscreeze", "PIL", "pymsgbox", "pytweening", "mouseinfo"):
+            self.assertNotIn("'%s'" % (moduleName), output)
+
+        # They're loaded when they're first used.
+        self.assertTrue(callable(pyautogui.easeInQuad))
+        self.assertIn("pytweening", sys.modules)
+
+    def test_all(self):
+        # Everything "from pyautogui import *" imports exists, and it doesn't import any modules.
+        for name in pyautogui.__all__:
+            self.assertTrue(hasattr(pyautogui, name), name)
+            self.assertNotIsInstance(getattr(pyautogui, name), type(sys), name)
+        self.assertEqual(len(pyautogui.__all__), len(set(pyautogui.__all__)))
+
 
 class TestHelperFunctions(unittest.TestCase):
     def test__normalizeXYArgs(self):
@@ -268,6 +432,73 @@ class TestHelperFunctions(unittest.TestCase):
         pyautogui.useImageNotFoundException(False)
         self.assertEqual(pyautogui._normalizeXYArgs("100x100blueimage.png", None), None)
 
+    def test__normalizeButton(self):
+        self.assertEqual(pyautogui._normalizeButton("LEFT"), pyautogui.LEFT)
+        self.assertEqual(pyautogui._normalizeButton(1), pyautogui.LEFT)
+        self.assertEqual(pyautogui._normalizeButton(3), pyautogui.RIGHT)
+        self.assertIn(pyautogui._normalizeButton(pyautogui.PRIMARY), (pyautogui.LEFT, pyautogui.RIGHT))
+        self.assertNotEqual(
+            pyautogui._normalizeButton(pyautogui.PRIMARY), pyautogui._normalizeButton(pyautogui.SECONDARY)
+        )
+        self.assertRaises(pyautogui.PyAutoGUIException, pyautogui._normalizeButton, "sideways")
+        self.assertRaises(pyautogui.PyAutoGUIException, pyautogui._normalizeButton, 8)
+        self.assertRaises(pyautogui.PyAutoGUIException, pyautogui._normalizeButton, None)
+
+    def test_iterPath(self):
+        # The NumPy and pure Python versions must find the same steps.
+        origin = (10, 20)
+        destination = (310, 170)
+        for tweenName in ("linear", "easeInOutQuad", "easeOutElastic", "easeInOutBounce"):
+            tweenFunc = getattr(pyautogui, tweenName)
+            try:
+                pyautogui.USE_NUMPY = False
+                pyautogui.clearPathCache()
+                expected = list(pyautogui.iterPath(*origin + destination + (0.5, tweenFunc)))
+            finally:
+                pyautogui.USE_NUMPY = True
+            pyautogui.clearPathCache()
+            path = list(pyautogui.iterPath(*origin + destination + (0.5, tweenFunc)))
+            self.assertEqual(path, expected)
+
+            points = [(step.x, step.y) for step in path]
+            self.assertEqual(points[-1], destination)
+            self.assertNotEqual(points[0], origin)
+            self.assertTrue(all(a != b for a, b in zip(points, points[1:])))
+            self.assertTrue(all(a.time < b.time for a, b in zip(path, path[1:])))
+
+        # The steps are worked out as they're needed.
+        path = pyautogui.iterPath(0, 0, 1000, 1000, 1000.0)
+        self.assertEqual(next(path).time, next(pyautogui.iterPath(0, 0, 1000, 1000, 1000.0)).time)
+
+        # A short movement has a step for each pixel, not for each frame.
+        path = list(pyautogui.iterPath(0, 0, 5, -2, 0.5))
+        self.assertEqual([step.x for step in path], [1, 2, 3, 4, 5])
+        self.assertEqual([round(step.time, 6) for step in path], [0.1, 0.2, 0.3, 0.4, 0.5])
+
+    def test_pathCache(self):
+        pyautogui.clearPathCache()
+        self.assertEqual(pyautogui.getPathCacheInfo(), (0, 0, 0, 0))
+
+        # The same movement from somewhere else uses the cached path.
+        path = list(pyautogui.iterPath(10, 20, 310, 170, 0.5, pyautogui.easeInOutQuad))
+        movedPath = list(pyautogui.iterPath(110, 120, 410, 270, 0.5, pyautogui.easeInOutQuad))
+        self.assertEqual([(step.x + 100, step.y + 100, step.time) for step in path], movedPath)
+        self.assertEqual(pyautogui.getPathCacheInfo()[:3], (1, 1, 1))
+
+        # Custom tween functions aren't cached.
+        list(pyautogui.iterPath(10, 20, 310, 170, 0.5, lambda n: n))
+        self.assertEqual(pyautogui.getPathCacheInfo()[:3], (1, 1, 1))
+
+        # The least recently used paths are thrown out to stay under the memory limit.
+        oldMaxBytes = pyautogui.PATH_CACHE_MAX_BYTES
+        try:
+            pyautogui.PATH_CACHE_MAX_BYTES = pyautogui.getPathCacheInfo().bytes
+            list(pyautogui.iterPath(0, 0, 300, 0, 0.5))
+            self.assertTrue(pyautogui.getPathCacheInfo().bytes <= pyautogui.PATH_CACHE_MAX_BYTES)
+        finally:
+            pyautogui.PATH_CACHE_MAX_BYTES = oldMaxBytes
+        pyautogui.clearPathCache()
+
 
 class TestDoctests(unittest.TestCase):
     def test_doctests(self):
@@ -361,6 +592,90 @@ class TestMouse(unittest.TestCase):
                 "%s tween move failed. mousepos set to %s instead of %s" % (tweenName, mousepos, destination),
             )
 
+    def test_moveToDuration(self):
+        # Tweened movements should take as long as asked, even when moving the cursor can't keep up with FRAME_RATE.
+        for frameRate in (60, 1000):
+            with pyautogui.Session(FRAME_RATE=frameRate, PAUSE=0):
+                pyautogui.moveTo(*(self.center - P(100, 100)))
+                startTime = time.time()
+                pyautogui.moveTo(*(self.center + P(100, 100)), duration=0.5)
+                elapsed = time.time() - startTime
+                self.assertTrue(0.5 <= elapsed < 0.55, "Took %s seconds, expected 0.5 < 0.55 seconds." % (elapsed))
+                self.assertEqual(P(*pyautogui.position()), self.center + P(100, 100))
+
+    @unittest.skipIf(not sys.platform.startswith("linux"), "SERVER_TIMING is only supported on Linux.")
+    def test_moveToServerTiming(self):
+        with pyautogui.Session(SERVER_TIMING=True, PAUSE=0):
+            pyautogui.moveTo(*(self.center - P(100, 100)))
+            startTime = time.time()
+            pyautogui.moveTo(*(self.center + P(100, 100)), duration=0.5)
+            self.assertTrue(time.time() - startTime < 0.25, "moveTo() waited for the X server to play the movement.")
+
+            # Asking for the position waits for the X server to finish the movement.
+            self.assertEqual(P(*pyautogui.position()), self.center + P(100, 100))
+            elapsed = time.time() - startTime
+            self.assertTrue(0.5 <= elapsed < 0.55, "Took %s seconds, expected 0.5 < 0.55 seconds." % (elapsed))
+
+    def test_nudge(self):
+        pyautogui.moveTo(*self.center)
+        pyautogui.nudge(10, -5)
+        self.assertEqual(P(*pyautogui.position()), self.center + P(10, -5))
+
+        pyautogui.nudge(-30, 20, duration=pyautogui.MINIMUM_DURATION * 2, tween=pyautogui.easeInOutQuad)
+        self.assertEqual(P(*pyautogui.position()), self.center + P(-20, 15))
+
+        pyautogui.nudge(0, 0)
+        self.assertEqual(P(*pyautogui.position()), self.center + P(-20, 15))
+
+    def test_moveThrough(self):
+        square = [self.center + P(100, 0), self.center + P(100, 100), self.center + P(0, 100), self.center]
+        for curve in (pyautogui.LINEAR_CURVE, pyautogui.CATMULL_ROM_CURVE):
+            pyautogui.moveTo(*self.center)
+            pyautogui.moveThrough(square, duration=pyautogui.MINIMUM_DURATION * 2, curve=curve)
+            self.assertEqual(P(*pyautogui.position()), self.center)
+
+            pyautogui.moveThrough(square[:2], curve=curve)
+            self.assertEqual(P(*pyautogui.position()), square[1])
+
+        # Each bezier curve is two control points and an end point.
+        pyautogui.moveTo(*self.center)
+        pyautogui.moveThrough(square[:3], duration=pyautogui.MINIMUM_DURATION * 2, curve=pyautogui.BEZIER_CURVE)
+        self.assertEqual(P(*pyautogui.position()), square[2])
+        with self.assertRaises(pyautogui.PyAutoGUIException):
+            pyautogui.moveThrough(square, curve=pyautogui.BEZIER_CURVE)
+        with self.assertRaises(pyautogui.PyAutoGUIException):
+            pyautogui.moveThrough(square, curve="spline")
+
+    def test_moveToNonBlocking(self):
+        startTime = time.time()
+        motion = pyautogui.moveTo(self.center.x + 200, self.center.y, duration=1.0, block=False)
+        self.assertTrue(time.time() - startTime < 0.1)
+        time.sleep(0.5)
+        self.assertTrue(0.3 < motion.progress < 0.7, "Progress was %s" % (motion.progress))
+        motion.cancel()
+        self.assertTrue(motion.join(1))
+        self.assertTrue(motion.cancelled)
+        stopped = P(*pyautogui.position())
+        self.assertTrue(self.center.x < stopped.x < self.center.x + 200)
+
+        # Movements are made in the order they were started.
+        pyautogui.moveRel(0, 10, duration=0.2, block=False)
+        motion = pyautogui.moveRel(10, 0, block=False)
+        self.assertTrue(motion.join(1))
+        self.assertEqual(motion.progress, 1.0)
+        self.assertFalse(motion.cancelled)
+        self.assertEqual(P(*pyautogui.position()), stopped + P(10, 10))
+
+    def test_positionTracking(self):
+        for policy in (pyautogui.VALIDATE_POSITION, pyautogui.TRUST_POSITION):
+            with pyautogui.Session(POSITION_TRACKING=policy, PAUSE=0):
+                pyautogui.moveTo(*self.center)
+                self.assertEqual(P(*pyautogui.position()), self.center)
+                pyautogui.moveRel(10, 20)
+                pyautogui.nudge(5, -5)
+                self.assertEqual(P(*pyautogui.position()), self.center + P(15, 15))
+                self.assertEqual(P(*pyautogui.platformModule._position()), self.center + P(15, 15))
+
     def test_moveRel(self):
         # start at the center
         desired = self.center
@@ -452,6 +767,50 @@ class TestMouse(unittest.TestCase):
         pyautogui.vscroll(1)
         pyautogui.vscroll(-1)
 
+    def test_scrollInterval(self):
+        with pyautogui.Session(PAUSE=0):
+            pyautogui.resetTimingStats()
+            startTime = time.time()
+            pyautogui.scroll(-5, interval=0.1)
+            pyautogui.scroll(5, interval=0.1)
+            elapsed = time.time() - startTime
+            self.assertTrue(1.0 <= elapsed < 1.1, "Took %s seconds, expected 1.0 < 1.1 seconds." % (elapsed))
+
+            stats = pyautogui.getScrollStats()
+            self.assertEqual(stats.notches, 10)
+            self.assertTrue(9 < stats.notchesPerSecond <= 10, "Scrolled %s notches per second" % (stats.notchesPerSecond))
+
+    def test_drag(self):
+        self.assertRaises(pyautogui.PyAutoGUIException, pyautogui.Drag, button="sideways")
+        self.assertRaises(pyautogui.PyAutoGUIException, pyautogui.Drag, button=[])
+
+        # The buttons aren't pressed until the drag starts.
+        drag = pyautogui.Drag(button=[pyautogui.LEFT, pyautogui.RIGHT])
+        self.assertFalse(drag.held)
+        self.assertRaises(pyautogui.PyAutoGUIException, drag.moveTo, 100, 100)
+        self.assertRaises(pyautogui.PyAutoGUIException, drag.hover, 0.1)
+
+    def test_firstTweenedMove(self):
+        # The first tweened movement in a new process imports NumPy before its clock starts, so it doesn't fall behind
+        # and drop frames.
+        import subprocess
+
+        script = (
+            "import pyautogui; pyautogui.FAILSAFE = False; pyautogui.moveTo(%d, %d); pyautogui.resetTimingStats(); "
+            "pyautogui.moveTo(%d, %d, duration=0.3, _pause=False); print(pyautogui.getTimingStats().droppedFrames)"
+        ) % (self.center.x, self.center.y, self.center.x + 100, self.center.y + 100)
+        output = subprocess.check_output([sys.executable, "-c", script], universal_newlines=True)
+        self.assertEqual(int(output), 0)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "Motion events are only left out on Linux.")
+    def test_motionStats(self):
+        with pyautogui.Session(PAUSE=0, POSITION_TRACKING=pyautogui.QUERY_POSITION):
+            pyautogui.moveTo(100, 100)
+            pyautogui.resetTimingStats()
+            pyautogui.moveTo(100, 100)  # The mouse cursor is already here.
+            pyautogui.scroll(1, 100, 100)
+            pyautogui.moveTo(200, 200)
+            self.assertEqual(pyautogui.getMotionStats(), (1, 2))
 
     def test_mouse_button_swap(self):
         pass  # TODO - I'm not even sure how I could test this in an automated way. We'd need a separate GUI app.
@@ -620,6 +979,527 @@ class TestRun(unittest.TestCase):
         # TODO add mocks for pyautogui for this.
 
 
+class TestActionPlan(unittest.TestCase):
+    def setUp(self):
+        self.oldFailsafeSetting = pyautogui.FAILSAFE
+        self.center = P(*pyautogui.size()) // 2
+
+        pyautogui.FAILSAFE = False
+        pyautogui.moveTo(*self.center)  # make sure failsafe isn't triggered during this test
+        pyautogui.FAILSAFE = True
+
+    def tearDown(self):
+        pyautogui.FAILSAFE = self.oldFailsafeSetting
+
+    def test_compilePlan(self):
+        self.assertEqual(len(pyautogui.compilePlan("")), 0)
+
+        plan = pyautogui.compilePlan("g%s,%s p0 g+42,+42" % tuple(self.center))
+        plan.run()
+        self.assertEqual(P(*pyautogui.position()), self.center + P(42, 42))
+
+        # Running the same plan again gives the same result, and offsets only apply to absolute coordinates.
+        plan.run(xOffset=10, yOffset=-10)
+        self.assertEqual(P(*pyautogui.position()), self.center + P(52, 32))
+
+        with self.assertRaises(pyautogui.PyAutoGUIException):
+            pyautogui.compilePlan("g100")
+
+    def test_run(self):
+        plan = pyautogui.ActionPlan(pause=0)
+        self.assertIs(plan.moveTo(*self.center), plan)
+        plan.moveRel(0, 42).moveTo(None, self.center.y, duration=pyautogui.MINIMUM_DURATION * 2)
+        plan.run()
+        self.assertEqual(P(*pyautogui.position()), self.center)
+
+
+class TestSession(unittest.TestCase):
+    def setUp(self):
+        self.oldFailsafeSetting = pyautogui.FAILSAFE
+        self.center = P(*pyautogui.size()) // 2
+
+        pyautogui.FAILSAFE = False
+        pyautogui.moveTo(*self.center)  # make sure failsafe isn't triggered during this test
+        pyautogui.FAILSAFE = True
+
+    def tearDown(self):
+        pyautogui.FAILSAFE = self.oldFailsafeSetting
+
+    def test_settings(self):
+        session = pyautogui.Session(PAUSE=0.25)
+        try:
+            self.assertEqual(session.PAUSE, 0.25)
+            self.assertEqual(session.FAILSAFE, pyautogui.FAILSAFE)
+            self.assertEqual(session.FAILSAFE_POINTS, pyautogui.FAILSAFE_POINTS)
+            self.assertIsNot(session.FAILSAFE_POINTS, pyautogui.FAILSAFE_POINTS)
+
+            # The p command in run() only changes the session's PAUSE, and is undone afterwards.
+            oldPause = pyautogui.PAUSE
+            session.run("p0.5 g+1,+1")
+            self.assertEqual(session.PAUSE, 0.25)
+            self.assertEqual(pyautogui.PAUSE, oldPause)
+
+            with self.assertRaises(TypeError):
+                pyautogui.Session(pause=0.25)
+            with self.assertRaises(TypeError):
+                pyautogui.Session(MINIMUM_DURATION=0.25)  # No longer used, so sessions don't have their own.
+        finally:
+            session.close()
+
+    def test_methods(self):
+        session = pyautogui.Session(PAUSE=0)
+        try:
+            session.moveTo(self.center.x + 10, self.center.y)
+            self.assertEqual(P(*session.position()), self.center + P(10, 0))
+
+            with session:
+                pyautogui.moveRel(0, 10)
+                self.assertEqual(pyautogui.getTimingStats().waits, 0)  # The session has no pauses.
+            self.assertEqual(P(*pyautogui.position()), self.center + P(10, 10))
+        finally:
+            session.close()
+
+    def test_screenSizeChanged(self):
+        width, height = pyautogui.size()
+        session = pyautogui.Session(FAILSAFE_POINTS=[(0, 0), (width - 1, height - 1), (5, 5)])
+        try:
+            # The corners of the old screen become the corners of the new one. Other points are left alone.
+            session._screenSizeChanged((width, height), (640, 480))
+            self.assertEqual(session.FAILSAFE_POINTS, [(0, 0), (639, 479), (5, 5)])
+        finally:
+            session.close()
+
+    def test_threads(self):
+        # Sessions on different threads don't share their PAUSE settings.
+        def worker(pause, results):
+            session = pyautogui.Session(PAUSE=pause, FAILSAFE=False)
+            startTime = time.time()
+            for i in range(4):
+                session.moveTo(*self.center)
+            results.append(time.time() - startTime)
+            session.close()
+
+        slowResults, fastResults = [], []
+        threads = [
+            threading.Thread(target=worker, args=(0.2, slowResults)),
+            threading.Thread(target=worker, args=(0, fastResults)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(0.8 <= slowResults[0] < 1.0, "Took %s seconds" % (slowResults[0]))
+        self.assertTrue(fastResults[0] < 0.5, "Took %s seconds" % (fastResults[0]))
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "Sessions with their own mouse cursor need Linux.")
+    def test_ownPointer(self):
+        # A session with its own mouse cursor doesn't move the default session's mouse cursor.
+        session = pyautogui.Session(ownPointer=True, PAUSE=0, FAILSAFE=False)
+        try:
+            try:
+                session.moveTo(100, 100)
+            except pyautogui.PyAutoGUIException:
+                self.skipTest("The X server or python-xlib doesn't support XInput2.")
+            masterPointer = session._getConnection().masterPointer
+            self.assertIn(masterPointer, self._masterPointers())
+            pyautogui.moveTo(*self.center)
+            self.assertEqual(tuple(session.position()), (100, 100))
+            self.assertEqual(tuple(pyautogui.position()), tuple(self.center))
+        finally:
+            session.close()
+        self.assertNotIn(masterPointer, self._masterPointers())  # Closing the session removes its devices.
+
+    def _masterPointers(self):
+        from Xlib.display import Display
+        from Xlib.ext import xinput
+
+        display = Display()
+        try:
+            devices = display.xinput_query_device(xinput.AllMasterDevices).devices
+            return [device.deviceid for device in devices if device.use == xinput.MasterPointer]
+        finally:
+            display.close()
+
+
+class TestController(unittest.TestCase):
+    @unittest.skipUnless(sys.platform.startswith("linux"), "Controlling other displays is only supported on Linux.")
+    def test_controller(self):
+        # Controlling the same display as DISPLAY through a Controller works the same as the module-level functions.
+        controller = pyautogui.Controller(display=os.environ.get("DISPLAY"), PAUSE=0, FAILSAFE=False)
+        try:
+            width, height = pyautogui.size()
+            self.assertEqual(controller.size(), (width, height))
+            self.assertEqual(
+                sorted(controller.FAILSAFE_POINTS), [(0, 0), (0, height - 1), (width - 1, 0), (width - 1, height - 1)]
+            )
+
+            controller.moveTo(width // 2, height // 2)
+            self.assertEqual(tuple(pyautogui.position()), (width // 2, height // 2))
+        finally:
+            controller.close()
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "The X11 backend is only used on Linux.")
+class TestX11Backend(unittest.TestCase):
+    """Tests of the events and round trips the X11 backend sends, using a FakeXDisplay instead of an X server."""
+
+    def setUp(self):
+        import Xlib.display
+
+        x11 = pyautogui._pyautogui_x11
+        # Loading FAILSAFE_POINTS opens the default session's connection, which has to be to the real display.
+        pyautogui._lazyGlobal("FAILSAFE_POINTS")
+        self.oldDisplay = Xlib.display.Display
+        self.oldFakeInput = x11.fake_input
+
+        def fakeInput(display, *args, **kwargs):
+            if isinstance(display, FakeXDisplay):
+                return display.fakeInput(*args, **kwargs)
+            return self.oldFakeInput(display, *args, **kwargs)
+
+        Xlib.display.Display = FakeXDisplay
+        x11.fake_input = fakeInput
+        self.session = pyautogui.Session(PAUSE=0, FAILSAFE=False, POSITION_TRACKING=pyautogui.QUERY_POSITION)
+        self.display = self.session._getConnection().display
+        self.assertIsInstance(self.display, FakeXDisplay)
+
+    def tearDown(self):
+        import Xlib.display
+
+        self.session.close()
+        Xlib.display.Display = self.oldDisplay
+        pyautogui._pyautogui_x11.fake_input = self.oldFakeInput
+
+    def test_clickSyncsOnce(self):
+        from Xlib import X
+
+        self.session.click(100, 200)
+        self.assertEqual(self.display.syncs, 1)
+        self.assertEqual(
+            [event[0] for event in self.display.events], [X.MotionNotify, X.ButtonPress, X.ButtonRelease]
+        )
+
+    def test_maxBatchedEvents(self):
+        # A press and a release for each character, with a sync every MAX_BATCHED_EVENTS events and one at the end.
+        self.session.typewrite("a" * 100)
+        self.assertEqual(len(self.display.events), 200)
+        batchSize = pyautogui.MAX_BATCHED_EVENTS
+        self.assertEqual(self.display.syncedAt, list(range(batchSize, 200, batchSize)) + [200])
+
+        # Inside of batch(), the sync waits for the end of the batch.
+        self.display.syncedAt = []
+        with self.session.batch():
+            self.session.click(100, 200)
+            self.session.click(300, 400)
+            self.assertEqual(self.display.syncedAt, [])
+        self.assertEqual(self.display.syncedAt, [206])
+
+    def test_keyboardMapping(self):
+        from Xlib import X
+
+        keyboardMapping = self.session._getConnection().keyboardMapping
+        self.assertEqual(self.display.keycodeLookups, 0)  # Nothing is looked up until it's needed.
+        self.session.press("a")
+        lookups = self.display.keycodeLookups
+        self.assertTrue(lookups > 0)
+        self.session.press("a")
+        self.assertEqual(self.display.keycodeLookups, lookups)
+
+        # After the X server's keyboard mapping changes, the keys are looked up again.
+        self.display.queuedEvents.append(_FakeXObject(type=X.MappingNotify, request=X.MappingKeyboard))
+        self.session.press("b")
+        lookups = self.display.keycodeLookups
+        self.session.press("a")
+        self.assertTrue(self.display.keycodeLookups > lookups)
+
+        # Iterating over the mapping gives every key, including the ones that haven't been used.
+        self.assertTrue(set(pyautogui.KEY_NAMES) <= set(keyboardMapping))
+        self.assertEqual(len(keyboardMapping), len(list(keyboardMapping)))
+        self.assertIn("z", keyboardMapping)
+        self.assertNotIn("notakey", keyboardMapping)
+
+    def test_pointerMapping(self):
+        from Xlib import X
+
+        self.session.click(button=pyautogui.PRIMARY)
+        self.session.click(button=pyautogui.PRIMARY)
+        self.assertEqual(self.display.pointerMappingRequests, 1)  # The mapping is only looked up once.
+        self.assertEqual([e[1] for e in self.display.events if e[0] == X.ButtonPress], [1, 1])
+
+        # The buttons are swapped for left-handed use. The MappingNotify event is handled after the next sync.
+        self.display.pointerMapping = [3, 2, 1, 4, 5, 6, 7]
+        self.display.queuedEvents.append(_FakeXObject(type=X.MappingNotify, request=X.MappingPointer))
+        self.session.moveTo(10, 10)
+        del self.display.events[:]
+        self.session.click(button=pyautogui.PRIMARY)
+        self.assertEqual(self.display.pointerMappingRequests, 2)
+        self.assertEqual([e[1] for e in self.display.events if e[0] == X.ButtonPress], [3])
+        self.session.click(button=pyautogui.SECONDARY)
+        self.assertEqual([e[1] for e in self.display.events if e[0] == X.ButtonPress], [3, 1])
+        self.assertEqual(self.display.pointerMappingRequests, 2)
+
+    def test_serverTimingMotion(self):
+        # The inner batches that SERVER_TIMING opens don't make the X server forget where the mouse cursor was put.
+        from Xlib import X
+
+        self.session.SERVER_TIMING = True
+        self.session.click(100, 200)
+        self.assertEqual([e[0] for e in self.display.events], [X.MotionNotify, X.ButtonPress, X.ButtonRelease])
+        del self.display.events[:]
+        self.session.doubleClick(300, 400)
+        self.assertEqual([e[0] for e in self.display.events].count(X.MotionNotify), 1)
+
+    def test_drag(self):
+        from Xlib import X
+
+        with self.session:
+            with pyautogui.Drag(100, 200) as drag:
+                self.assertTrue(drag.held)
+                self.assertEqual(self.display.events[-1][:2], (X.ButtonPress, 1))
+                del self.display.events[:]
+                drag.moveTo(300, 400)  # The button is still down, so this drags.
+                drag.moveRel(10, 0)
+            self.assertFalse(drag.held)
+            self.assertEqual(
+                self.display.events,
+                [(X.MotionNotify, 0, 300, 400), (X.MotionNotify, 0, 310, 400), (X.ButtonRelease, 1, 0, 0)],
+            )
+
+            # A chord's buttons are pressed in order and released in the reverse order.
+            del self.display.events[:]
+            with pyautogui.Drag(button=[pyautogui.LEFT, pyautogui.RIGHT]):
+                pass
+            self.assertEqual(
+                [e[:2] for e in self.display.events if e[0] in (X.ButtonPress, X.ButtonRelease)],
+                [(X.ButtonPress, 1), (X.ButtonPress, 3), (X.ButtonRelease, 3), (X.ButtonRelease, 1)],
+            )
+
+            # The buttons are released even when the fail-safe stops the drag.
+            self.session.FAILSAFE = True
+            self.session.FAILSAFE_POINTS = [(0, 0)]
+            del self.display.events[:]
+            with self.assertRaises(pyautogui.FailSafeException):
+                with pyautogui.Drag(100, 200, button=[pyautogui.LEFT, pyautogui.MIDDLE]) as drag:
+                    self.display.pointer = [0, 0]  # The user moves the mouse cursor into the corner.
+                    drag.moveTo(300, 400, duration=0.1)
+            self.assertFalse(drag.held)
+            self.assertEqual(
+                [e[:2] for e in self.display.events if e[0] != X.MotionNotify],
+                [(X.ButtonPress, 1), (X.ButtonPress, 2), (X.ButtonRelease, 2), (X.ButtonRelease, 1)],
+            )
+
+    def test_ownPointer(self):
+        from Xlib import X
+        import Xlib.display
+
+        # Without XInput2, a session can't have its own mouse cursor.
+        session = pyautogui.Session(ownPointer=True, PAUSE=0, FAILSAFE=False)
+        self.assertRaises(pyautogui.PyAutoGUIException, session.moveTo, 100, 200)
+        session.close()
+
+        if pyautogui._pyautogui_x11.xinput is None:
+            self.skipTest("This version of python-xlib doesn't support XInput2.")
+
+        class XInputDisplay(FakeXDisplay):
+            def __init__(self, name=None):
+                FakeXDisplay.__init__(self, name)
+                self.extensions.add("XInputExtension")
+
+        Xlib.display.Display = XInputDisplay
+        session = pyautogui.Session(ownPointer=True, PAUSE=0, FAILSAFE=False)
+        try:
+            display = session._getConnection().display
+            self.assertEqual(len(display.masterDevices), 1)
+            masterPointer, name = display.masterDevices[0]
+            self.assertTrue(name.startswith("PyAutoGUI "))
+            self.assertEqual(display.clientPointer, masterPointer)  # The session's events go through its master.
+            session.click(100, 200)
+            self.assertEqual([e[0] for e in display.events], [X.MotionNotify, X.ButtonPress, X.ButtonRelease])
+
+            # The input thread's connection uses the same master pointer.
+            session.moveTo(300, 400, block=False).join()
+            inputDisplay = session._inputThread.connection.display
+            self.assertEqual(inputDisplay.clientPointer, masterPointer)
+            self.assertEqual(inputDisplay.masterDevices, [])
+        finally:
+            session.close()
+        self.assertEqual(display.masterDevices, [])
+        self.assertTrue(display.closed)
+
+    def test_nonBlockingMotion(self):
+        # A Motion is made on the input thread's own connection, so the session can be used while it's running.
+        from Xlib import X
+
+        motion = self.session.moveTo(300, 400, duration=0.2, block=False)
+        positions = []
+        while not motion.done:
+            positions.append(self.session.position())
+        self.assertTrue(motion.join())
+        self.assertTrue(positions)
+
+        inputDisplay = self.session._inputThread.connection.display
+        self.assertIsNot(inputDisplay, self.display)
+        self.assertEqual(inputDisplay.pointer, [300, 400])
+        self.assertTrue(all(e[0] == X.MotionNotify for e in inputDisplay.events))
+        self.assertEqual(self.display.events, [])
+        self.session.close()
+        self.assertTrue(inputDisplay.closed)
+
+    def test_watchPointerQueuedEvents(self):
+        # A raw motion event that arrives along with a QueryPointer reply is read into python-xlib's queue, so the
+        # socket isn't readable for it. The fail-safe watcher still has to query the new position.
+        import Xlib.display
+
+        x11 = pyautogui._pyautogui_x11
+        display = FakeXDisplay()
+        display.extensions.add("XInputExtension")
+        root = display.screen().root
+        root.xinput_select_events = lambda masks: None
+        stopEvent = threading.Event()
+        positions = []
+        selects = []
+
+        def queryPointer():
+            reply = display._queryPointer()
+            if not positions:
+                display.queuedEvents.append(_FakeXObject(type=35))  # A GenericEvent.
+                display.pointer = [0, 0]  # The mouse cursor was moved into the corner.
+            return reply
+
+        def select(readers, writers, errors, timeout):
+            selects.append(timeout)
+            if len(selects) > 2:
+                stopEvent.set()
+            return [], [], []
+
+        def callback(x, y):
+            positions.append((x, y))
+            if (x, y) == (0, 0):
+                stopEvent.set()
+
+        root.query_pointer = queryPointer
+        oldXInput, oldSelect = x11.xinput, x11.select
+        Xlib.display.Display = lambda name=None: display
+        x11.xinput = _FakeXObject(AllMasterDevices=1, RawMotionMask=1 << 17)
+        x11.select = _FakeXObject(select=select)
+        try:
+            with self.session:
+                x11._watchPointer(callback, stopEvent)
+        finally:
+            x11.xinput, x11.select = oldXInput, oldSelect
+        self.assertEqual(positions, [(500, 500), (0, 0)])
+        self.assertEqual(selects, [])
+        self.assertTrue(display.closed)
+
+    @unittest.skipIf(sys.version_info < (3, 7), "pyautogui.aio needs Python 3.7 or later.")
+    def test_aioMoveChunks(self):
+        # A tweened movement's steps are sent a chunk at a time, with the X server timing the steps in each chunk.
+        import asyncio
+        import pyautogui.aio
+
+        calls = []
+        oldCallInSession = pyautogui.aio._callInSession
+
+        def callInSession(session, function, args, kwargs):
+            calls.append(function.__name__)
+            return oldCallInSession(session, function, args, kwargs)
+
+        pyautogui.aio._callInSession = callInSession
+        loop = asyncio.new_event_loop()
+        try:
+            with pyautogui.aio.useSession(self.session):
+                loop.run_until_complete(pyautogui.aio.moveTo(300, 500, duration=0.3, _pause=False))
+        finally:
+            loop.close()
+            pyautogui.aio._callInSession = oldCallInSession
+
+        self.assertEqual(calls.count("_sendChunk"), 3)
+        self.assertEqual(len(calls), 7)  # Along with the calls that start and finish the movement.
+        self.assertEqual(self.display.pointer, [300, 500])
+        self.assertTrue(len(self.display.events) > 10)
+        self.assertTrue(sum(self.display.eventDelays) > 100)
+        self.assertEqual(self.display.syncedAt, [])
+
+    def test_serverTimingPendingEvents(self):
+        # Server-timed events are only flushed, even past MAX_BATCHED_EVENTS, since syncing would wait for the X
+        # server to play them back. They don't make the next call sync early.
+        self.session.SERVER_TIMING = True
+        self.session.typewrite("a" * 40, interval=0.001)
+        self.assertEqual(self.display.syncedAt, [])
+        self.assertTrue(self.display.flushes >= 2)
+        self.assertEqual(self.session._getConnection().pendingEvents, 0)
+        self.session.SERVER_TIMING = False
+        self.session.typewrite("a" * 30)
+        self.assertEqual(self.display.syncedAt, [140])
+
+
+@unittest.skipIf(sys.version_info < (3, 7), "pyautogui.aio needs Python 3.7 or later.")
+class TestAio(unittest.TestCase):
+    def setUp(self):
+        self.oldFailsafeSetting = pyautogui.FAILSAFE
+        self.center = P(*pyautogui.size()) // 2
+
+        pyautogui.FAILSAFE = False
+        pyautogui.moveTo(*self.center)  # make sure failsafe isn't triggered during this test
+        pyautogui.FAILSAFE = True
+
+    def tearDown(self):
+        pyautogui.FAILSAFE = self.oldFailsafeSetting
+
+    def test_concurrentTasks(self):
+        import asyncio
+        import pyautogui.aio
+
+        loop = asyncio.new_event_loop()
+        try:
+            # The tasks wait at the same time, so this takes half a second rather than a whole second.
+            startTime = time.time()
+            tasks = [
+                loop.create_task(pyautogui.aio.moveTo(self.center.x + 50, self.center.y, duration=0.5, _pause=False)),
+                loop.create_task(pyautogui.aio.sleep(0.5)),
+            ]
+            for task in tasks:
+                loop.run_until_complete(task)
+            elapsed = time.time() - startTime
+        finally:
+            loop.close()
+        self.assertTrue(0.5 <= elapsed < 0.7, "Took %s seconds, expected 0.5 < 0.7 seconds." % (elapsed))
+        self.assertEqual(P(*pyautogui.position()), self.center + P(50, 0))
+
+    def test_concurrentCallsOnOneSession(self):
+        # Tasks that use the same session at the same time take turns making their calls in the executor.
+        import asyncio
+        import pyautogui.aio
+
+        running = []
+        overlaps = []
+
+        def call():
+            running.append(True)
+            overlaps.append(len(running))
+            time.sleep(0.01)
+            running.pop()
+
+        session = pyautogui.Session(PAUSE=0, FAILSAFE=False)
+        loop = asyncio.new_event_loop()
+        try:
+            tasks = [loop.create_task(pyautogui.aio._call(session, call)) for i in range(10)]
+            loop.run_until_complete(asyncio.gather(*tasks))
+            self.assertEqual(overlaps, [1] * 10)
+            self.assertIsNone(session._inputThread)  # The session doesn't need a thread of its own.
+
+            with pyautogui.aio.useSession(session):
+                tasks = [
+                    loop.create_task(pyautogui.aio.moveTo(self.center.x + 10 * i, self.center.y, duration=0.2))
+                    for i in range(1, 6)
+                ]
+                tasks.append(loop.create_task(pyautogui.aio.click(self.center.x, self.center.y + 10, _pause=False)))
+            loop.run_until_complete(asyncio.gather(*tasks))
+        finally:
+            loop.close()
+            session.close()
+
+
 class TypewriteThread(threading.Thread):
     def __init__(self, msg, interval=0.0):
         super(TypewriteThread, self).__init__()
@@ -843,6 +1723,24 @@ class TestFailSafe(unittest.TestCase):
 
         pyautogui.FAILSAFE = self.oldFailsafeSetting
 
+    def test_failsafe_watcher(self):
+        self.oldFailsafeSetting = pyautogui.FAILSAFE
+        pyautogui.startFailSafeWatcher()
+        try:
+            pyautogui.moveTo(1, 1)  # make sure mouse is not in failsafe position to begin with
+            for x, y in pyautogui.FAILSAFE_POINTS:
+                pyautogui.FAILSAFE = True
+                pyautogui.moveTo(x, y)  # This line should not cause the fail safe exception to be raised.
+
+                # The watcher must know about moves made by PyAutoGUI itself, so this SHOULD raise the failsafe:
+                self.assertRaises(pyautogui.FailSafeException, pyautogui.press, "esc")
+
+                pyautogui.FAILSAFE = False
+                pyautogui.moveTo(1, 1)  # make sure mouse is not in failsafe position to begin with (for the next iteration)
+        finally:
+            pyautogui.stopFailSafeWatcher()
+            pyautogui.FAILSAFE = self.oldFailsafeSetting
+
 
 class TestPyScreezeFunctions(unittest.TestCase):
     def test_locateFunctions(self):